@@ -1,5 +1,5 @@
 import tkinter as tk
-from tkinter import ttk, filedialog, scrolledtext, messagebox
+from tkinter import ttk, filedialog, scrolledtext, messagebox, simpledialog
 import pyautogui
 import logging
 import psutil
@@ -15,16 +15,40 @@ from threading import Thread, Event
 from pathlib import Path
 import plotly.graph_objects as go
 import plotly.express as px
-from jinja2 import Template
+from jinja2 import Environment, Template
 import pandas as pd
 import rstr
 import shutil
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageDraw, ImageFont, ImageChops, features
 import threading
 import platform
 import webbrowser
 from pathlib import Path
 import signal
+import collections
+import glob
+import hashlib
+import select
+import tempfile
+import asyncio
+import argparse
+import random
+import sqlite3
+import bisect
+import itertools
+import queue
+import concurrent.futures
+import importlib.util
+import mmap
+import sys
+import struct
+from array import array
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
 
 class FuzzerConfig:
     """Configuration management for the fuzzer"""
@@ -38,7 +62,62 @@ class FuzzerConfig:
             'cpu_threshold': 95,
             'report_dir': 'fuzzing_reports',
             'crashes_dir': 'crashes',
-            'sequences_dir': 'sequences'
+            'sequences_dir': 'sequences',
+            'capture_stderr': True,
+            'stderr_buffer_size': 65536,
+            'enable_core_dumps': False,
+            'symbolize_backtrace': False,
+            'gdb_path': 'gdb',
+            'gdb_timeout': 60,
+            'target_resolve_timeout': 10,
+            'sandbox_enabled': False,
+            'sandbox_template': '',
+            'sandbox_root': '',
+            'sandbox_copy_mode': 'reflink',
+            'sandbox_env': {},
+            'cgroup_enabled': False,
+            'cgroup_parent': '',
+            'cgroup_cpu_period': 100000,
+            'cgroup_disable_swap': True,
+            'instances': 1,
+            'displays': [],
+            'resource_sample_interval': 1.0,
+            'sequence_max_mutations': 3,
+            'sequence_mutation_seed': None,
+            'coordinate_jitter': 10,
+            'timing_jitter': 0.5,
+            'tested_cache_mode': 'off',
+            'tested_cache_path': 'tested_inputs.db',
+            'results_db': 'fuzzing_results.db',
+            'results_batch_size': 200,
+            'metrics_host': '127.0.0.1',
+            'metrics_port': 0,
+            'ui_refresh_hz': 10,
+            'screenshots_dir': 'screenshots',
+            'screenshot_format': 'webp',
+            'screenshot_quality': 80,
+            'screenshot_dedup_distance': 4,
+            'screenshot_baseline_diff': False,
+            'thumbnail_size': [320, 240],
+            'fingerprint_enabled': False,
+            'fingerprint_region': None,
+            'fingerprint_hash_size': 8,
+            'fingerprint_threshold': 6,
+            'fingerprint_learn_inputs': 20,
+            'fingerprint_states_path': 'screen_states.json',
+            'input_order': 'file',
+            'schedule_crash_threshold': 0.5,
+            'delay_min': 0.02,
+            'delay_probe_samples': 5,
+            'delay_probe_interval': 0.05,
+            'delay_margin': 1.5,
+            'delay_idle_cpu': 5.0,
+            'delay_decrease_step': 0.01,
+            'delay_decrease_after': 20,
+            'batch_size': 1,
+            'setup_cache_enabled': False,
+            'setup_cache_dir': 'setup_cache',
+            'scripts_dir': 'scripts'
         }
         self.initialize_directories()
 
@@ -64,7 +143,12 @@ class FuzzerConfig:
             logging.error(f"Error saving config: {str(e)}")
 
 class FuzzingStats:
-    """Track and manage fuzzing statistics"""
+    """Track and manage fuzzing statistics
+
+    Counters always live in memory. Crash details, resource samples and
+    events are kept in lists unless a ResultsStore is attached, in which
+    case they are written to the store and read back from it.
+    """
     def __init__(self):
         self.total_inputs = 0
         self.crashes = 0
@@ -75,46 +159,113 @@ class FuzzingStats:
         self.memory_usage = []
         self.cpu_usage = []
         self.crash_details = []
+        self.store = None
+        self.session_id = None
+
+    def attach_store(self, store):
+        """Persist details to a ResultsStore instead of in-memory lists"""
+        self.store = store
+
+    def add_event(self, event_type, description, timestamp=None):
+        event = {
+            'time': timestamp or datetime.datetime.now(),
+            'type': event_type,
+            'description': description
+        }
+        if self.store is not None:
+            self.store.add_event(self.session_id, event['time'], event_type, description)
+        else:
+            self.events.append(event)
 
     def start_session(self):
         """Start a new fuzzing session"""
         self.start_time = datetime.datetime.now()
-        self.events.append({
-            'time': self.start_time,
-            'type': 'session_start',
-            'description': 'Fuzzing session started'
-        })
+        self.end_time = None
+        if self.store is not None:
+            self.session_id = self.store.start_session(self.start_time)
+        self.add_event('session_start', 'Fuzzing session started', self.start_time)
 
     def end_session(self):
         """End the current fuzzing session"""
         self.end_time = datetime.datetime.now()
-        self.events.append({
-            'time': self.end_time,
-            'type': 'session_end',
-            'description': 'Fuzzing session ended'
-        })
+        self.add_event('session_end', 'Fuzzing session ended', self.end_time)
+        if self.store is not None:
+            self.store.end_session(self.session_id, self.end_time)
 
     def add_crash(self, crash_type, details):
         """Record a crash event"""
         self.crashes += 1
         self.crashes_by_type[crash_type] = self.crashes_by_type.get(crash_type, 0) + 1
-        self.crash_details.append({
+        crash = {
             'time': datetime.datetime.now(),
             'type': crash_type,
             'details': details
-        })
+        }
+        if self.store is not None:
+            self.store.add_crash(self.session_id, crash['time'], crash_type, details)
+        else:
+            self.crash_details.append(crash)
+        return crash
+
+    def add_input(self, fuzz_input, status, duration, instance=None):
+        """Record the outcome and duration of one tested input (store only)"""
+        if self.store is not None:
+            self.store.add_input(self.session_id, datetime.datetime.now(), fuzz_input, status,
+                                 duration, instance)
 
-    def add_resource_usage(self, cpu_percent, memory_percent):
+    def add_resource_usage(self, cpu_percent, memory_percent, timestamp=None):
         """Record resource usage"""
-        timestamp = datetime.datetime.now()
-        self.cpu_usage.append((timestamp, cpu_percent))
-        self.memory_usage.append((timestamp, memory_percent))
+        timestamp = timestamp or datetime.datetime.now()
+        if self.store is not None:
+            self.store.add_resource_usage(self.session_id, timestamp, cpu_percent, memory_percent)
+        else:
+            self.cpu_usage.append((timestamp, cpu_percent))
+            self.memory_usage.append((timestamp, memory_percent))
+
+    def get_crash_details(self):
+        if self.store is not None:
+            return self.store.crashes(self.session_id)
+        return self.crash_details
+
+    def get_resource_usage(self):
+        """Return (cpu_usage, memory_usage) as lists of (time, percent)"""
+        if self.store is not None:
+            return self.store.resource_usage(self.session_id)
+        return self.cpu_usage, self.memory_usage
+
+    def get_events(self):
+        if self.store is not None:
+            return self.store.events(self.session_id)
+        return self.events
+
+    def export_delta(self, cursor=None):
+        """Return the changes since cursor and the new cursor (for streaming)"""
+        cursor = cursor or {'total_inputs': 0, 'cpu_usage': 0, 'memory_usage': 0}
+        delta = {
+            'total_inputs': self.total_inputs - cursor['total_inputs'],
+            'cpu_usage': [(t.isoformat(), v) for t, v in self.cpu_usage[cursor['cpu_usage']:]],
+            'memory_usage': [(t.isoformat(), v) for t, v in self.memory_usage[cursor['memory_usage']:]]
+        }
+        new_cursor = {
+            'total_inputs': self.total_inputs,
+            'cpu_usage': len(self.cpu_usage),
+            'memory_usage': len(self.memory_usage)
+        }
+        return delta, new_cursor
+
+    def apply_delta(self, delta):
+        """Merge a delta produced by export_delta() on another node"""
+        self.total_inputs += delta['total_inputs']
+        for (t, cpu_percent), (_, memory_percent) in zip(delta['cpu_usage'], delta['memory_usage']):
+            self.add_resource_usage(cpu_percent, memory_percent,
+                                    datetime.datetime.fromisoformat(t))
 
     def generate_report_data(self):
         """Generate comprehensive report data"""
         duration = (self.end_time - self.start_time) if self.end_time else (datetime.datetime.now() - self.start_time)
+        cpu_usage, memory_usage = self.get_resource_usage()
 
-        return {
+        report_data = {
             'summary': {
                 'duration': str(duration),
                 'total_inputs': self.total_inputs,
@@ -123,12 +274,235 @@ class FuzzingStats:
                 'crashes_by_type': self.crashes_by_type
             },
             'timeline': {
-                'events': self.events,
-                'cpu_usage': self.cpu_usage,
-                'memory_usage': self.memory_usage
+                'events': self.get_events(),
+                'cpu_usage': cpu_usage,
+                'memory_usage': memory_usage
             },
-            'crashes': self.crash_details
+            'crashes': self.get_crash_details()
         }
+        if self.store is not None:
+            report_data['summary']['throughput'] = self.store.throughput(self.session_id)
+            report_data['summary']['crashes_by_bucket'] = self.store.crashes_by_bucket(self.session_id)
+            report_data['slowest_inputs'] = self.store.slowest_inputs(self.session_id)
+        return report_data
+
+class ResultsStore:
+    """WAL-mode SQLite store for sessions, inputs, crashes, resource samples and events
+
+    Writes from the fuzz loop are queued and inserted in batches; reports,
+    exports and the statistics window query the tables directly.
+    """
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS sessions (
+            id INTEGER PRIMARY KEY,
+            started_at TEXT NOT NULL,
+            ended_at TEXT
+        );
+        CREATE TABLE IF NOT EXISTS inputs (
+            session_id INTEGER NOT NULL,
+            time TEXT NOT NULL,
+            instance INTEGER,
+            input TEXT NOT NULL,
+            status TEXT NOT NULL,
+            duration REAL
+        );
+        CREATE INDEX IF NOT EXISTS inputs_session_time ON inputs (session_id, time);
+        CREATE INDEX IF NOT EXISTS inputs_session_duration ON inputs (session_id, duration);
+        CREATE INDEX IF NOT EXISTS inputs_input ON inputs (input);
+        CREATE TABLE IF NOT EXISTS crashes (
+            id INTEGER PRIMARY KEY,
+            session_id INTEGER NOT NULL,
+            time TEXT NOT NULL,
+            crash_type TEXT NOT NULL,
+            bucket TEXT,
+            input TEXT,
+            action_index INTEGER,
+            crash_dir TEXT,
+            details TEXT
+        );
+        CREATE INDEX IF NOT EXISTS crashes_bucket ON crashes (bucket);
+        CREATE INDEX IF NOT EXISTS crashes_session_type ON crashes (session_id, crash_type);
+        CREATE TABLE IF NOT EXISTS resource_samples (
+            session_id INTEGER NOT NULL,
+            time TEXT NOT NULL,
+            cpu REAL,
+            memory REAL
+        );
+        CREATE INDEX IF NOT EXISTS resource_samples_session_time
+            ON resource_samples (session_id, time);
+        CREATE TABLE IF NOT EXISTS events (
+            session_id INTEGER NOT NULL,
+            time TEXT NOT NULL,
+            type TEXT NOT NULL,
+            description TEXT
+        );
+        CREATE INDEX IF NOT EXISTS events_session_time ON events (session_id, time);
+    """
+    INSERTS = {
+        'inputs': "INSERT INTO inputs (session_id, time, instance, input, status, duration) "
+                  "VALUES (?, ?, ?, ?, ?, ?)",
+        'crashes': "INSERT INTO crashes (session_id, time, crash_type, bucket, input, "
+                   "action_index, crash_dir, details) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        'resource_samples': "INSERT INTO resource_samples (session_id, time, cpu, memory) "
+                            "VALUES (?, ?, ?, ?)",
+        'events': "INSERT INTO events (session_id, time, type, description) VALUES (?, ?, ?, ?)"
+    }
+
+    def __init__(self, path, batch_size=200, flush_interval=1.0):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        # Written from the engine thread, read from the GUI thread
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(self.SCHEMA)
+        self.conn.commit()
+        self.pending = {table: [] for table in self.INSERTS}
+        self.pending_count = 0
+        self.last_flush = time.monotonic()
+
+    @staticmethod
+    def encode_input(fuzz_input):
+        return fuzz_input if isinstance(fuzz_input, str) else json.dumps(fuzz_input, sort_keys=True)
+
+    def start_session(self, started_at):
+        with self.lock:
+            cursor = self.conn.execute("INSERT INTO sessions (started_at) VALUES (?)",
+                                       (started_at.isoformat(),))
+            self.conn.commit()
+            return cursor.lastrowid
+
+    def end_session(self, session_id, ended_at):
+        with self.lock:
+            self._flush()
+            self.conn.execute("UPDATE sessions SET ended_at = ? WHERE id = ?",
+                              (ended_at.isoformat(), session_id))
+            self.conn.commit()
+
+    def add_input(self, session_id, timestamp, fuzz_input, status, duration, instance=None):
+        self._queue('inputs', (session_id, timestamp.isoformat(), instance,
+                               self.encode_input(fuzz_input), status, duration))
+
+    def add_crash(self, session_id, timestamp, crash_type, details):
+        self._queue('crashes', (session_id, timestamp.isoformat(), crash_type,
+                                details.get('bucket'), self.encode_input(details.get('input', '')),
+                                details.get('action_index'), details.get('crash_dir'),
+                                json.dumps(details, default=str)))
+
+    def add_resource_usage(self, session_id, timestamp, cpu_percent, memory_percent):
+        self._queue('resource_samples', (session_id, timestamp.isoformat(), cpu_percent,
+                                         memory_percent))
+
+    def add_event(self, session_id, timestamp, event_type, description):
+        self._queue('events', (session_id, timestamp.isoformat(), event_type, description))
+
+    def _queue(self, table, row):
+        with self.lock:
+            self.pending[table].append(row)
+            self.pending_count += 1
+            if (self.pending_count >= self.batch_size or
+                    time.monotonic() - self.last_flush >= self.flush_interval):
+                self._flush()
+
+    def _flush(self):
+        if self.pending_count:
+            with self.conn:
+                for table, rows in self.pending.items():
+                    if rows:
+                        self.conn.executemany(self.INSERTS[table], rows)
+                        rows.clear()
+            self.pending_count = 0
+        self.last_flush = time.monotonic()
+
+    def flush(self):
+        with self.lock:
+            self._flush()
+
+    def query(self, sql, params=()):
+        """Run a read query after flushing queued rows"""
+        with self.lock:
+            self._flush()
+            return self.conn.execute(sql, params).fetchall()
+
+    def dataframe(self, sql, params=(), parse_dates=None):
+        with self.lock:
+            self._flush()
+            return pd.read_sql_query(sql, self.conn, params=params, parse_dates=parse_dates)
+
+    @staticmethod
+    def _crash_filter(session_id=None, bucket=None, crash_type=None):
+        clauses, params = [], []
+        for column, value in (('session_id', session_id), ('bucket', bucket),
+                              ('crash_type', crash_type)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        return (f"WHERE {' AND '.join(clauses)}" if clauses else ""), params
+
+    def crashes(self, session_id=None, bucket=None, limit=-1, offset=0, crash_type=None):
+        """Crash records in the same shape as FuzzingStats.crash_details"""
+        where, params = self._crash_filter(session_id, bucket, crash_type)
+        rows = self.query(f"SELECT time, crash_type, details FROM crashes {where} "
+                          f"ORDER BY id LIMIT ? OFFSET ?", params + [limit, offset])
+        return [{'time': datetime.datetime.fromisoformat(t), 'type': crash_type,
+                 'details': json.loads(details)} for t, crash_type, details in rows]
+
+    def count_crashes(self, session_id=None, bucket=None, crash_type=None):
+        where, params = self._crash_filter(session_id, bucket, crash_type)
+        return self.query(f"SELECT COUNT(*) FROM crashes {where}", params)[0][0]
+
+    def crashes_by_bucket(self, session_id=None):
+        where = "WHERE session_id = ?" if session_id is not None else ""
+        params = (session_id,) if session_id is not None else ()
+        rows = self.query(f"SELECT bucket, crash_type, COUNT(*) FROM crashes {where} "
+                          f"GROUP BY bucket, crash_type ORDER BY COUNT(*) DESC", params)
+        return [{'bucket': bucket, 'crash_type': crash_type, 'count': count}
+                for bucket, crash_type, count in rows]
+
+    def slowest_inputs(self, session_id, limit=20):
+        rows = self.query("SELECT input, status, duration FROM inputs WHERE session_id = ? "
+                          "ORDER BY duration DESC LIMIT ?", (session_id, limit))
+        return [{'input': fuzz_input, 'status': status, 'duration': duration}
+                for fuzz_input, status, duration in rows]
+
+    def throughput(self, session_id):
+        """Inputs per minute over the span of recorded inputs"""
+        count, first, last = self.query("SELECT COUNT(*), MIN(time), MAX(time) FROM inputs "
+                                        "WHERE session_id = ?", (session_id,))[0]
+        if count < 2:
+            return 0.0
+        span = (datetime.datetime.fromisoformat(last) -
+                datetime.datetime.fromisoformat(first)).total_seconds()
+        return count / span * 60 if span > 0 else 0.0
+
+    def resource_usage(self, session_id):
+        rows = self.query("SELECT time, cpu, memory FROM resource_samples WHERE session_id = ? "
+                          "ORDER BY time", (session_id,))
+        cpu_usage = [(datetime.datetime.fromisoformat(t), cpu) for t, cpu, _ in rows]
+        memory_usage = [(datetime.datetime.fromisoformat(t), memory) for t, _, memory in rows]
+        return cpu_usage, memory_usage
+
+    def input_history(self, fuzz_inputs):
+        """Runs, non-OK outcomes and mean duration of each input across all sessions"""
+        encoded = [self.encode_input(fuzz_input) for fuzz_input in fuzz_inputs]
+        placeholders = ','.join('?' * len(encoded))
+        rows = self.query(
+            f"SELECT input, COUNT(*), SUM(status != 'OK'), AVG(duration) FROM inputs "
+            f"WHERE input IN ({placeholders}) GROUP BY input", encoded)
+        return {row[0]: (row[1], row[2], row[3]) for row in rows}
+
+    def events(self, session_id):
+        rows = self.query("SELECT time, type, description FROM events WHERE session_id = ? "
+                          "ORDER BY time", (session_id,))
+        return [{'time': datetime.datetime.fromisoformat(t), 'type': event_type,
+                 'description': description} for t, event_type, description in rows]
+
+    def close(self):
+        with self.lock:
+            self._flush()
+            self.conn.close()
 
 class ReportGenerator:
     """Generate detailed HTML reports for fuzzing sessions"""
@@ -139,13 +513,15 @@ class ReportGenerator:
 
     def create_charts(self):
         """Create interactive charts using plotly"""
+        cpu_usage, memory_usage = self.stats.get_resource_usage()
+
         # CPU Usage Chart
-        cpu_df = pd.DataFrame(self.stats.cpu_usage, columns=['time', 'usage'])
+        cpu_df = pd.DataFrame(cpu_usage, columns=['time', 'usage'])
         cpu_fig = px.line(cpu_df, x='time', y='usage', title='CPU Usage Over Time')
         cpu_chart = cpu_fig.to_html(full_html=False)
 
         # Memory Usage Chart
-        mem_df = pd.DataFrame(self.stats.memory_usage, columns=['time', 'usage'])
+        mem_df = pd.DataFrame(memory_usage, columns=['time', 'usage'])
         mem_fig = px.line(mem_df, x='time', y='usage', title='Memory Usage Over Time')
         mem_chart = mem_fig.to_html(full_html=False)
 
@@ -258,6 +634,37 @@ class ReportGenerator:
             </div>
         </div>
 
+        {% if summary.crashes_by_bucket %}
+        <!-- Crash Buckets -->
+        <div class="row mb-4">
+            <div class="col-12">
+                <h2>Crashes by Bucket</h2>
+                <p>Throughput: {{ "%.1f"|format(summary.throughput) }} inputs/minute</p>
+                <table class="table table-sm">
+                    <tr><th>Bucket</th><th>Type</th><th>Count</th></tr>
+                    {% for bucket in summary.crashes_by_bucket %}
+                    <tr><td>{{ bucket.bucket }}</td><td>{{ bucket.crash_type }}</td><td>{{ bucket.count }}</td></tr>
+                    {% endfor %}
+                </table>
+            </div>
+        </div>
+        {% endif %}
+
+        {% if slowest_inputs %}
+        <!-- Slowest Inputs -->
+        <div class="row mb-4">
+            <div class="col-12">
+                <h2>Slowest Inputs</h2>
+                <table class="table table-sm">
+                    <tr><th>Input</th><th>Status</th><th>Duration (s)</th></tr>
+                    {% for row in slowest_inputs %}
+                    <tr><td>{{ row.input }}</td><td>{{ row.status }}</td><td>{{ "%.3f"|format(row.duration) }}</td></tr>
+                    {% endfor %}
+                </table>
+            </div>
+        </div>
+        {% endif %}
+
         <!-- Crash Details -->
         <div class="row mb-4">
             <div class="col-12">
@@ -267,9 +674,11 @@ class ReportGenerator:
                     <h5>{{ crash.type }}</h5>
                     <p><strong>Time:</strong> {{ crash.time }}</p>
                     <p><strong>Details:</strong> {{ crash.details }}</p>
-                    {% if crash.screenshot %}
-                    <img src="data:image/png;base64,{{ crash.screenshot }}"
-                            class="img-fluid" alt="Crash Screenshot">
+                    {% if crash.details.thumbnail %}
+                    <a href="{{ crash.details.screenshot|file_uri }}">
+                        <img src="{{ crash.details.thumbnail|file_uri }}" loading="lazy"
+                             class="img-fluid" alt="Crash Screenshot">
+                    </a>
                     {% endif %}
                 </div>
                 {% endfor %}
@@ -298,18 +707,22 @@ class ReportGenerator:
         charts = self.create_charts()
 
         # Prepare template data
+        report_data = self.stats.generate_report_data()
         template_data = {
             'timestamp': datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-            'summary': self.stats.generate_report_data()['summary'],
+            'summary': report_data['summary'],
             'charts': charts,
-            'crashes': self.stats.crash_details,
+            'crashes': report_data['crashes'],
+            'slowest_inputs': report_data.get('slowest_inputs', []),
             'timeline': {
-                'events': self.stats.events
+                'events': report_data['timeline']['events']
             }
         }
 
-        # Render template
-        template = Template(report_template)
+        # Render template; screenshots are linked, not inlined
+        environment = Environment()
+        environment.filters['file_uri'] = lambda path: Path(path).resolve().as_uri()
+        template = environment.from_string(report_template)
         report_html = template.render(**template_data)
 
         # Save report
@@ -322,29 +735,4159 @@ class ReportGenerator:
         self.report_path = report_path
         return report_path
 
-    def export_data(self, format='json'):
-        """Export fuzzing data in various formats"""
-        data = self.stats.generate_report_data()
-        timestamp = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
+    def export_data(self, format='json'):
+        """Export fuzzing data in various formats; returns the written path(s)"""
+        report_dir = self.config.config['report_dir']
+        timestamp = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
+
+        if format == 'json':
+            path = os.path.join(report_dir, f"fuzzing_data_{timestamp}.json")
+            with open(path, 'w') as f:
+                json.dump(self.stats.generate_report_data(), f, indent=4, default=str)
+            return path
+        elif format == 'csv':
+            store = self.stats.store
+            if store is not None:
+                # Stream straight from the results store
+                session = (self.stats.session_id,)
+                frames = {
+                    'crashes': store.dataframe(
+                        "SELECT time, crash_type, bucket, input, action_index, crash_dir "
+                        "FROM crashes WHERE session_id = ? ORDER BY id", session),
+                    'inputs': store.dataframe(
+                        "SELECT time, instance, input, status, duration FROM inputs "
+                        "WHERE session_id = ? ORDER BY time", session),
+                    'cpu_usage': store.dataframe(
+                        "SELECT time, cpu AS usage FROM resource_samples WHERE session_id = ? "
+                        "ORDER BY time", session),
+                    'memory_usage': store.dataframe(
+                        "SELECT time, memory AS usage FROM resource_samples WHERE session_id = ? "
+                        "ORDER BY time", session)
+                }
+            else:
+                cpu_usage, memory_usage = self.stats.get_resource_usage()
+                frames = {
+                    'crashes': pd.DataFrame(self.stats.get_crash_details()),
+                    'cpu_usage': pd.DataFrame(cpu_usage, columns=['time', 'usage']),
+                    'memory_usage': pd.DataFrame(memory_usage, columns=['time', 'usage'])
+                }
+
+            paths = []
+            for name, frame in frames.items():
+                path = os.path.join(report_dir, f"{name}_{timestamp}.csv")
+                frame.to_csv(path, index=False)
+                paths.append(path)
+            return paths
+
+class CrashCollector:
+    """Collect native crash evidence (exit status, stderr, core dumps) for a target"""
+    # Windows reports fatal exceptions as NTSTATUS exit codes
+    NTSTATUS_CODES = {
+        0xC0000005: 'ACCESS_VIOLATION',
+        0xC000001D: 'ILLEGAL_INSTRUCTION',
+        0xC0000094: 'INTEGER_DIVIDE_BY_ZERO',
+        0xC00000FD: 'STACK_OVERFLOW',
+        0xC0000374: 'HEAP_CORRUPTION',
+        0xC0000409: 'STACK_BUFFER_OVERRUN'
+    }
+
+    def __init__(self, config):
+        self.config = config
+        self.stderr_buffer = collections.deque()
+        self.buffered_bytes = 0
+        self.buffer_lock = threading.Lock()
+        self.reader_thread = None
+
+    def popen_kwargs(self):
+        """Extra subprocess.Popen arguments needed to collect evidence"""
+        kwargs = {}
+        if self.config.config['capture_stderr']:
+            kwargs['stderr'] = subprocess.PIPE
+        if self.config.config['enable_core_dumps'] and resource is not None \
+                and not hasattr(resource, 'prlimit'):
+            # Without prlimit (macOS) the child inherits the fuzzer's own limit
+            soft, hard = resource.getrlimit(resource.RLIMIT_CORE)
+            if soft != hard:
+                resource.setrlimit(resource.RLIMIT_CORE, (hard, hard))
+        return kwargs
+
+    @staticmethod
+    def enable_core_dumps(pid):
+        """Raise RLIMIT_CORE of a running process
+
+        The limit is only read when a core is dumped, so setting it from the
+        parent after spawning is enough and avoids a preexec_fn, which is not
+        safe in this multithreaded process.
+        """
+        _, hard = resource.getrlimit(resource.RLIMIT_CORE)
+        resource.prlimit(pid, resource.RLIMIT_CORE, (hard, hard))
+
+    def attach(self, process):
+        """Start draining the stderr pipe of a freshly launched process"""
+        if process is not None and self.config.config['enable_core_dumps'] \
+                and resource is not None and hasattr(resource, 'prlimit'):
+            try:
+                self.enable_core_dumps(process.pid)
+            except OSError as e:
+                logging.error(f"Error enabling core dumps: {str(e)}")
+
+        with self.buffer_lock:
+            self.stderr_buffer.clear()
+            self.buffered_bytes = 0
+
+        if process is None or process.stderr is None:
+            return
+
+        self.reader_thread = Thread(target=self._drain_stderr, args=(process.stderr,))
+        self.reader_thread.daemon = True
+        self.reader_thread.start()
+
+    def _drain_stderr(self, pipe):
+        """Read stderr into a bounded ring buffer so the target never blocks on a full pipe"""
+        fd = pipe.fileno()
+        non_blocking = os.name == 'posix'
+        if non_blocking:
+            os.set_blocking(fd, False)
+
+        try:
+            while True:
+                if non_blocking:
+                    ready, _, _ = select.select([fd], [], [], 0.5)
+                    if not ready:
+                        continue
+                try:
+                    chunk = os.read(fd, 4096)
+                except BlockingIOError:
+                    continue
+                if not chunk:
+                    break
+                self._append_stderr(chunk)
+        except (OSError, ValueError):
+            pass
+        finally:
+            try:
+                pipe.close()
+            except OSError:
+                pass
+
+    def _append_stderr(self, chunk):
+        """Append a chunk and drop the oldest data beyond the configured size"""
+        limit = self.config.config['stderr_buffer_size']
+        with self.buffer_lock:
+            self.stderr_buffer.append(chunk)
+            self.buffered_bytes += len(chunk)
+            while self.buffered_bytes > limit and len(self.stderr_buffer) > 1:
+                self.buffered_bytes -= len(self.stderr_buffer.popleft())
+
+    def get_stderr(self):
+        """Return the buffered stderr tail as bytes"""
+        with self.buffer_lock:
+            data = b''.join(self.stderr_buffer)
+        return data[-self.config.config['stderr_buffer_size']:]
+
+    def classify_exit(self, returncode):
+        """Decode a process return code into signal/exit details"""
+        if returncode is None:
+            return None
+
+        info = {
+            'returncode': returncode,
+            'signal': None,
+            'signal_name': None,
+            'exit_code': None
+        }
+
+        if returncode < 0:
+            # POSIX: killed by a signal
+            signum = -returncode
+            try:
+                signal_name = signal.Signals(signum).name
+            except ValueError:
+                signal_name = f"SIG{signum}"
+            info['signal'] = signum
+            info['signal_name'] = signal_name
+            if signal_name == 'SIGKILL':
+                info['crash_type'] = "Killed (SIGKILL, possible OOM)"
+            else:
+                info['crash_type'] = f"Signal {signal_name}"
+        elif (returncode & 0xFFFFFFFF) in self.NTSTATUS_CODES:
+            status_name = self.NTSTATUS_CODES[returncode & 0xFFFFFFFF]
+            info['exit_code'] = returncode
+            info['signal_name'] = status_name
+            info['crash_type'] = f"Exception {status_name}"
+        elif returncode == 0:
+            info['exit_code'] = 0
+            info['crash_type'] = "Clean Exit"
+        else:
+            info['exit_code'] = returncode
+            info['crash_type'] = f"Exit Code {returncode}"
+
+        return info
+
+    def find_core_file(self, pid, app_path, crash_dir):
+        """Locate the core dump of a dead process and move it into the crash directory"""
+        try:
+            with open('/proc/sys/kernel/core_pattern', 'r') as f:
+                pattern = f.read().strip()
+        except OSError:
+            return None
+
+        core_dest = os.path.join(crash_dir, 'core')
+
+        if pattern.startswith('|'):
+            # Cores piped to a handler; systemd-coredump can export them
+            if not shutil.which('coredumpctl'):
+                return None
+            try:
+                subprocess.run(['coredumpctl', 'dump', str(pid), '--output', core_dest],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                               timeout=self.config.config['gdb_timeout'])
+            except (OSError, subprocess.SubprocessError):
+                return None
+            return core_dest if os.path.exists(core_dest) else None
+
+        # Expand the core_pattern specifiers we know and wildcard the rest
+        exe_name = os.path.basename(app_path)[:15]
+        expanded = pattern.replace('%%', '\0').replace('%p', str(pid)).replace('%e', exe_name)
+        expanded = re.sub(r'%[a-zA-Z]', '*', expanded).replace('\0', '%')
+
+        candidates = glob.glob(expanded)
+        if '%p' not in pattern:
+            candidates += glob.glob(f"{expanded}.{pid}")
+        candidates = [c for c in candidates if os.path.isfile(c)]
+        if not candidates:
+            return None
+
+        core_file = max(candidates, key=os.path.getmtime)
+        try:
+            shutil.move(core_file, core_dest)
+        except OSError:
+            return core_file
+        return core_dest
+
+    def symbolize(self, app_path, core_file):
+        """Produce a backtrace from a core file with a gdb batch run"""
+        gdb_path = shutil.which(self.config.config['gdb_path'])
+        if not gdb_path or not core_file:
+            return None
+
+        try:
+            result = subprocess.run(
+                # The crashing thread is the selected one in a core; print it
+                # first so the bucket is computed from its frames
+                [gdb_path, '-batch', '-nx', '-ex', 'bt', '-ex', 'thread apply all bt',
+                 app_path, core_file],
+                capture_output=True, text=True, errors='replace',
+                timeout=self.config.config['gdb_timeout']
+            )
+            return result.stdout
+        except (OSError, subprocess.SubprocessError) as e:
+            logging.error(f"Error symbolizing core file: {str(e)}")
+            return None
+
+    @staticmethod
+    def compute_bucket(crash_type, backtrace=None, frame_count=5):
+        """Group crashes by type and the top frames of the crashing thread"""
+        frames = []
+        if backtrace:
+            for match in re.finditer(r'^#(\d+)\s+(?:0x[0-9a-f]+ in )?(\S+)', backtrace, re.MULTILINE):
+                # Frame numbering restarts at the next thread's stack
+                if frames and match.group(1) == '0':
+                    break
+                frames.append(match.group(2))
+                if len(frames) >= frame_count:
+                    break
+
+        key = '|'.join([crash_type] + frames)
+        return hashlib.sha1(key.encode('utf-8')).hexdigest()[:12]
+
+    def collect(self, process, crash_type, crash_dir, app_path):
+        """Write native crash evidence into the crash directory and return a summary"""
+        native = {'bucket': self.compute_bucket(crash_type)}
+
+        if process is None:
+            return native
+
+        try:
+            returncode = process.poll()
+        except Exception:
+            returncode = None
+        exit_info = self.classify_exit(returncode)
+        if exit_info:
+            native['exit'] = exit_info
+
+        stderr_data = self.get_stderr()
+        if stderr_data:
+            stderr_path = os.path.join(crash_dir, 'stderr.log')
+            with open(stderr_path, 'wb') as f:
+                f.write(stderr_data)
+            native['stderr'] = stderr_path
+
+        if exit_info and exit_info['signal'] and self.config.config['enable_core_dumps']:
+            core_file = self.find_core_file(process.pid, app_path, crash_dir)
+            if core_file:
+                native['core_file'] = core_file
+
+                if self.config.config['symbolize_backtrace']:
+                    backtrace = self.symbolize(app_path, core_file)
+                    if backtrace:
+                        backtrace_path = os.path.join(crash_dir, 'backtrace.txt')
+                        with open(backtrace_path, 'w', encoding='utf-8') as f:
+                            f.write(backtrace)
+                        native['backtrace'] = backtrace_path
+                        native['bucket'] = self.compute_bucket(crash_type, backtrace)
+
+        return native
+
+class ExitWatcher:
+    """Notify the fuzz loop the moment the target process exits"""
+    def __init__(self, poll_interval=0.05):
+        self.poll_interval = poll_interval
+        self.exited = Event()
+        self.exit_time = None
+        self.process = None
+        self.watch_thread = None
+        self.stop_event = Event()
+        self.wake_pipe = None
+        self.callbacks = []
+        self.loop = None
+        self.pidfd = None
+
+    def watch(self, process, loop=None):
+        """Start watching a newly launched process
+
+        With an asyncio loop the pidfd is registered as a loop reader instead
+        of blocking a thread; stop() must then be called on the loop thread.
+        """
+        self.stop()
+        self.exited.clear()
+        self.exit_time = None
+        self.process = process
+
+        if process is None:
+            return
+
+        self.stop_event.clear()
+        pidfd = None
+        if hasattr(os, 'pidfd_open'):
+            try:
+                pidfd = os.pidfd_open(process.pid)
+            except OSError:
+                pidfd = None
+
+        if pidfd is not None and loop is not None:
+            self.loop, self.pidfd = loop, pidfd
+            loop.add_reader(pidfd, self._on_pidfd_readable, process)
+            return
+
+        if pidfd is not None:
+            self.wake_pipe = os.pipe()
+            target, args = self._watch_pidfd, (process, pidfd, self.wake_pipe[0])
+        else:
+            target, args = self._watch_polling, (process,)
+
+        self.watch_thread = Thread(target=target, args=args)
+        self.watch_thread.daemon = True
+        self.watch_thread.start()
+
+    def _watch_pidfd(self, process, pidfd, wake_fd):
+        """Block on the pidfd; it becomes readable when the process exits"""
+        try:
+            poller = select.poll()
+            poller.register(pidfd, select.POLLIN)
+            poller.register(wake_fd, select.POLLIN)
+            while not self.stop_event.is_set():
+                for fd, _ in poller.poll():
+                    if fd == pidfd:
+                        self._notify(process)
+                        return
+        finally:
+            os.close(pidfd)
+
+    def _on_pidfd_readable(self, process):
+        self._remove_reader()
+        self._notify(process)
+
+    def _remove_reader(self):
+        if self.pidfd is not None:
+            self.loop.remove_reader(self.pidfd)
+            os.close(self.pidfd)
+            self.pidfd = None
+
+    def _watch_polling(self, process):
+        """Fallback for platforms without pidfd support"""
+        while not self.stop_event.wait(self.poll_interval):
+            if self._has_exited(process):
+                self._notify(process)
+                return
+
+    @staticmethod
+    def _has_exited(process):
+        """Check a Popen or psutil.Process for exit"""
+        if hasattr(process, 'poll'):
+            return process.poll() is not None
+        try:
+            return not process.is_running() or process.status() == psutil.STATUS_ZOMBIE
+        except psutil.NoSuchProcess:
+            return True
+
+    def _notify(self, process):
+        """Reap the process and wake anyone waiting on the exit event"""
+        self.exit_time = time.time()
+        try:
+            if hasattr(process, 'poll'):
+                process.poll()
+        except Exception:
+            pass
+        logging.info(f"Target process {process.pid} exited")
+        self.exited.set()
+        for callback in self.callbacks:
+            callback()
+
+    def wait(self, timeout):
+        """Sleep for up to timeout seconds; return True early if the target exited"""
+        if timeout <= 0:
+            return self.exited.is_set()
+        return self.exited.wait(timeout)
+
+    def stop(self):
+        """Stop watching the current process"""
+        self._remove_reader()
+        self.stop_event.set()
+        if self.wake_pipe:
+            try:
+                os.write(self.wake_pipe[1], b'\0')
+            except OSError:
+                pass
+        if self.watch_thread and self.watch_thread.is_alive():
+            self.watch_thread.join(timeout=1.0)
+        if self.wake_pipe:
+            for fd in self.wake_pipe:
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
+            self.wake_pipe = None
+        self.watch_thread = None
+
+class ProcessTree:
+    """Follow the real target process and its descendants behind a launcher"""
+    def __init__(self, process, app_path, os_type):
+        self.process = process
+        self.app_path = os.path.abspath(app_path)
+        self.os_type = os_type
+        self.root = self._psutil_process(process.pid)
+        # Only processes created after the launcher can belong to this launch
+        self.launch_time = time.time()
+        if self.root is not None:
+            try:
+                self.launch_time = self.root.create_time()
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                pass
+        self.target = self.root
+        self.tracked = {}
+        self.cpu_samples = {}  # consumer -> (monotonic time, {pid: cpu seconds})
+
+    @staticmethod
+    def _psutil_process(pid):
+        try:
+            return psutil.Process(pid)
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            return None
+
+    @property
+    def target_pid(self):
+        return self.target.pid if self.target else self.process.pid
+
+    @property
+    def is_wrapped(self):
+        """True when the launched process is only a launcher for the real target"""
+        return self.target is not None and self.root is not None and self.target.pid != self.root.pid
+
+    def _matches_app(self, proc_info):
+        """Check whether a process belongs to the target application"""
+        exe = proc_info.get('exe')
+        if not exe:
+            return False
+        if self.os_type == "macos" and self.app_path.endswith('.app'):
+            return exe.startswith(os.path.join(self.app_path, 'Contents', 'MacOS') + os.sep)
+        return os.path.normcase(exe) == os.path.normcase(self.app_path)
+
+    def _find_by_executable(self):
+        """Find the newest process running the target executable started by this launch
+
+        A copy of the application that was already running (for example the
+        user's own) is never adopted, since the target gets killed on restart.
+        """
+        fresh = []
+        for proc in psutil.process_iter(['pid', 'exe', 'create_time']):
+            try:
+                if self._matches_app(proc.info) and proc.info['create_time'] >= self.launch_time:
+                    fresh.append(proc)
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+        if not fresh:
+            return None
+        return max(fresh, key=lambda p: p.info['create_time'])
+
+    def _find_child(self):
+        """Find the launcher's descendant running the target executable"""
+        try:
+            children = self.root.children(recursive=True)
+        except psutil.NoSuchProcess:
+            return None
+        for child in children:
+            try:
+                if self._matches_app({'exe': child.exe()}):
+                    return child
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+        return None
+
+    def resolve_target(self, timeout=10.0):
+        """Resolve the real application process behind `open -W` or a shell"""
+        wrapped = ((self.os_type == "macos" and self.app_path.endswith('.app'))
+                   or self.os_type == "windows")
+        if not wrapped or self.root is None:
+            return self.target
+
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            target = None
+            if self.os_type == "windows":
+                # shell=True puts cmd.exe (and often conhost.exe) between us
+                # and the executable
+                target = self._find_child()
+
+            if target is None:
+                target = self._find_by_executable()
+
+            if target is not None:
+                self.target = psutil.Process(target.pid)
+                logging.info(f"Resolved target process {self.target.pid} behind launcher {self.root.pid}")
+                return self.target
+            time.sleep(0.1)
+
+        logging.warning("Could not resolve target process behind launcher, tracking launcher")
+        return self.target
+
+    def processes(self):
+        """Return the live processes of the tree (target, descendants and launcher)"""
+        roots = [p for p in (self.root, self.target) if p is not None]
+        found = {}
+        for proc in roots:
+            try:
+                if proc.is_running():
+                    found[proc.pid] = proc
+                    for child in proc.children(recursive=True):
+                        found[child.pid] = child
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+
+        # Keep the same psutil objects between calls so per-process state survives
+        for pid, proc in found.items():
+            if pid not in self.tracked:
+                self.tracked[pid] = proc
+        for pid in list(self.tracked):
+            if pid not in found:
+                del self.tracked[pid]
+        return list(self.tracked.values())
+
+    def is_alive(self):
+        """True while the real target is running"""
+        if self.target is None:
+            return self.process.poll() is None
+        try:
+            return self.target.is_running() and self.target.status() != psutil.STATUS_ZOMBIE
+        except psutil.NoSuchProcess:
+            return False
+
+    def cpu_percent(self, consumer='default'):
+        """CPU usage summed across the tree since this consumer's previous call
+
+        Each consumer keeps its own baseline, so callers sampling at different
+        rates do not shorten each other's measurement window.
+        """
+        now = time.monotonic()
+        times = {}
+        for proc in self.processes():
+            try:
+                cpu = proc.cpu_times()
+                times[proc.pid] = cpu.user + cpu.system
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                pass
+
+        previous = self.cpu_samples.get(consumer)
+        self.cpu_samples[consumer] = (now, times)
+        if previous is None or now <= previous[0]:
+            return 0.0
+        used = sum(max(0.0, t - previous[1].get(pid, t)) for pid, t in times.items())
+        return used / (now - previous[0]) * 100
+
+    def memory_rss(self):
+        """Resident memory in bytes summed across the tree"""
+        total = 0
+        for proc in self.processes():
+            try:
+                total += proc.memory_info().rss
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                pass
+        return total
+
+    def memory_percent(self):
+        """Resident memory of the tree as a percentage of system memory"""
+        return self.memory_rss() / psutil.virtual_memory().total * 100
+
+    def kill_tree(self, timeout=2.0):
+        """Terminate the whole tree, killing anything that ignores SIGTERM"""
+        procs = self.processes()
+        for proc in procs:
+            try:
+                proc.terminate()
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                pass
+
+        _, alive = psutil.wait_procs(procs, timeout=timeout)
+        for proc in alive:
+            try:
+                proc.kill()
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                pass
+        psutil.wait_procs(alive, timeout=timeout)
+
+        # Reap the launcher so it does not linger as a zombie
+        try:
+            self.process.wait(timeout=timeout)
+        except (subprocess.TimeoutExpired, OSError):
+            pass
+        self.tracked.clear()
+
+class InstanceSandbox:
+    """Per-instance HOME/XDG directories populated from a template
+
+    Note: .app bundles started through `open` are launched by LaunchServices
+    and do not inherit the sandbox environment.
+    """
+    XDG_DIRS = {
+        'XDG_CONFIG_HOME': '.config',
+        'XDG_CACHE_HOME': '.cache',
+        'XDG_DATA_HOME': os.path.join('.local', 'share'),
+        'XDG_STATE_HOME': os.path.join('.local', 'state')
+    }
+
+    def __init__(self, config, instance_id=0):
+        self.config = config
+        self.instance_id = instance_id
+        sandbox_root = config.config['sandbox_root'] or tempfile.gettempdir()
+        self.root = os.path.join(sandbox_root, f"fuzzer-sandbox-{os.getpid()}-{instance_id}")
+        self.home = os.path.join(self.root, 'home')
+        self.generation = 0
+
+    def prepare(self, template=None):
+        """Reset the sandbox home to a fresh copy of the template"""
+        template = template or self.config.config['sandbox_template']
+        os.makedirs(self.root, exist_ok=True)
+
+        # Move the used home out of the way and delete it in the background
+        if os.path.exists(self.home):
+            self.generation += 1
+            trash = os.path.join(self.root, f"trash-{self.generation}")
+            os.rename(self.home, trash)
+            Thread(target=shutil.rmtree, args=(trash, True), daemon=True).start()
+
+        if template and os.path.isdir(template):
+            self.copy_tree(template, self.home, self.config.config['sandbox_copy_mode'])
+        else:
+            os.makedirs(self.home)
+
+        subdirs = list(self.XDG_DIRS.values()) + ['tmp']
+        if platform.system() == "Windows":
+            subdirs += [os.path.join('AppData', 'Roaming'), os.path.join('AppData', 'Local')]
+        for subdir in subdirs:
+            os.makedirs(os.path.join(self.home, subdir), exist_ok=True)
+
+        return self.home
+
+    @staticmethod
+    def copy_tree(src, dst, mode='reflink'):
+        """Copy a template tree as cheaply as the filesystem allows
+
+        reflink: copy-on-write clones (btrfs/XFS/APFS), falling back to a copy
+        hardlink: share file inodes with the template; only safe for targets
+                  that replace files instead of writing them in place
+        copy:    plain recursive copy
+        """
+        if mode == 'reflink':
+            if platform.system() == "Linux":
+                command = ['cp', '-a', '--reflink=auto', src, dst]
+            elif platform.system() == "Darwin":
+                command = ['cp', '-c', '-R', src, dst]
+            else:
+                command = None
+
+            if command:
+                result = subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+                if result.returncode == 0:
+                    return
+                logging.warning(f"Reflink copy failed, falling back to copy: {result.stderr.decode(errors='replace')}")
+                shutil.rmtree(dst, ignore_errors=True)
+
+        elif mode == 'hardlink':
+            def link_or_copy(source, destination):
+                try:
+                    os.link(source, destination)
+                except OSError:
+                    shutil.copy2(source, destination)
+            shutil.copytree(src, dst, symlinks=True, copy_function=link_or_copy)
+            return
+
+        shutil.copytree(src, dst, symlinks=True)
+
+    def environment(self, base=None):
+        """Environment for a target running inside this sandbox"""
+        env = dict(os.environ if base is None else base)
+        env['HOME'] = self.home
+        for var, subdir in self.XDG_DIRS.items():
+            env[var] = os.path.join(self.home, subdir)
+        env['TMPDIR'] = os.path.join(self.home, 'tmp')
+
+        if platform.system() == "Windows":
+            env['USERPROFILE'] = self.home
+            env['APPDATA'] = os.path.join(self.home, 'AppData', 'Roaming')
+            env['LOCALAPPDATA'] = os.path.join(self.home, 'AppData', 'Local')
+            env['TEMP'] = env['TMP'] = env['TMPDIR']
+
+        env.update({str(k): str(v) for k, v in self.config.config['sandbox_env'].items()})
+        return env
+
+    def cleanup(self):
+        """Remove the sandbox and everything in it"""
+        shutil.rmtree(self.root, ignore_errors=True)
+
+class SetupStateCache:
+    """Sandbox homes snapshotted right after a successful initial setup
+
+    Targets persist their UI state (dialogs dismissed, preferences chosen)
+    in their config and profile directories. Once the initial sequence has
+    run, the target is shut down so it writes that state, the sandbox home
+    is copied here, and later launches start from the copy instead of
+    re-driving the setup GUI. Snapshots are keyed by a hash of the target
+    binary, the initial sequence and the sandbox template, so changing any
+    of them falls back to a fresh setup.
+    """
+    def __init__(self, config, target_hash, initial_sequence):
+        self.root = config.config['setup_cache_dir']
+        digest = hashlib.sha256(target_hash.encode('utf-8'))
+        digest.update(json.dumps({'initial': [action.to_string() for action in initial_sequence],
+                                  'template': config.config['sandbox_template']}).encode('utf-8'))
+        self.key = digest.hexdigest()
+        self.path = os.path.join(self.root, self.key[:32])
+
+    def exists(self):
+        return os.path.isdir(self.path)
+
+    def save(self, home):
+        """Copy a set-up sandbox home into the cache (blocking)"""
+        os.makedirs(self.root, exist_ok=True)
+        staging = tempfile.mkdtemp(prefix='.staging-', dir=self.root)
+        try:
+            snapshot = os.path.join(staging, 'home')
+            InstanceSandbox.copy_tree(home, snapshot)
+            # Sockets and scratch files of the dead target are not state
+            shutil.rmtree(os.path.join(snapshot, 'tmp'), ignore_errors=True)
+            try:
+                os.rename(snapshot, self.path)
+            except OSError:
+                pass  # another instance saved the same state first
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+class CgroupController:
+    """Place a target in its own cgroup v2 group for limits and accounting"""
+    CGROUP_ROOT = '/sys/fs/cgroup'
+
+    def __init__(self, config, instance_id=0):
+        self.config = config
+        self.instance_id = instance_id
+        self.path = None
+        self.oom_kill_baseline = 0
+        self.cpu_samples = {}  # consumer -> (monotonic time, usage_usec)
+
+    @classmethod
+    def available(cls):
+        """True on hosts with a unified (v2) cgroup hierarchy"""
+        return os.path.exists(os.path.join(cls.CGROUP_ROOT, 'cgroup.controllers'))
+
+    def _read(self, name, path=None):
+        with open(os.path.join(path or self.path, name), 'r') as f:
+            return f.read().strip()
+
+    def _write(self, name, value, path=None):
+        with open(os.path.join(path or self.path, name), 'w') as f:
+            f.write(str(value))
+
+    def _read_keyed(self, name):
+        """Parse a flat keyed file such as memory.events or cpu.stat"""
+        values = {}
+        for line in self._read(name).splitlines():
+            key, _, value = line.partition(' ')
+            values[key] = int(value)
+        return values
+
+    @classmethod
+    def own_cgroup(cls):
+        """Path of the cgroup this fuzzer runs in"""
+        with open('/proc/self/cgroup', 'r') as f:
+            for line in f:
+                if line.startswith('0::'):
+                    return os.path.join(cls.CGROUP_ROOT, line[3:].strip().lstrip('/'))
+        raise OSError("No cgroup v2 membership found")
+
+    @classmethod
+    def home_cgroup(cls):
+        """The cgroup the fuzzer was started in, even after create() moved it"""
+        own = cls.own_cgroup()
+        if os.path.basename(own) == 'fuzzer-controller':
+            return os.path.dirname(own)
+        return own
+
+    def create(self):
+        """Create the target cgroup and apply limits derived from the config"""
+        parent = self.config.config['cgroup_parent'] or self.home_cgroup()
+        if not parent.startswith(self.CGROUP_ROOT + os.sep):
+            parent = os.path.join(self.CGROUP_ROOT, parent.lstrip('/'))
+
+        # cgroup v2 only allows controllers on groups without member processes,
+        # so move the fuzzer out of a parent it is running in
+        if os.path.realpath(parent) == os.path.realpath(self.own_cgroup()):
+            controller = os.path.join(parent, 'fuzzer-controller')
+            os.makedirs(controller, exist_ok=True)
+            self._write('cgroup.procs', os.getpid(), controller)
+
+        self._write('cgroup.subtree_control', '+memory +cpu', parent)
+
+        self.path = os.path.join(parent, f"fuzzer-{os.getpid()}-{self.instance_id}")
+        os.makedirs(self.path, exist_ok=True)
+
+        memory_max = int(psutil.virtual_memory().total * self.config.config['memory_threshold'] / 100)
+        self._write('memory.max', memory_max)
+        if self.config.config['cgroup_disable_swap']:
+            try:
+                self._write('memory.swap.max', 0)
+            except OSError:
+                pass
+
+        # cpu_threshold follows psutil's per-process scale: 100% is one core
+        period = self.config.config['cgroup_cpu_period']
+        quota = int(period * self.config.config['cpu_threshold'] / 100)
+        self._write('cpu.max', f"{quota} {period}")
+
+        logging.info(f"Created cgroup {self.path} (memory.max={memory_max}, cpu.max={quota} {period})")
+        return self.path
+
+    def add(self, pid):
+        """Move a launched process into the group; its later children inherit it
+
+        Called by the parent as soon as Popen returns, before the target has
+        had a chance to start helpers of its own.
+        """
+        self._write('cgroup.procs', pid)
+
+    def reset(self):
+        """Take new accounting baselines before launching a target"""
+        self.oom_kill_baseline = self.oom_kills()
+        self.cpu_samples = {}
+
+    def oom_kills(self):
+        try:
+            return self._read_keyed('memory.events').get('oom_kill', 0)
+        except (OSError, ValueError):
+            return 0
+
+    def oom_killed(self):
+        """True if the kernel OOM-killed something in the group since reset()"""
+        return self.oom_kills() > self.oom_kill_baseline
+
+    def memory_current(self):
+        """Memory charged to the whole group in bytes"""
+        return int(self._read('memory.current'))
+
+    def memory_percent(self):
+        return self.memory_current() / psutil.virtual_memory().total * 100
+
+    def cpu_percent(self, consumer='default'):
+        """CPU usage of the group since this consumer's previous call (100% is one core)"""
+        usage = self._read_keyed('cpu.stat')['usage_usec']
+        now = time.monotonic()
+        previous = self.cpu_samples.get(consumer)
+        self.cpu_samples[consumer] = (now, usage)
+        if previous is None or now <= previous[0]:
+            return 0.0
+        return (usage - previous[1]) / ((now - previous[0]) * 1e6) * 100
+
+    def process_count(self):
+        return len(self._read('cgroup.procs').split())
+
+    def kill_all(self, timeout=2.0):
+        """Kill every process in the group, including ones that escaped the tree"""
+        try:
+            self._write('cgroup.kill', 1)
+        except OSError:
+            # cgroup.kill needs Linux 5.14; fall back to signalling each member
+            for pid in self._read('cgroup.procs').split():
+                try:
+                    os.kill(int(pid), signal.SIGKILL)
+                except OSError:
+                    pass
+
+        deadline = time.time() + timeout
+        while self.process_count() and time.time() < deadline:
+            time.sleep(0.05)
+
+    def destroy(self):
+        """Kill remaining members and remove the group"""
+        if not self.path:
+            return
+        parent = os.path.dirname(self.path)
+        try:
+            self.kill_all()
+            os.rmdir(self.path)
+        except OSError as e:
+            logging.error(f"Error removing cgroup {self.path}: {str(e)}")
+        self.path = None
+        self.release_controller(parent)
+
+    @classmethod
+    def release_controller(cls, parent):
+        """Move the fuzzer back out of fuzzer-controller once its last target group is gone"""
+        controller = os.path.join(parent, 'fuzzer-controller')
+        try:
+            if os.path.realpath(cls.own_cgroup()) != os.path.realpath(controller):
+                return
+            if glob.glob(os.path.join(parent, f"fuzzer-{os.getpid()}-*")):
+                return
+            # Processes cannot rejoin a group that delegates controllers
+            with open(os.path.join(parent, 'cgroup.subtree_control'), 'w') as f:
+                f.write('-memory -cpu')
+            with open(os.path.join(parent, 'cgroup.procs'), 'w') as f:
+                f.write(str(os.getpid()))
+            os.rmdir(controller)
+        except OSError as e:
+            logging.error(f"Error restoring fuzzer cgroup: {str(e)}")
+
+class Action:
+    """A single parsed sequence entry such as LEFT_CLICK,100,200"""
+    # Actions whose arguments are all integers
+    INTEGER_ACTIONS = {'LEFT_CLICK', 'RIGHT_CLICK', 'DOUBLE_CLICK', 'MIDDLE_CLICK',
+                       'MOVE', 'DRAG', 'VERIFY_PIXEL'}
+    # Number of leading arguments that are x, y coordinate pairs
+    COORDINATE_ARGS = {'LEFT_CLICK': 2, 'RIGHT_CLICK': 2, 'DOUBLE_CLICK': 2, 'MIDDLE_CLICK': 2,
+                       'MOVE': 2, 'DRAG': 4, 'VERIFY_PIXEL': 2}
+    # Actions that send the fuzz input to the target
+    INPUT_ACTIONS = {'CTRL_V', 'TYPE_SLOT', 'SET_TEXT', 'SET_SLOT'}
+
+    def __init__(self, kind, args=()):
+        self.kind = kind
+        self.args = list(args)
+
+    @classmethod
+    def parse(cls, text):
+        """Parse the comma separated representation used by the sequence lists"""
+        kind, _, rest = text.strip().partition(',')
+        if kind in ('CUSTOM_KEYS', 'SET_TEXT', 'ACTIVATE'):
+            args = [rest]
+        elif kind == 'SET_SLOT':
+            locator, _, slot = rest.rpartition(',')
+            args = [locator, slot]
+        elif kind in cls.INTEGER_ACTIONS:
+            args = [int(part) for part in rest.split(',')]
+        elif kind == 'FIND_IMAGE':
+            path, _, confidence = rest.rpartition(',')
+            args = [path, float(confidence)]
+        elif kind == 'WAIT':
+            args = [float(rest)]
+        else:
+            args = rest.split(',') if rest else []
+        return cls(kind, args)
+
+    def to_string(self):
+        return ','.join([self.kind] + [str(arg) for arg in self.args])
+
+    def translate(self, dx, dy):
+        """Copy of the action with its coordinates shifted by (dx, dy)"""
+        args = list(self.args)
+        for i in range(self.COORDINATE_ARGS.get(self.kind, 0)):
+            args[i] += dy if i % 2 else dx
+        return Action(self.kind, args)
+
+    def __repr__(self):
+        return f"Action({self.to_string()!r})"
+
+def compile_sequence(lines):
+    """Parse sequence strings once so the fuzz loop does not re-split them per input"""
+    return [Action.parse(line) for line in lines]
+
+class SequenceMutator:
+    """Derive randomized variants of a compiled action sequence
+
+    Every variant gets a few insertions, deletions, reorderings, coordinate
+    jitters or extra waits so crashes reached through event orderings are
+    explored without hand-authoring sequences.
+    """
+    OPERATORS = ('insert', 'delete', 'swap', 'jitter', 'timing')
+    # Assertions only make sense where they were recorded, and moving or
+    # dropping an input action would log crashes against inputs never sent
+    ANCHORED_ACTIONS = {'VERIFY_PIXEL', 'FIND_IMAGE'} | Action.INPUT_ACTIONS
+    COORDINATE_ACTIONS = {kind: Action.COORDINATE_ARGS[kind]
+                          for kind in Action.COORDINATE_ARGS.keys() - ANCHORED_ACTIONS}
+
+    def __init__(self, config, seed=None, window_relative=False):
+        self.max_mutations = max(1, int(config.config['sequence_max_mutations']))
+        self.coordinate_jitter = int(config.config['coordinate_jitter'])
+        self.timing_jitter = float(config.config['timing_jitter'])
+        if seed is None:
+            seed = config.config['sequence_mutation_seed']
+        self.rng = random.Random(seed)
+        # Window-relative coordinates are not bounded by the screen size
+        self.screen_size = None
+        if not window_relative:
+            try:
+                self.screen_size = pyautogui.size()
+            except Exception:
+                pass
+
+    def mutate(self, sequence):
+        """Return a mutated copy of the sequence; the original is left untouched"""
+        mutated = [Action(action.kind, action.args) for action in sequence]
+        pool = [action for action in sequence if action.kind not in self.ANCHORED_ACTIONS]
+        for _ in range(self.rng.randint(1, self.max_mutations)):
+            operator = self.rng.choice(self.OPERATORS)
+            getattr(self, f"mutate_{operator}")(mutated, pool)
+        return mutated
+
+    def movable_indices(self, sequence):
+        return [i for i, action in enumerate(sequence) if action.kind not in self.ANCHORED_ACTIONS]
+
+    def mutate_insert(self, sequence, pool):
+        """Repeat one of the original actions at a random position"""
+        if pool:
+            action = self.rng.choice(pool)
+            sequence.insert(self.rng.randint(0, len(sequence)), Action(action.kind, action.args))
+
+    def mutate_delete(self, sequence, pool):
+        indices = self.movable_indices(sequence)
+        if len(sequence) > 1 and indices:
+            del sequence[self.rng.choice(indices)]
+
+    def mutate_swap(self, sequence, pool):
+        indices = self.movable_indices(sequence)
+        if len(indices) > 1:
+            i, j = self.rng.sample(indices, 2)
+            sequence[i], sequence[j] = sequence[j], sequence[i]
+
+    def mutate_jitter(self, sequence, pool):
+        """Move the coordinates of a pointer action by a few pixels"""
+        indices = [i for i, action in enumerate(sequence) if action.kind in self.COORDINATE_ACTIONS]
+        if not indices or self.coordinate_jitter <= 0:
+            return
+        action = sequence[self.rng.choice(indices)]
+        for i in range(self.COORDINATE_ACTIONS[action.kind]):
+            value = action.args[i] + self.rng.randint(-self.coordinate_jitter, self.coordinate_jitter)
+            if self.screen_size is not None:
+                value = min(max(value, 0), self.screen_size[i % 2] - 1)
+            action.args[i] = value
+
+    def mutate_timing(self, sequence, pool):
+        """Add a random pause between two actions"""
+        if self.timing_jitter > 0:
+            wait = Action('WAIT', [round(self.rng.uniform(0, self.timing_jitter), 3)])
+            sequence.insert(self.rng.randint(0, len(sequence)), wait)
+
+class SlotSource:
+    """Re-iterable stream of values for one template slot
+
+    A slot spec is one of {"values": [...]}, {"corpus": "path"} or
+    {"generator": "regex", "count": N, "seed": S}. Text corpora are re-read,
+    binary corpora mapped once, and generator values re-derived from their
+    seeds on every iteration, so nothing is held in memory. Call close() to
+    release a mapped corpus.
+    """
+    def __init__(self, name, spec):
+        self.name = name
+        self.spec = spec
+        self.corpus = None
+        self.length = None
+        if not any(key in spec for key in ('values', 'corpus', 'generator')):
+            raise ValueError(f"Slot {name} needs values, a corpus or a generator")
+
+    def __iter__(self):
+        if 'values' in self.spec:
+            return iter(self.spec['values'])
+        if 'corpus' in self.spec:
+            return self._corpus_lines()
+        return self._generated()
+
+    def __len__(self):
+        if 'values' in self.spec:
+            return len(self.spec['values'])
+        if 'corpus' in self.spec:
+            if self.binary_corpus() is not None:
+                return len(self.corpus)
+            if self.length is None:
+                with open(self.spec['corpus'], 'rb') as f:
+                    self.length = sum(1 for _ in f)
+            return self.length
+        return int(self.spec.get('count', 100))
+
+    def binary_corpus(self):
+        """The mapped corpus, opened on first use, or None for text corpora"""
+        if self.corpus is None and BinaryCorpus.is_corpus(self.spec['corpus']):
+            self.corpus = BinaryCorpus(self.spec['corpus'])
+        return self.corpus
+
+    def _corpus_lines(self):
+        if self.binary_corpus() is not None:
+            yield from self.corpus
+            return
+        with open(self.spec['corpus'], 'r', encoding='utf-8', errors='replace') as f:
+            for line in f:
+                yield line.rstrip('\r\n')
+
+    def close(self):
+        if self.corpus is not None:
+            self.corpus.close()
+            self.corpus = None
+
+    def _generated(self):
+        seed = int(self.spec.get('seed', 0))
+        for offset in range(int(self.spec.get('count', 100))):
+            yield rstr.Rstr(random.Random(seed + offset)).xeger(self.spec['generator'])
+
+class BinaryCorpus:
+    """Memory-mapped, indexed corpus built by `corpus build`
+
+    Layout (little endian): a 32 byte header (magic, version, flags, record
+    count, index offset, bucket table offset), the records, each a u32
+    length, a u8 flag byte (bit 0: valid UTF-8) and the raw payload, then
+    one u64 record offset per entry and, when built with length buckets, a
+    table of (u32 bit length, u64 first entry, u64 entry count). Entries of a
+    bucketed corpus are ordered by length bucket, shortest first. Payloads
+    may hold any bytes, including newlines; invalid UTF-8 is decoded as
+    Latin-1 like legacy fuzz lists.
+    """
+    MAGIC = b'AFZC'
+    VERSION = 1
+    HEADER = struct.Struct('<4sHHQQQ')
+    RECORD = struct.Struct('<IB')
+    BUCKET = struct.Struct('<IQQ')
+    FLAG_UTF8 = 0x01
+    FLAG_BUCKETED = 0x01
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, 'rb')
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.flags, self.count, self.index_offset, bucket_offset = \
+            self.HEADER.unpack_from(self.map, 0)
+        if magic != self.MAGIC or version != self.VERSION:
+            raise ValueError(f"{path} is not a binary corpus")
+        self.buckets = []
+        if bucket_offset:
+            (bucket_count,) = struct.unpack_from('<I', self.map, bucket_offset)
+            self.buckets = [self.BUCKET.unpack_from(self.map, bucket_offset + 4 + i * self.BUCKET.size)
+                            for i in range(bucket_count)]
+
+    @classmethod
+    def is_corpus(cls, path):
+        try:
+            with open(path, 'rb') as f:
+                return f.read(len(cls.MAGIC)) == cls.MAGIC
+        except OSError:
+            return False
+
+    def __len__(self):
+        return self.count
+
+    def record(self, i):
+        """Return (payload bytes, valid UTF-8) of entry i"""
+        if i < 0:
+            i += self.count
+        if not 0 <= i < self.count:
+            raise IndexError(i)
+        (offset,) = struct.unpack_from('<Q', self.map, self.index_offset + 8 * i)
+        length, flags = self.RECORD.unpack_from(self.map, offset)
+        start = offset + self.RECORD.size
+        return self.map[start:start + length], bool(flags & self.FLAG_UTF8)
+
+    def raw(self, i):
+        return self.record(i)[0]
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self.count))]
+        payload, utf8 = self.record(i)
+        return payload.decode('utf-8' if utf8 else 'latin-1')
+
+    def __iter__(self):
+        return (self[i] for i in range(self.count))
+
+    def close(self):
+        self.map.close()
+        self.file.close()
+
+    @staticmethod
+    def read_sources(sources, strip=False):
+        """Yield raw payloads: one per file of a directory, one JSON string per
+        line of a .jsonl file, otherwise one per line"""
+        for source in sources:
+            if os.path.isdir(source):
+                for dirpath, _, filenames in os.walk(source):
+                    for filename in sorted(filenames):
+                        with open(os.path.join(dirpath, filename), 'rb') as f:
+                            yield f.read()
+            elif source.endswith('.jsonl'):
+                with open(source, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        if line.strip():
+                            yield json.loads(line).encode('utf-8', errors='surrogateescape')
+            else:
+                with open(source, 'rb') as f:
+                    for line in f:
+                        line = line.rstrip(b'\r\n')
+                        yield line.strip() if strip else line
+
+    @classmethod
+    def build(cls, output, sources, dedup=True, bucket=False, strip=False):
+        """Write a corpus file from text files, .jsonl files or directories"""
+        seen = set()
+        offsets, lengths = array('Q'), array('Q')
+        duplicates = 0
+        with open(output, 'wb') as f:
+            f.write(b'\0' * cls.HEADER.size)
+            offset = cls.HEADER.size
+            for payload in cls.read_sources(sources, strip):
+                if dedup:
+                    digest = hashlib.blake2b(payload, digest_size=16).digest()
+                    if digest in seen:
+                        duplicates += 1
+                        continue
+                    seen.add(digest)
+                try:
+                    payload.decode('utf-8')
+                    flags = cls.FLAG_UTF8
+                except UnicodeDecodeError:
+                    flags = 0
+                f.write(cls.RECORD.pack(len(payload), flags))
+                f.write(payload)
+                offsets.append(offset)
+                lengths.append(len(payload))
+                offset += cls.RECORD.size + len(payload)
+
+            order = range(len(offsets))
+            buckets = []
+            if bucket:
+                # Stable, so entries keep source order within a bucket
+                order = sorted(order, key=lambda i: lengths[i].bit_length())
+                for bits, group in itertools.groupby(order, key=lambda i: lengths[i].bit_length()):
+                    start = buckets[-1][1] + buckets[-1][2] if buckets else 0
+                    buckets.append((bits, start, sum(1 for _ in group)))
+
+            index_offset = offset
+            index = array('Q', (offsets[i] for i in order))
+            if sys.byteorder != 'little':
+                index.byteswap()
+            index.tofile(f)
+            bucket_offset = 0
+            if buckets:
+                bucket_offset = index_offset + 8 * len(index)
+                f.write(struct.pack('<I', len(buckets)))
+                for entry in buckets:
+                    f.write(cls.BUCKET.pack(*entry))
+
+            f.seek(0)
+            f.write(cls.HEADER.pack(cls.MAGIC, cls.VERSION, cls.FLAG_BUCKETED if buckets else 0,
+                                    len(index), index_offset, bucket_offset))
+        return {'records': len(offsets), 'duplicates': duplicates, 'buckets': buckets}
+
+class InputTemplate:
+    """Lazily combine named slots into per-iteration inputs
+
+    Each input is a dict mapping slot names to values, typed by TYPE_SLOT
+    actions. Slots are combined as a cartesian product, zipped, or sampled
+    so that every pair of values of any two slots appears at least once.
+    """
+    MODES = ('product', 'zip', 'pairwise')
+
+    def __init__(self, slots, mode='product'):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown slot mode: {mode}")
+        self.sources = [SlotSource(name, spec) for name, spec in slots.items()]
+        self.mode = mode
+        self.values = None
+        self.rows = None
+
+    def __iter__(self):
+        if self.mode == 'zip':
+            names = [source.name for source in self.sources]
+            return (dict(zip(names, values)) for values in zip(*self.sources))
+        if self.mode == 'pairwise' and len(self.sources) > 2:
+            return self._pairwise()
+        return self._product(0, {})
+
+    def __len__(self):
+        if self.mode == 'zip':
+            return min((len(source) for source in self.sources), default=0)
+        if self.mode == 'pairwise' and len(self.sources) > 2:
+            return len(self._pairwise_rows())
+        count = 1
+        for source in self.sources:
+            count *= len(source)
+        return count if self.sources else 0
+
+    def _product(self, depth, prefix):
+        """Cartesian product that re-iterates inner slots instead of materializing them"""
+        if depth == len(self.sources):
+            if prefix:
+                yield dict(prefix)
+            return
+        source = self.sources[depth]
+        for value in source:
+            prefix[source.name] = value
+            yield from self._product(depth + 1, prefix)
+
+    def close(self):
+        for source in self.sources:
+            source.close()
+
+    def _pairwise_rows(self):
+        """Value lists and the covering rows are computed once and reused"""
+        if self.rows is None:
+            self.values = [list(source) for source in self.sources]
+            self.rows = self.cover_pairs([len(values) for values in self.values])
+        return self.rows
+
+    def _pairwise(self):
+        names = [source.name for source in self.sources]
+        for row in self._pairwise_rows():
+            yield {name: values[c] for name, values, c in zip(names, self.values, row)}
+
+    @staticmethod
+    def cover_pairs(sizes):
+        """Greedy all-pairs covering; returns one tuple of value indices per row"""
+        if not sizes or 0 in sizes:
+            return []
+        slots = range(len(sizes))
+        # uncovered[p, q][a * sizes[q] + b] stays 1 until value a of slot p
+        # and value b of slot q have appeared in the same row
+        uncovered = {(p, q): bytearray(b'\x01') * (sizes[p] * sizes[q])
+                     for p in slots for q in slots if p < q}
+        remaining = sum(len(flags) for flags in uncovered.values())
+        pending = list(uncovered)
+        cursor = 0
+        rows = []
+        while remaining:
+            # Seed the row with the first uncovered pair of the first open slot pair
+            while True:
+                p, q = pending[0]
+                cursor = uncovered[p, q].find(1, cursor)
+                if cursor >= 0:
+                    break
+                pending.pop(0)
+                cursor = 0
+            row = {p: cursor // sizes[q], q: cursor % sizes[q]}
+
+            # Fill the other slots with the value covering the most new pairs
+            for k in slots:
+                if k in row:
+                    continue
+                columns = []
+                for m, a in row.items():
+                    if m < k:
+                        columns.append(uncovered[m, k][a * sizes[k]:(a + 1) * sizes[k]])
+                    else:
+                        columns.append(uncovered[k, m][a::sizes[m]])
+                scores = [sum(flags) for flags in zip(*columns)]
+                row[k] = scores.index(max(scores))
+
+            for (m, n), flags in uncovered.items():
+                index = row[m] * sizes[n] + row[n]
+                if flags[index]:
+                    flags[index] = 0
+                    remaining -= 1
+            rows.append(tuple(row[k] for k in slots))
+        return rows
+
+class PluginManager:
+    """Import custom action plugins once and dispatch PLUGIN/CUSTOM_SCRIPT actions
+
+    PLUGIN,<name>[,args] runs the plugin registered under name in the
+    'application_fuzzer.actions' entry point group or, failing that,
+    <scripts_dir>/<name>.py; CUSTOM_SCRIPT,<path> runs a script file. A
+    plugin is a module (or an entry point object; classes are instantiated)
+    with an execute(engine, instance, action, fuzz_input) hook and optional
+    setup(engine) and teardown(engine) hooks. Scripts written for the older
+    custom_action(fuzz_input, fuzzer) signature still run. Plugins are
+    imported when the sequence is compiled, so an input only pays for a
+    dictionary lookup and the call.
+    """
+    ENTRY_POINT_GROUP = 'application_fuzzer.actions'
+    ACTIONS = {'PLUGIN', 'CUSTOM_SCRIPT'}
+
+    def __init__(self, config):
+        self.scripts_dir = config.config['scripts_dir']
+        self.plugins = {}  # (kind, name or path) -> plugin
+        self.entry_points = None
+        self.started = []
+
+    @staticmethod
+    def key(action):
+        return (action.kind, action.args[0] if action.args else '')
+
+    def discover_entry_points(self):
+        if self.entry_points is None:
+            from importlib.metadata import entry_points
+            found = entry_points()
+            if hasattr(found, 'select'):
+                found = found.select(group=self.ENTRY_POINT_GROUP)
+            else:
+                found = found.get(self.ENTRY_POINT_GROUP, [])
+            self.entry_points = {entry_point.name: entry_point for entry_point in found}
+        return self.entry_points
+
+    @staticmethod
+    def load_script(path):
+        module_name = "fuzzer_plugin_" + hashlib.sha1(os.path.abspath(path).encode('utf-8')).hexdigest()[:12]
+        spec = importlib.util.spec_from_file_location(module_name, path)
+        if spec is None:
+            raise ImportError(f"Cannot load plugin script {path}")
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+
+    def load(self, action):
+        kind, name = self.key(action)
+        if kind == 'CUSTOM_SCRIPT':
+            plugin = self.load_script(name)
+        elif name in self.discover_entry_points():
+            plugin = self.entry_points[name].load()
+            if isinstance(plugin, type):
+                plugin = plugin()
+        else:
+            path = os.path.join(self.scripts_dir, f"{name}.py")
+            if not os.path.isfile(path):
+                raise ValueError(f"Unknown plugin: {name}")
+            plugin = self.load_script(path)
+
+        if not hasattr(plugin, 'execute') and not hasattr(plugin, 'custom_action'):
+            raise ValueError(f"Plugin {name} has no execute hook")
+        return plugin
+
+    def prepare(self, sequence):
+        """Import every plugin a compiled sequence uses"""
+        for action in sequence:
+            if action.kind in self.ACTIONS and self.key(action) not in self.plugins:
+                self.plugins[self.key(action)] = self.load(action)
+
+    def setup(self, engine):
+        for plugin in self.plugins.values():
+            if plugin in self.started:
+                continue
+            if hasattr(plugin, 'setup'):
+                plugin.setup(engine)
+            self.started.append(plugin)
+
+    def execute(self, engine, instance, action, fuzz_input):
+        """Run a plugin action; may return a coroutine for async hooks"""
+        plugin = self.plugins.get(self.key(action))
+        if plugin is None:
+            # Only actions created after compilation (e.g. by a plugin) get here
+            self.prepare([action])
+            plugin = self.plugins[self.key(action)]
+        if hasattr(plugin, 'execute'):
+            return plugin.execute(engine, instance, action, fuzz_input)
+        return plugin.custom_action(fuzz_input, engine)
+
+    def teardown(self, engine):
+        for plugin in reversed(self.started):
+            if hasattr(plugin, 'teardown'):
+                try:
+                    plugin.teardown(engine)
+                except Exception as e:
+                    logging.error(f"Error in plugin teardown: {str(e)}")
+        self.started = []
+
+class ActionRunner:
+    """Execute compiled actions on the local display through pyautogui"""
+    KEY_PRESSES = {
+        'ENTER': 'enter',
+        'TAB': 'tab',
+        'ESC': 'esc',
+        'DELETE': 'delete',
+        'BACKSPACE': 'backspace'
+    }
+    HOTKEYS = {
+        'CTRL_A': ('ctrl', 'a'),
+        'CTRL_C': ('ctrl', 'c')
+    }
+
+    def __init__(self, display=None):
+        self.display = display
+        self.lock = None
+
+    def execute(self, action, fuzz_input, action_delay):
+        """Execute one action (blocking)"""
+        kind, args = action.kind, action.args
+
+        if kind == "LEFT_CLICK":
+            pyautogui.click(args[0], args[1], _pause=False)
+        elif kind == "RIGHT_CLICK":
+            pyautogui.rightClick(args[0], args[1], _pause=False)
+        elif kind == "DOUBLE_CLICK":
+            pyautogui.doubleClick(args[0], args[1], _pause=False)
+        elif kind == "MIDDLE_CLICK":
+            pyautogui.middleClick(args[0], args[1], _pause=False)
+        elif kind == "MOVE":
+            pyautogui.moveTo(args[0], args[1], duration=0, _pause=False)
+        elif kind == "DRAG":
+            pyautogui.moveTo(args[0], args[1], duration=0, _pause=False)
+            pyautogui.dragTo(args[2], args[3], duration=action_delay, _pause=False)
+        elif kind == "VERIFY_PIXEL":
+            self.verify_pixel_color(args[0], args[1], tuple(args[2:5]))
+        elif kind == "FIND_IMAGE":
+            self.find_and_click_image(args[0], args[1])
+        elif kind == "WAIT":
+            time.sleep(args[0])
+        elif kind == "CTRL_V":
+            pyautogui.write(fuzz_input)
+        elif kind == "TYPE_SLOT":
+            pyautogui.write(fuzz_input[args[0]])
+        elif kind == "CUSTOM_KEYS":
+            pyautogui.hotkey(*[key.strip() for key in args[0].split('+')])
+        elif kind in self.KEY_PRESSES:
+            pyautogui.press(self.KEY_PRESSES[kind])
+        elif kind in self.HOTKEYS:
+            pyautogui.hotkey(*self.HOTKEYS[kind])
+        else:
+            logging.warning(f"Unsupported action skipped: {action.to_string()}")
+
+    async def execute_async(self, action, fuzz_input, action_delay):
+        """Execute an action without blocking the event loop
+
+        pyautogui drives one global display, so instances sharing it are
+        serialized through a lock.
+        """
+        if self.lock is None:
+            self.lock = asyncio.Lock()
+        loop = asyncio.get_running_loop()
+        async with self.lock:
+            await loop.run_in_executor(None, self.execute, action, fuzz_input, action_delay)
+
+    def pixel(self, x, y):
+        return pyautogui.pixel(x, y)
+
+    def screenshot(self):
+        return pyautogui.screenshot()
+
+    def grab(self, region=None):
+        """Capture a (left, top, width, height) region, or the whole screen"""
+        if region is None:
+            return self.screenshot()
+        return pyautogui.screenshot(region=tuple(region))
+
+    def find_and_click_image(self, image_path, confidence):
+        """Find an image on screen and click it"""
+        try:
+            # Ensure image path is absolute
+            if not os.path.isabs(image_path):
+                image_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), image_path)
+
+            # Look for the image on screen
+            location = pyautogui.locateCenterOnScreen(
+                image_path,
+                confidence=confidence,
+                grayscale=True  # Faster performance
+            )
+
+            if location is None:
+                raise Exception(f"Could not find image: {image_path}")
+
+            # Click the center of the found image
+            pyautogui.click(location)
+            logging.info(f"Successfully found and clicked image: {image_path}")
+
+        except Exception as e:
+            logging.error(f"Error in image recognition: {str(e)}")
+            raise
+
+    def verify_pixel_color(self, x, y, expected_color):
+        """Verify if a pixel matches an expected color"""
+        try:
+            actual_color = self.pixel(x, y)
+
+            # Allow small color variations (optional)
+            color_threshold = 10
+
+            if not all(abs(a - b) <= color_threshold
+                      for a, b in zip(actual_color, expected_color)):
+                raise Exception(
+                    f"Color mismatch at ({x}, {y}). "
+                    f"Expected: {expected_color}, "
+                    f"Got: {actual_color}"
+                )
+
+            logging.info(f"Pixel color verification passed at ({x}, {y})")
+
+        except Exception as e:
+            logging.error(f"Error in pixel verification: {str(e)}")
+            raise
+
+class XdotoolActionRunner(ActionRunner):
+    """Execute actions on another X display (e.g. an Xvfb instance) through xdotool"""
+    BUTTONS = {
+        'LEFT_CLICK': ['click', '1'],
+        'RIGHT_CLICK': ['click', '3'],
+        'MIDDLE_CLICK': ['click', '2'],
+        'DOUBLE_CLICK': ['click', '--repeat', '2', '1']
+    }
+    KEY_NAMES = {
+        'ENTER': 'Return',
+        'TAB': 'Tab',
+        'ESC': 'Escape',
+        'DELETE': 'Delete',
+        'BACKSPACE': 'BackSpace',
+        'CTRL_A': 'ctrl+a',
+        'CTRL_C': 'ctrl+c'
+    }
+
+    def __init__(self, display):
+        super().__init__(display)
+        self.env = dict(os.environ, DISPLAY=display)
+        self.xlib_display = None
+
+    def command(self, action, fuzz_input, action_delay):
+        """Translate an action into xdotool arguments"""
+        kind, args = action.kind, action.args
+
+        if kind in self.BUTTONS:
+            return ['mousemove', str(args[0]), str(args[1])] + self.BUTTONS[kind]
+        if kind == "MOVE":
+            return ['mousemove', str(args[0]), str(args[1])]
+        if kind == "DRAG":
+            return ['mousemove', str(args[0]), str(args[1]), 'mousedown', '1',
+                    'sleep', str(action_delay),
+                    'mousemove', str(args[2]), str(args[3]), 'mouseup', '1']
+        if kind == "CTRL_V":
+            return ['type', '--delay', '0', '--', fuzz_input]
+        if kind == "TYPE_SLOT":
+            return ['type', '--delay', '0', '--', fuzz_input[args[0]]]
+        if kind == "CUSTOM_KEYS":
+            return ['key', args[0]]
+        if kind in self.KEY_NAMES:
+            return ['key', self.KEY_NAMES[kind]]
+        return None
+
+    def execute(self, action, fuzz_input, action_delay):
+        if action.kind == "VERIFY_PIXEL":
+            self.verify_pixel_color(action.args[0], action.args[1], tuple(action.args[2:5]))
+            return
+        if action.kind == "WAIT":
+            time.sleep(action.args[0])
+            return
+
+        command = self.command(action, fuzz_input, action_delay)
+        if command is None:
+            raise Exception(f"Action not supported on display {self.display}: {action.to_string()}")
+        subprocess.run(['xdotool'] + command, env=self.env, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    async def execute_async(self, action, fuzz_input, action_delay):
+        """Run xdotool as an asyncio subprocess so no thread is held per instance"""
+        command = self.command(action, fuzz_input, action_delay)
+        if command is None:
+            await asyncio.get_running_loop().run_in_executor(
+                None, self.execute, action, fuzz_input, action_delay)
+            return
+
+        proc = await asyncio.create_subprocess_exec(
+            'xdotool', *command, env=self.env,
+            stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.DEVNULL)
+        if await proc.wait() != 0:
+            raise Exception(f"xdotool failed on display {self.display}: {action.to_string()}")
+
+    def _root_window(self):
+        if self.xlib_display is None:
+            from Xlib import display as xdisplay
+            self.xlib_display = xdisplay.Display(self.display)
+        return self.xlib_display.screen().root
+
+    def pixel(self, x, y):
+        from Xlib import X
+        image = self._root_window().get_image(x, y, 1, 1, X.ZPixmap, 0xffffffff)
+        blue, green, red = image.data[0], image.data[1], image.data[2]
+        return (red, green, blue)
+
+    def screenshot(self):
+        return self.grab()
+
+    def grab(self, region=None):
+        from Xlib import X
+        root = self._root_window()
+        if region is None:
+            geometry = root.get_geometry()
+            region = (0, 0, geometry.width, geometry.height)
+        left, top, width, height = region
+        image = root.get_image(left, top, width, height, X.ZPixmap, 0xffffffff)
+        return Image.frombytes("RGB", (width, height), image.data, "raw", "BGRX")
+
+    def find_and_click_image(self, image_path, confidence):
+        raise Exception(f"FIND_IMAGE is not supported on display {self.display}")
+
+def perceptual_hash(image, hash_size=8):
+    """Difference hash (64 bits by default); near-identical screens differ in only a few bits
+
+    Each bit says whether a pixel of the downscaled grayscale image is
+    brighter than its right neighbour. The comparison and bit packing run
+    inside PIL rather than in a Python loop.
+    """
+    small = image.convert('L').resize((hash_size + 1, hash_size), Image.BILINEAR)
+    left = small.crop((0, 0, hash_size, hash_size))
+    right = small.crop((1, 0, hash_size + 1, hash_size))
+    brighter = ImageChops.subtract(left, right).point(lambda v: 255 if v else 0).convert('1')
+    return int.from_bytes(brighter.tobytes(), 'big')
+
+def hamming_distance(a, b):
+    return bin(a ^ b).count('1')
+
+class ScreenshotStore:
+    """Content-addressed crash screenshots shared by all crashes
+
+    Screens are keyed by perceptual hash so near-identical ones share a
+    file. Encoding (WebP, or fast PNG) and thumbnailing run on a background
+    thread. With baseline diffing, only the changed region against the
+    first screen of the session on that display is stored.
+    """
+    INDEX = 'index.jsonl'
+
+    def __init__(self, config):
+        self.root = config.config['screenshots_dir']
+        os.makedirs(self.root, exist_ok=True)
+        self.max_distance = int(config.config['screenshot_dedup_distance'])
+        self.quality = int(config.config['screenshot_quality'])
+        self.baseline_diff = config.config['screenshot_baseline_diff']
+        self.thumbnail_size = tuple(config.config['thumbnail_size'])
+        self.extension = 'webp' if (config.config['screenshot_format'] == 'webp' and
+                                    features.check('webp')) else 'png'
+        self.lock = threading.Lock()
+        self.encoder = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        self.baselines = {}
+        self.records = {}
+        self.load_index()
+
+    def load_index(self):
+        try:
+            with open(os.path.join(self.root, self.INDEX), 'r') as f:
+                for line in f:
+                    record = json.loads(line)
+                    self.records[int(record['hash'], 16)] = record
+        except (OSError, ValueError):
+            pass
+
+    def find(self, image_hash):
+        """Return the stored record closest to the hash within the dedup distance"""
+        if image_hash in self.records:
+            return self.records[image_hash]
+        best, best_distance = None, self.max_distance + 1
+        for stored_hash, record in self.records.items():
+            distance = hamming_distance(stored_hash, image_hash)
+            if distance < best_distance:
+                best, best_distance = record, distance
+        return best
+
+    def save(self, image, key=None):
+        """Store a screenshot and return its record (the file may still be encoding)"""
+        image_hash = perceptual_hash(image)
+        with self.lock:
+            record = self.find(image_hash)
+            if record is not None:
+                return record
+
+            name = f"{image_hash:016x}"
+            record = {
+                'hash': name,
+                'file': os.path.join(self.root, f"{name}.{self.extension}"),
+                'thumbnail': os.path.join(self.root, f"{name}_thumb.{self.extension}"),
+                'size': list(image.size)
+            }
+
+            stored = image
+            baseline = self.baselines.get((key, image.size)) if self.baseline_diff else None
+            if baseline is not None:
+                bbox = ImageChops.difference(baseline[0].convert('RGB'), image.convert('RGB')).getbbox()
+                if bbox is None:
+                    return baseline[1]
+                stored = image.crop(bbox)
+                record['baseline'] = baseline[1]['file']
+                record['bbox'] = list(bbox)
+            elif self.baseline_diff:
+                self.baselines[(key, image.size)] = (image, record)
+
+            self.records[image_hash] = record
+            with open(os.path.join(self.root, self.INDEX), 'a') as f:
+                f.write(json.dumps(record) + '\n')
+
+        self.encoder.submit(self.encode, image, stored, record)
+        return record
+
+    def encode(self, image, stored, record):
+        try:
+            self.write_image(stored, record['file'])
+            thumbnail = image.copy()
+            thumbnail.thumbnail(self.thumbnail_size)
+            self.write_image(thumbnail, record['thumbnail'])
+        except Exception as e:
+            logging.error(f"Error encoding screenshot {record['file']}: {str(e)}")
+
+    def write_image(self, image, path):
+        if self.extension == 'webp':
+            image.save(path, 'WEBP', quality=self.quality, method=4)
+        else:
+            image.save(path, 'PNG', compress_level=1)
+
+    @staticmethod
+    def load(record):
+        """Rebuild the full screenshot of a record, applying baseline diffs"""
+        image = Image.open(record['file'])
+        if 'baseline' not in record:
+            return image
+        full = Image.open(record['baseline']).convert('RGB')
+        full.paste(image, tuple(record['bbox'][:2]))
+        return full
+
+    def close(self):
+        self.encoder.shutdown(wait=True)
+
+class ScreenFingerprinter:
+    """Learn the screen states a target normally shows and flag new ones
+
+    After every input a region of the screen is hashed with perceptual_hash.
+    During the first inputs of a campaign every state is learned as
+    known-good; afterwards a state further than the threshold from all
+    known states (an error dialog, a blank window) is an anomaly. Each
+    anomalous state is reported once; a later state within the threshold of
+    a reported one is only flagged as a repeat, so a persistent dialog does
+    not crash every following input. Known states persist per target and
+    sequence, so later campaigns skip the learning phase.
+    """
+    def __init__(self, config, key):
+        self.hash_size = int(config.config['fingerprint_hash_size'])
+        self.threshold = int(config.config['fingerprint_threshold'])
+        self.learn_inputs = int(config.config['fingerprint_learn_inputs'])
+        self.region = config.config['fingerprint_region'] or None
+        self.path = config.config['fingerprint_states_path']
+        self.key = key
+        self.lock = threading.Lock()
+        self.known = set()
+        self.reported = set()
+        self.observed = 0
+        self.load()
+        if self.known:
+            self.learn_inputs = 0
+
+    def load(self):
+        try:
+            with open(self.path, 'r') as f:
+                self.known = {int(state, 16) for state in json.load(f).get(self.key, [])}
+        except (OSError, ValueError):
+            pass
+
+    def save(self):
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = {}
+        with self.lock:
+            data[self.key] = sorted(f"{state:x}" for state in self.known)
+        with open(self.path, 'w') as f:
+            json.dump(data, f, indent=4)
+
+    def observe(self, image):
+        """Fingerprint a screen grab; returns state, distance, novelty and anomaly flag"""
+        state = perceptual_hash(image, self.hash_size)
+        bits = self.hash_size * self.hash_size
+        with self.lock:
+            self.observed += 1
+            distance = min((hamming_distance(state, known) for known in self.known), default=bits)
+            learning = self.observed <= self.learn_inputs
+            anomalous = not learning and distance > self.threshold
+            repeat = False
+            if learning:
+                self.known.add(state)
+            elif anomalous:
+                repeat = any(hamming_distance(state, reported) <= self.threshold
+                             for reported in self.reported)
+                if not repeat:
+                    self.reported.add(state)
+        return {
+            'state': f"{state:x}",
+            'distance': distance,
+            'novelty': distance / bits,
+            'anomaly': anomalous and not repeat,
+            'repeat': repeat
+        }
+
+class DelayTuner:
+    """Learn the settle delay after each action kind instead of one global delay
+
+    The first delay_probe_samples occurrences of every action kind are
+    probed: the screen (fingerprint region or whole screen) is hashed until
+    two consecutive grabs match while the target's CPU is idle, and the
+    slowest settle times the margin becomes the kind's delay. After that the
+    delays follow AIMD: when the sequence verifies (VERIFY_PIXEL/FIND_IMAGE),
+    every run of passing inputs shaves a step off each delay and every
+    verification failure doubles them, never exceeding the configured
+    action delay. SETTLE is the wait between the last action and the crash
+    check.
+    """
+    VERIFICATION_ACTIONS = {'VERIFY_PIXEL', 'FIND_IMAGE'}
+
+    def __init__(self, config, ceiling, profile=None):
+        self.ceiling = float(ceiling)
+        self.floor = min(float(config.config['delay_min']), self.ceiling)
+        self.probe_samples = int(config.config['delay_probe_samples'])
+        self.probe_interval = float(config.config['delay_probe_interval'])
+        self.margin = float(config.config['delay_margin'])
+        self.idle_cpu = float(config.config['delay_idle_cpu'])
+        self.decrease_step = float(config.config['delay_decrease_step'])
+        self.decrease_after = int(config.config['delay_decrease_after'])
+        self.region = config.config['fingerprint_region'] or None
+        self.delays = {kind: self.clamp(delay) for kind, delay in (profile or {}).items()}
+        self.samples = {}
+        self.passes = 0
+        self.failures = 0
+
+    def clamp(self, delay):
+        return min(self.ceiling, max(self.floor, float(delay)))
+
+    def probing(self, kind):
+        return kind not in self.delays
+
+    def delay(self, kind):
+        return self.delays.get(kind, self.ceiling)
+
+    def measure(self, instance):
+        """Seconds until the screen is stable and the target idle, capped at the ceiling (blocking)"""
+        start = time.monotonic()
+        previous = None
+        while True:
+            elapsed = time.monotonic() - start
+            if elapsed >= self.ceiling or instance.exited.is_set():
+                return min(elapsed, self.ceiling)
+            try:
+                state = perceptual_hash(instance.runner.grab(self.region))
+            except Exception as e:
+                logging.error(f"Error measuring settle time: {str(e)}")
+                return self.ceiling
+            cpu_percent, _ = instance.monitor_resources('settle')
+            if state == previous and (cpu_percent is None or cpu_percent < self.idle_cpu):
+                return elapsed
+            previous = state
+            time.sleep(self.probe_interval)
+
+    def observe(self, kind, elapsed):
+        samples = self.samples.setdefault(kind, [])
+        samples.append(elapsed)
+        if len(samples) >= self.probe_samples:
+            self.delays[kind] = self.clamp(max(samples) * self.margin)
+            del self.samples[kind]
+
+    def passed(self):
+        """A verified input passed; shave the delays after a long enough streak"""
+        self.passes += 1
+        if self.passes >= self.decrease_after:
+            self.passes = 0
+            for kind, delay in self.delays.items():
+                self.delays[kind] = self.clamp(delay - self.decrease_step)
+
+    def backoff(self):
+        """A verification failed, most likely because the target had not settled"""
+        self.failures += 1
+        self.passes = 0
+        for kind, delay in self.delays.items():
+            self.delays[kind] = self.clamp(delay * 2)
+
+    def profile(self):
+        return {kind: round(delay, 3) for kind, delay in sorted(self.delays.items())}
+
+    @staticmethod
+    def save_profile(sequence_path, profile):
+        """Store a learned profile with its sequence file"""
+        with open(sequence_path, 'r') as f:
+            sequence_data = json.load(f)
+        sequence_data['delay_profile'] = profile
+        with open(sequence_path, 'w') as f:
+            json.dump(sequence_data, f, indent=4)
+
+class WindowGeometryCache:
+    """Locate a target's top-level window on an X display and cache its geometry
+
+    Windows are matched by _NET_WM_PID against the target's process tree,
+    falling back to WM_CLASS. Geometry is cached per window and only dropped
+    when the server reports a ConfigureNotify or DestroyNotify for it, so
+    resolving window-relative coordinates costs no round trip per action.
+    """
+    def __init__(self, display=None):
+        from Xlib import X, error as xerror, display as xdisplay
+        self.X = X
+        self.XError = xerror.XError
+        self.display = xdisplay.Display(display)
+        self.root = self.display.screen().root
+        self.atoms = {name: self.display.intern_atom(name)
+                      for name in ('_NET_CLIENT_LIST', '_NET_CLIENT_LIST_STACKING', '_NET_WM_PID')}
+        self.lock = threading.Lock()
+        self.windows = {}   # lookup key -> window
+        self.geometry = {}  # window id -> (left, top, width, height)
+
+    def process_events(self):
+        """Drop the cached geometry of windows that moved, resized or went away"""
+        while self.display.pending_events():
+            event = self.display.next_event()
+            if event.type == self.X.ConfigureNotify:
+                self.geometry.pop(event.window.id, None)
+            elif event.type == self.X.DestroyNotify:
+                self.geometry.pop(event.window.id, None)
+                self.windows = {key: window for key, window in self.windows.items()
+                                if window.id != event.window.id}
+
+    def client_windows(self, stacking=False):
+        """Top-level application windows, bottom to top when stacking is set"""
+        atom = self.atoms['_NET_CLIENT_LIST_STACKING' if stacking else '_NET_CLIENT_LIST']
+        prop = self.root.get_full_property(atom, self.X.AnyPropertyType)
+        if prop is not None:
+            return [self.display.create_resource_object('window', wid) for wid in prop.value]
+        # No window manager (bare Xvfb): application windows are children of the root
+        return self.root.query_tree().children
+
+    def window_pid(self, window):
+        prop = window.get_full_property(self.atoms['_NET_WM_PID'], self.X.AnyPropertyType)
+        return prop.value[0] if prop is not None and len(prop.value) else None
+
+    def window_class(self, window):
+        wm_class = window.get_wm_class()
+        return wm_class[1] if wm_class else None
+
+    def find_window(self, pids, wm_class=None):
+        """First mapped window owned by one of pids, else the first one of wm_class"""
+        by_class = None
+        for window in self.client_windows():
+            try:
+                if window.get_attributes().map_state != self.X.IsViewable:
+                    continue
+                if self.window_pid(window) in pids:
+                    return window
+                if by_class is None and wm_class and self.window_class(window) == wm_class:
+                    by_class = window
+            except self.XError:
+                continue  # destroyed while we were looking
+        return by_class
+
+    def read_geometry(self, window):
+        geometry = window.get_geometry()
+        origin = self.root.translate_coords(window, 0, 0)
+        return (origin.x, origin.y, geometry.width, geometry.height)
+
+    def locate(self, pids, wm_class=None):
+        """Return (left, top, width, height) of the target window, or None if not mapped
+
+        pids[0] is the target process and keys the cache; without pids the
+        window is looked up by WM_CLASS alone.
+        """
+        with self.lock:
+            self.process_events()
+            key = pids[0] if pids else wm_class
+            window = self.windows.get(key)
+            if window is None:
+                window = self.find_window(set(pids), wm_class)
+                if window is None:
+                    return None
+                # Subscribe before reading the geometry so no move is missed
+                window.change_attributes(event_mask=self.X.StructureNotifyMask)
+                self.display.flush()
+                self.windows[key] = window
+            geometry = self.geometry.get(window.id)
+            if geometry is None:
+                try:
+                    geometry = self.read_geometry(window)
+                except self.XError:
+                    self.windows.pop(key, None)
+                    return None
+                self.geometry[window.id] = geometry
+            return geometry
+
+    def window_at(self, x, y, exclude_pids=()):
+        """Geometry and WM_CLASS of the topmost application window containing (x, y)"""
+        with self.lock:
+            for window in reversed(self.client_windows(stacking=True)):
+                try:
+                    if window.get_attributes().map_state != self.X.IsViewable:
+                        continue
+                    if self.window_pid(window) in exclude_pids:
+                        continue
+                    left, top, width, height = self.read_geometry(window)
+                    if left <= x < left + width and top <= y < top + height:
+                        return (left, top, width, height), self.window_class(window)
+                except self.XError:
+                    continue
+        return None
+
+    def close(self):
+        self.display.close()
+
+class AccessibilityTree:
+    """Resolve and drive widgets of a target application through AT-SPI (Linux)
+
+    A locator is a '/'-separated list of steps, each `role`, `role:name` or
+    `:name` with an optional [n] index, matched among the descendants of the
+    previous step at any depth, e.g. `dialog:Open/text[1]`. Descendants are
+    searched breadth-first, and [n] is the n-th match in that order. Role names use
+    underscores for spaces (push_button). Resolved widgets are cached per
+    locator; children-changed, name and showing events drop the entries whose
+    resolution passed through the changed object, so the tree is not walked
+    again for every input. The target must share the fuzzer's accessibility bus.
+    """
+    ACTIONS = {'SET_TEXT', 'SET_SLOT', 'ACTIVATE'}
+    EVENTS = ('object:children-changed', 'object:property-change:accessible-name',
+              'object:state-changed:showing')
+    STEP = re.compile(r'^(?P<role>[^:\[]*)(?::(?P<name>[^\[]*))?(?:\[(?P<index>\d+)\])?$')
+
+    def __init__(self, pids):
+        import pyatspi
+        from gi.repository import GLib
+        self.pyatspi = pyatspi
+        self.context = GLib.MainContext.default()
+        self.pids = set(pids)
+        self.lock = threading.Lock()
+        self.app = None
+        self.cache = {}  # locator -> (widget, accessibles the resolution passed through)
+        pyatspi.Registry.registerEventListener(self.on_change, *self.EVENTS)
+
+    def on_change(self, event):
+        """Forget cached widgets resolved through the object that changed"""
+        source = event.source
+        if source == self.app:
+            return  # top-level windows come and go; stale entries are caught as defunct
+        self.cache = {locator: entry for locator, entry in self.cache.items()
+                      if not self.contains(entry[1], source)}
+
+    @staticmethod
+    def contains(path, accessible):
+        return any(step == accessible for step in path)
+
+    def process_events(self):
+        while self.context.pending():
+            self.context.iteration(False)
+
+    def application(self):
+        """The accessible application object owned by one of the target's pids"""
+        if self.app is not None and not self.defunct(self.app):
+            return self.app
+        self.app = None
+        desktop = self.pyatspi.Registry.getDesktop(0)
+        for app in desktop:
+            try:
+                if app is not None and app.get_process_id() in self.pids:
+                    self.app = app
+                    break
+            except Exception:
+                continue
+        return self.app
+
+    def defunct(self, accessible):
+        try:
+            return accessible.getState().contains(self.pyatspi.STATE_DEFUNCT)
+        except Exception:
+            return True
+
+    @staticmethod
+    def role_name(accessible):
+        return accessible.getRoleName().replace(' ', '_').lower()
+
+    def match_step(self, parent, step):
+        match = self.STEP.match(step.strip())
+        if match is None:
+            raise ValueError(f"Invalid accessibility locator step: {step}")
+        role = match.group('role').strip().lower()
+        name = match.group('name')
+        index = int(match.group('index') or 0)
+
+        def predicate(accessible):
+            return (accessible is not None
+                    and (not role or self.role_name(accessible) == role)
+                    and (name is None or accessible.name == name))
+
+        for accessible in self.descendants(parent):
+            if predicate(accessible):
+                if index == 0:
+                    return accessible
+                index -= 1
+        return None
+
+    @staticmethod
+    def descendants(parent):
+        """Breadth-first walk below parent, so every [n] index counts in one order"""
+        pending = collections.deque([parent])
+        while pending:
+            try:
+                children = list(pending.popleft())
+            except Exception:
+                continue  # defunct while walking
+            for child in children:
+                if child is not None:
+                    yield child
+                    pending.append(child)
+
+    def resolve(self, locator):
+        """Return the widget a locator points at (blocking)"""
+        with self.lock:
+            self.process_events()
+            entry = self.cache.get(locator)
+            if entry is not None and not self.defunct(entry[0]):
+                return entry[0]
+
+            app = self.application()
+            if app is None:
+                raise Exception("Target application is not on the accessibility bus")
+            path = [app]
+            widget = app
+            for step in locator.split('/'):
+                widget = self.match_step(widget, step)
+                if widget is None:
+                    raise Exception(f"No widget matches {locator}")
+                path.append(widget)
+            self.cache[locator] = (widget, path)
+            return widget
+
+    def execute(self, action, fuzz_input):
+        """Set text through the editable-text interface or run a widget's default action"""
+        widget = self.resolve(action.args[0])
+        if action.kind == 'ACTIVATE':
+            try:
+                widget.queryAction().doAction(0)
+            except NotImplementedError:
+                raise Exception(f"{action.args[0]} has no actions")
+            return
+
+        text = fuzz_input if action.kind == 'SET_TEXT' else fuzz_input[action.args[1]]
+        try:
+            editable = widget.queryEditableText()
+        except NotImplementedError:
+            raise Exception(f"{action.args[0]} is not an editable text widget")
+        if not editable.setTextContents(text):
+            raise Exception(f"Setting text of {action.args[0]} was refused")
+
+    def close(self):
+        self.pyatspi.Registry.deregisterEventListener(self.on_change, *self.EVENTS)
+        self.cache = {}
+
+class TargetInstance:
+    """One launched target together with its monitoring helpers"""
+    def __init__(self, config, app_path, os_type, instance_id=0, display=None, runner=None):
+        self.config = config
+        self.app_path = app_path
+        self.os_type = os_type
+        self.instance_id = instance_id
+        self.display = display
+        self.runner = runner or ActionRunner()
+        self.process = None
+        self.crash_collector = CrashCollector(config)
+        self.exit_watcher = ExitWatcher()
+        self.process_tree = None
+        self.sandbox = None
+        self.cgroup = None
+        self.exited = None
+        self.restarts = 0
+        self.action_offsets = []
+        self.screenshot_store = None
+        self.last_fingerprint = None
+        self.window_cache = None
+        self.accessibility = None
+        self.setup_template = None
+
+    def launch(self):
+        """Launch application based on OS type (blocking)"""
+        app_path, os_type = self.app_path, self.os_type
+
+        popen_kwargs = self.crash_collector.popen_kwargs()
+
+        # Start every launch from a clean copy of the sandbox template
+        if self.config.config['sandbox_enabled']:
+            if self.sandbox is None:
+                self.sandbox = InstanceSandbox(self.config, self.instance_id)
+            self.sandbox.prepare(self.setup_template)
+            popen_kwargs['env'] = self.sandbox.environment()
+
+        if self.display:
+            popen_kwargs['env'] = dict(popen_kwargs.get('env') or os.environ, DISPLAY=self.display)
+
+        # Enforce memory/CPU limits through a dedicated cgroup
+        if self.config.config['cgroup_enabled'] and CgroupController.available():
+            try:
+                if self.cgroup is None:
+                    cgroup = CgroupController(self.config, self.instance_id)
+                    cgroup.create()
+                    self.cgroup = cgroup
+                self.cgroup.reset()
+            except OSError as e:
+                logging.error(f"Cgroup setup failed, running without limits: {str(e)}")
+
+        if os_type == "macos":
+            if app_path.endswith('.app'):
+                # Launch app and wait for it to start
+                process = subprocess.Popen(['open', '-W', app_path], shell=False, **popen_kwargs)
+                time.sleep(1)  # Give the app time to initialize
+            else:
+                process = subprocess.Popen([app_path], shell=False, **popen_kwargs)
+        elif os_type == "windows":
+            process = subprocess.Popen([app_path], shell=True, **popen_kwargs)
+        else:  # Linux
+            process = subprocess.Popen([app_path], shell=False, **popen_kwargs)
+
+        if self.cgroup is not None:
+            try:
+                self.cgroup.add(process.pid)
+            except OSError as e:
+                logging.error(f"Error moving target into cgroup {self.cgroup.path}: {str(e)}")
+
+        self.crash_collector.attach(process)
+
+        # Follow the real application behind `open -W` / the Windows shell
+        self.process_tree = ProcessTree(process, app_path, os_type)
+        self.process_tree.resolve_target(self.config.config['target_resolve_timeout'])
+
+        # Verify process started successfully
+        if process.poll() is not None:
+            raise Exception("Process failed to start")
+
+        self.process = process
+        logging.info(f"Successfully launched application: {app_path}")
+        return process
+
+    def watch_exit(self, loop):
+        """Arm the exit watcher; must be called on the event loop thread"""
+        self.exited = asyncio.Event()
+        self.exit_watcher.callbacks = [lambda: loop.call_soon_threadsafe(self.exited.set)]
+        tree = self.process_tree
+        self.exit_watcher.watch(tree.target if tree.is_wrapped else self.process, loop)
+
+    async def wait_exit(self, timeout):
+        """Sleep for up to timeout seconds; return True early if the target exited"""
+        if self.exited.is_set():
+            return True
+        if timeout <= 0:
+            return False
+        try:
+            await asyncio.wait_for(self.exited.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    def terminate(self):
+        """Terminate the target together with its launcher and descendants"""
+        if self.process is None:
+            return
+        if self.process_tree is not None:
+            self.process_tree.kill_tree()
+        elif self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=2)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+        if self.cgroup is not None:
+            self.cgroup.kill_all()
+
+    def close(self):
+        """Terminate the target and release sandbox and cgroup resources"""
+        self.exit_watcher.stop()
+        try:
+            self.terminate()
+        except Exception as e:
+            logging.error(f"Error terminating application: {str(e)}")
+        if self.sandbox is not None:
+            self.sandbox.cleanup()
+            self.sandbox = None
+        if self.cgroup is not None:
+            self.cgroup.destroy()
+            self.cgroup = None
+        if self.window_cache is not None:
+            self.window_cache.close()
+            self.window_cache = None
+        if self.accessibility is not None:
+            self.accessibility.close()
+            self.accessibility = None
+
+    def window_geometry(self, wm_class=None):
+        """(left, top, width, height) of the target's window on its display (blocking)"""
+        if self.os_type != "linux":
+            raise Exception("Window-relative coordinates require an X11 display")
+        if self.window_cache is None:
+            self.window_cache = WindowGeometryCache(self.display)
+        pids = [self.process.pid]
+        if self.process_tree is not None:
+            pids = [self.process_tree.target_pid] + [proc.pid for proc in self.process_tree.processes()]
+        geometry = self.window_cache.locate(pids, wm_class)
+        if geometry is None:
+            raise Exception("Target window not found")
+        return geometry
+
+    def execute_accessible(self, action, fuzz_input):
+        """Run an AT-SPI action against the current target process (blocking)"""
+        if self.os_type != "linux":
+            raise Exception("Accessibility actions require AT-SPI (Linux)")
+        pid = self.process_tree.target_pid if self.process_tree is not None else self.process.pid
+        if self.accessibility is None or pid not in self.accessibility.pids:
+            if self.accessibility is not None:
+                self.accessibility.close()
+            pids = [pid]
+            if self.process_tree is not None:
+                pids += [proc.pid for proc in self.process_tree.processes()]
+            self.accessibility = AccessibilityTree(pids)
+        self.accessibility.execute(action, fuzz_input)
+
+    def monitor_resources(self, consumer='default'):
+        """Sample CPU and memory usage of the target process tree
+
+        CPU usage covers the time since the same consumer's previous sample.
+        """
+        try:
+            if self.cgroup is not None:
+                return self.cgroup.cpu_percent(consumer), self.cgroup.memory_percent()
+            if self.process_tree is not None:
+                return self.process_tree.cpu_percent(consumer), self.process_tree.memory_percent()
+        except (psutil.NoSuchProcess, psutil.AccessDenied, OSError):
+            pass
+        return None, None
+
+    def memory_rss(self):
+        """Resident memory of the target tree in bytes"""
+        try:
+            if self.cgroup is not None:
+                return self.cgroup.memory_current()
+            if self.process_tree is not None:
+                return self.process_tree.memory_rss()
+        except (psutil.NoSuchProcess, psutil.AccessDenied, OSError):
+            pass
+        return None
+
+    def detect_crash(self):
+        """Enhanced crash detection"""
+        process = self.process
+        try:
+            # A kernel OOM kill is only visible through the cgroup
+            if self.cgroup is not None and self.cgroup.oom_killed():
+                return "OOM Kill"
+
+            tree = self.process_tree
+            if tree is not None and tree.is_wrapped:
+                # The launcher's exit status says nothing about the real target
+                if not tree.is_alive():
+                    return "Process Terminated"
+                proc = tree.target
+            else:
+                # Reap the child first so exits are not mistaken for zombies
+                exit_info = self.crash_collector.classify_exit(process.poll())
+                if exit_info:
+                    return exit_info['crash_type']
+
+                if not psutil.pid_exists(process.pid):
+                    return "Process Terminated"
+
+                proc = psutil.Process(process.pid)
+
+            # Check process status
+            if proc.status() == psutil.STATUS_ZOMBIE:
+                return "Zombie Process"
+
+            # Check resource usage across the whole tree; the tree keeps a
+            # CPU baseline between calls so no sampling interval is needed
+            try:
+                cpu_percent, memory_percent = self.monitor_resources('crash')
+                if cpu_percent is None:
+                    return "Process Access Error"
+
+                # Check thresholds
+                if cpu_percent > self.config.config['cpu_threshold']:
+                    return "CPU Spike"
+                if memory_percent > self.config.config['memory_threshold']:
+                    return "Memory Leak"
+
+            except (psutil.NoSuchProcess, psutil.AccessDenied, OSError):
+                return "Process Access Error"
+
+            return None
+
+        except psutil.NoSuchProcess:
+            return "Process Terminated"
+        except Exception as e:
+            logging.error(f"Error in crash detection: {str(e)}")
+            return None
+
+    def capture_crash_state(self, fuzz_input, crash_type, sequence, action_index=None,
+                            screenshot=True, replay=None, fingerprint=None):
+        """Capture system state when a crash occurs"""
+        timestamp = time.strftime("%Y%m%d-%H%M%S")
+        crash_dir = os.path.join(self.config.config['crashes_dir'],
+                                 f"{timestamp}-{self.instance_id}-{time.time_ns() % 1000000:06d}")
+        os.makedirs(crash_dir, exist_ok=True)
+
+        # Save screenshot
+        screenshot_record = None
+        if screenshot:
+            try:
+                image = self.runner.screenshot()
+                if self.screenshot_store is not None:
+                    screenshot_record = self.screenshot_store.save(image, self.display)
+                else:
+                    image.save(os.path.join(crash_dir, "screenshot.png"))
+            except Exception as e:
+                logging.error(f"Error capturing crash screenshot: {str(e)}")
+
+        # Save crash information
+        crash_info = {
+            'timestamp': timestamp,
+            'input': fuzz_input,
+            'crash_type': crash_type,
+            'sequence': [action.to_string() for action in sequence],
+            'action_index': action_index,
+            'instance': self.instance_id,
+            'display': self.display,
+            'system_info': {
+                'os': platform.platform(),
+                'python': platform.python_version(),
+                'cpu_count': psutil.cpu_count(),
+                'memory_total': psutil.virtual_memory().total
+            }
+        }
+
+        # Save native evidence (exit status, stderr tail, core dump, backtrace)
+        try:
+            process = self.process if not (self.process_tree and self.process_tree.is_wrapped) else None
+            native = self.crash_collector.collect(process, crash_type, crash_dir, self.app_path)
+        except Exception as e:
+            logging.error(f"Error collecting native crash evidence: {str(e)}")
+            native = {'bucket': CrashCollector.compute_bucket(crash_type)}
+        crash_info['bucket'] = native.pop('bucket')
+        crash_info['native'] = native
+
+        # Silent failures are grouped by the screen state they ended in
+        if fingerprint is not None:
+            crash_info['fingerprint'] = fingerprint
+            crash_info['bucket'] = CrashCollector.compute_bucket(
+                f"{crash_type} {fingerprint['state']}")
+
+        # Everything needed to relaunch and re-drive the target
+        if replay is not None:
+            crash_info['replay'] = replay
+        if screenshot_record is not None:
+            crash_info['screenshot'] = screenshot_record
+
+        with open(os.path.join(crash_dir, "crash_info.json"), 'w') as f:
+            json.dump(crash_info, f, indent=4)
+
+        return crash_dir, crash_info
+
+class TestedInputCache:
+    """Persistent record of inputs already tested against a target and sequence
+
+    Rows are keyed by a hash of the target binary, a hash of the setup and
+    main sequences (and the mutation settings, when sequences are mutated)
+    and a hash of the input, so an input is only considered tested when it
+    ran against an identical target driven the same way.
+    """
+    MODES = ('off', 'skip', 'deprioritize')
+    LOOKUP_CHUNK = 500
+    FLUSH_SIZE = 100
+
+    def __init__(self, path, target_hash, sequence_hash):
+        self.target_hash = target_hash
+        self.sequence_hash = sequence_hash
+        self.pending = []
+        self.skipped = 0
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS tested_inputs (
+                target_hash TEXT NOT NULL,
+                sequence_hash TEXT NOT NULL,
+                input_hash TEXT NOT NULL,
+                outcome TEXT NOT NULL,
+                duration REAL NOT NULL,
+                tested_at TEXT NOT NULL,
+                PRIMARY KEY (target_hash, sequence_hash, input_hash)
+            ) WITHOUT ROWID
+        """)
+        self.conn.commit()
+
+    @staticmethod
+    def hash_target(app_path):
+        """Hash the target binary; bundles and directories hash their file listing"""
+        digest = hashlib.sha256()
+        if os.path.isfile(app_path):
+            with open(app_path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                    digest.update(chunk)
+        elif os.path.isdir(app_path):
+            for dirpath, dirnames, filenames in os.walk(app_path):
+                dirnames.sort()
+                for name in sorted(filenames):
+                    path = os.path.join(dirpath, name)
+                    try:
+                        st = os.stat(path)
+                    except OSError:
+                        continue
+                    digest.update(f"{os.path.relpath(path, app_path)}:{st.st_size}:"
+                                  f"{st.st_mtime_ns}\n".encode('utf-8'))
+        else:
+            # Commands resolved through PATH
+            digest.update(app_path.encode('utf-8'))
+        return digest.hexdigest()
+
+    @staticmethod
+    def hash_sequence(initial_sequence, main_sequence, mutation=None):
+        key = {'initial': [action.to_string() for action in initial_sequence],
+               'main': [action.to_string() for action in main_sequence]}
+        if mutation is not None:
+            key['mutation'] = mutation
+        data = json.dumps(key)
+        return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def hash_input(fuzz_input):
+        if not isinstance(fuzz_input, str):
+            fuzz_input = json.dumps(fuzz_input, sort_keys=True)
+        return hashlib.sha256(fuzz_input.encode('utf-8', errors='surrogatepass')).hexdigest()
+
+    def tested(self, input_hashes):
+        """Return the subset of input hashes already recorded"""
+        return set(self.outcomes(input_hashes))
+
+    def outcomes(self, input_hashes):
+        """Map recorded input hashes to their (outcome, duration)"""
+        placeholders = ','.join('?' * len(input_hashes))
+        rows = self.conn.execute(
+            f"SELECT input_hash, outcome, duration FROM tested_inputs WHERE target_hash = ? "
+            f"AND sequence_hash = ? AND input_hash IN ({placeholders})",
+            [self.target_hash, self.sequence_hash] + list(input_hashes))
+        return {row[0]: (row[1], row[2]) for row in rows}
+
+    def filter(self, inputs, mode):
+        """Lazily drop (skip) or postpone (deprioritize) already tested inputs"""
+        self.skipped = 0
+        deferred = []
+        chunk = []
+
+        def drain():
+            tested = self.tested({self.hash_input(fuzz_input) for fuzz_input in chunk})
+            for fuzz_input in chunk:
+                if self.hash_input(fuzz_input) not in tested:
+                    yield fuzz_input
+                elif mode == 'deprioritize':
+                    deferred.append(fuzz_input)
+                else:
+                    self.skipped += 1
+            chunk.clear()
+
+        for fuzz_input in inputs:
+            chunk.append(fuzz_input)
+            if len(chunk) >= self.LOOKUP_CHUNK:
+                yield from drain()
+        yield from drain()
+        yield from deferred
+
+    def record(self, fuzz_input, outcome, duration):
+        self.pending.append((self.target_hash, self.sequence_hash, self.hash_input(fuzz_input),
+                             outcome, duration, datetime.datetime.now().isoformat()))
+        if len(self.pending) >= self.FLUSH_SIZE:
+            self.flush()
+
+    def flush(self):
+        if self.pending:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO tested_inputs VALUES (?, ?, ?, ?, ?, ?)", self.pending)
+            self.conn.commit()
+            self.pending = []
+
+    def close(self):
+        self.flush()
+        self.conn.close()
+
+class InputScheduler:
+    """Order a campaign's inputs so restarts interrupt as little work as possible
+
+    Every input gets a predicted crash probability and cost. Outcomes the
+    tested-input cache holds for the same target and sequence come first,
+    then outcomes of the same input in earlier sessions of the results
+    store, smoothed towards cheap heuristics (length, format specifiers,
+    control characters, long runs of one character) that also score unseen
+    inputs. Likely-benign inputs run first, cheapest first, in one
+    uninterrupted stretch; likely crashers are isolated at the end, most
+    likely first, so the relaunch, launch delay and setup they cost are not
+    spread over the run. Inputs are scored in one pass over an indexable
+    source (a list or binary corpus); only the order is kept in memory.
+    """
+    LOOKUP_CHUNK = 500
+    FORMAT_SPECIFIER = re.compile(r'%[-+ #0-9.]*[nsxpd]')
+    CONTROL_CHARS = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]')
+    LONG_RUN = re.compile(r'(.)\1{63,}', re.S)
+
+    def __init__(self, config, settings, tested_cache=None, store=None):
+        self.threshold = float(config.config['schedule_crash_threshold'])
+        self.tested_cache = tested_cache
+        self.store = store
+        action_delay = settings['action_delay']
+        self.restart_cost = settings['launch_delay'] + len(settings['initial_sequence']) * action_delay
+        self.input_cost = (len(settings['main_sequence']) + 1) * action_delay
+        self.likely_crashers = 0
+        self.skipped = 0
+
+    @staticmethod
+    def can_schedule(inputs):
+        """Streams (templates, filtered generators) would have to be materialized"""
+        return hasattr(inputs, '__getitem__') and hasattr(inputs, '__len__')
+
+    @classmethod
+    def heuristic(cls, text):
+        """Prior crash probability of an input nobody has run yet"""
+        probability = 0.02
+        if len(text) > 1024:
+            probability += 0.2
+        elif len(text) > 256:
+            probability += 0.1
+        if cls.FORMAT_SPECIFIER.search(text):
+            probability += 0.3
+        if cls.CONTROL_CHARS.search(text):
+            probability += 0.2
+        if cls.LONG_RUN.search(text):
+            probability += 0.15
+        return min(probability, 0.95)
+
+    def predict(self, text, cached, history):
+        """Return (crash probability, expected seconds, tested by cache) for one input"""
+        prior = self.heuristic(text)
+        duration = None
+        if cached is not None:
+            outcome, duration = cached
+            probability = 0.9 if outcome != "OK" else prior / 4
+        elif history is not None:
+            runs, failures, duration = history
+            probability = (failures + prior) / (runs + 1)
+        else:
+            probability = prior
+        if duration is None:
+            duration = self.input_cost
+        return probability, duration + probability * self.restart_cost, cached is not None
+
+    def schedule(self, inputs, tested_mode='off'):
+        """Return (inputs, run order as indices); tested_mode applies the tested-input cache"""
+        self.skipped = 0
+        entries = []
+        for start in range(0, len(inputs), self.LOOKUP_CHUNK):
+            chunk = [inputs[i] for i in range(start, min(start + self.LOOKUP_CHUNK, len(inputs)))]
+            texts = [ResultsStore.encode_input(fuzz_input) for fuzz_input in chunk]
+            cached = {}
+            if self.tested_cache is not None:
+                hashes = [TestedInputCache.hash_input(fuzz_input) for fuzz_input in chunk]
+                outcomes = self.tested_cache.outcomes(set(hashes))
+                cached = {text: outcomes.get(input_hash) for text, input_hash in zip(texts, hashes)}
+            history = self.store.input_history(chunk) if self.store is not None else {}
+            for offset, text in enumerate(texts):
+                probability, cost, tested = self.predict(text, cached.get(text), history.get(text))
+                if tested and tested_mode == 'skip':
+                    self.skipped += 1
+                    continue
+                entries.append((start + offset, probability, cost, tested))
+
+        deprioritize_tested = tested_mode == 'deprioritize'
+
+        def order(entry):
+            index, probability, cost, tested = entry
+            crasher = probability >= self.threshold
+            return (deprioritize_tested and tested, crasher, -probability if crasher else cost, index)
+
+        entries.sort(key=order)
+        self.likely_crashers = sum(1 for entry in entries if entry[1] >= self.threshold)
+        return inputs, [entry[0] for entry in entries]
+
+class FuzzMetrics:
+    """Counters and latency histograms exposed by the metrics endpoint
+
+    Only the engine thread writes. Readers copy the plain ints, dicts and
+    lists (atomic under the GIL) instead of taking locks, so scraping never
+    stalls the fuzz loop.
+    """
+    LATENCY_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+    RATE_WINDOW = 10.0
+
+    def __init__(self):
+        self.started = time.time()
+        self.inputs = 0
+        self.recent_inputs = collections.deque(maxlen=100000)
+        self.crashes = {}
+        self.restarts = 0
+        self.target_rss = {}
+        self.target_cpu = {}
+        self.pending_inputs = 0
+        self.results_queue = None
+        self.histograms = {}
+
+    def observe(self, phase, seconds):
+        """Record the latency of one engine phase"""
+        histogram = self.histograms.get(phase)
+        if histogram is None:
+            histogram = self.histograms[phase] = {
+                'counts': [0] * (len(self.LATENCY_BUCKETS) + 1), 'sum': 0.0, 'count': 0}
+        histogram['counts'][bisect.bisect_left(self.LATENCY_BUCKETS, seconds)] += 1
+        histogram['sum'] += seconds
+        histogram['count'] += 1
+
+    def input_done(self, count=1):
+        self.inputs += count
+        now = time.time()
+        self.recent_inputs.extend([now] * count)
+
+    def crash(self, bucket, crash_type):
+        key = (bucket, crash_type)
+        self.crashes[key] = self.crashes.get(key, 0) + 1
+
+    def inputs_per_second(self):
+        now = time.time()
+        recent = [t for t in list(self.recent_inputs) if now - t <= self.RATE_WINDOW]
+        window = min(self.RATE_WINDOW, now - self.started)
+        return len(recent) / window if window > 0 else 0.0
+
+    def snapshot(self):
+        return {
+            'uptime': time.time() - self.started,
+            'inputs': self.inputs,
+            'inputs_per_second': self.inputs_per_second(),
+            'crashes': [{'bucket': bucket, 'crash_type': crash_type, 'count': count}
+                        for (bucket, crash_type), count in dict(self.crashes).items()],
+            'restarts': self.restarts,
+            'target_rss': dict(self.target_rss),
+            'target_cpu': dict(self.target_cpu),
+            'pending_inputs': self.pending_inputs,
+            'results_queue': self.results_queue() if self.results_queue else 0,
+            'latency': {phase: {'buckets': dict(zip([str(b) for b in self.LATENCY_BUCKETS] + ['+Inf'],
+                                                     itertools.accumulate(list(h['counts'])))),
+                                'sum': h['sum'], 'count': h['count']}
+                        for phase, h in dict(self.histograms).items()}
+        }
+
+    @staticmethod
+    def _label(value):
+        return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+    def prometheus(self):
+        """Render the snapshot in the Prometheus text exposition format"""
+        snapshot = self.snapshot()
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                label_text = ','.join(f'{key}="{self._label(val)}"' for key, val in labels.items())
+                lines.append(f"{name}{{{label_text}}} {value}" if label_text else f"{name} {value}")
+
+        metric('fuzzer_inputs_total', 'counter', "Inputs executed", [({}, snapshot['inputs'])])
+        metric('fuzzer_inputs_per_second', 'gauge',
+               f"Inputs per second over the last {self.RATE_WINDOW:g}s",
+               [({}, f"{snapshot['inputs_per_second']:.3f}")])
+        metric('fuzzer_crashes_total', 'counter', "Crashes by bucket and type",
+               [({'bucket': c['bucket'], 'type': c['crash_type']}, c['count'])
+                for c in snapshot['crashes']])
+        metric('fuzzer_restarts_total', 'counter', "Target restarts", [({}, snapshot['restarts'])])
+        metric('fuzzer_target_rss_bytes', 'gauge', "Resident memory of the target tree",
+               [({'instance': i}, v) for i, v in snapshot['target_rss'].items()])
+        metric('fuzzer_target_cpu_percent', 'gauge', "CPU usage of the target tree",
+               [({'instance': i}, v) for i, v in snapshot['target_cpu'].items()])
+        metric('fuzzer_pending_inputs', 'gauge', "Inputs not yet executed in the current batch",
+               [({}, snapshot['pending_inputs'])])
+        metric('fuzzer_results_queue_depth', 'gauge', "Result rows waiting to be written",
+               [({}, snapshot['results_queue'])])
+
+        lines.append("# HELP fuzzer_phase_seconds Latency of engine phases")
+        lines.append("# TYPE fuzzer_phase_seconds histogram")
+        for phase, histogram in snapshot['latency'].items():
+            for le, count in histogram['buckets'].items():
+                lines.append(f'fuzzer_phase_seconds_bucket{{phase="{phase}",le="{le}"}} {count}')
+            lines.append(f'fuzzer_phase_seconds_sum{{phase="{phase}"}} {histogram["sum"]:.6f}')
+            lines.append(f'fuzzer_phase_seconds_count{{phase="{phase}"}} {histogram["count"]}')
+        return '\n'.join(lines) + '\n'
+
+class MetricsServer:
+    """Serve FuzzMetrics over HTTP from a daemon thread
+
+    GET /metrics returns the Prometheus text format, GET /metrics.json a
+    JSON snapshot.
+    """
+    def __init__(self, metrics, host='127.0.0.1', port=9464):
+        self.metrics = metrics
+        self.host = host
+        self.port = port
+        self.server = None
+        self.thread = None
+
+    def start(self):
+        metrics = self.metrics
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                path = self.path.split('?', 1)[0]
+                if path == '/metrics':
+                    body = metrics.prometheus().encode('utf-8')
+                    content_type = 'text/plain; version=0.0.4; charset=utf-8'
+                elif path in ('/metrics.json', '/json'):
+                    body = json.dumps(metrics.snapshot(), default=str).encode('utf-8')
+                    content_type = 'application/json'
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self.server.daemon_threads = True
+        self.port = self.server.server_address[1]
+        self.thread = Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        logging.info(f"Metrics available at http://{self.host}:{self.port}/metrics")
+
+    def stop(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+class AsyncFuzzEngine:
+    """Asyncio orchestration core driving one or more target instances
+
+    Blocking work (pyautogui, psutil, screenshots, crash writing) runs in the
+    default executor; timers, exit notifications and pause/stop are awaited
+    on the event loop so many instances share a single controller thread.
+    """
+    INPUT_ACTIONS = Action.INPUT_ACTIONS
+
+    def __init__(self, config, stats, settings, status_callback=None, progress_callback=None,
+                 crash_callback=None, resource_callback=None):
+        self.config = config
+        self.stats = stats
+        self.settings = settings
+        self.status_callback = status_callback or (lambda message: None)
+        self.progress_callback = progress_callback or (lambda done, total: None)
+        self.crash_callback = crash_callback or (lambda crash: None)
+        self.resource_callback = resource_callback or (lambda cpu, memory: None)
+
+        self.initial_sequence = compile_sequence(settings['initial_sequence'])
+        self.main_sequence = compile_sequence(settings['main_sequence'])
+        self.plugins = PluginManager(config)
+        self.plugins.prepare(self.initial_sequence + self.main_sequence)
+        self.launch_delay = settings['launch_delay']
+        self.action_delay = settings['action_delay']
+        self.window_relative = settings.get('coordinate_space') == 'window'
+        self.mutator = (SequenceMutator(config, window_relative=self.window_relative)
+                        if settings.get('mutate_sequence') else None)
+        self.delay_tuner = None
+        if settings.get('tune_delays'):
+            self.delay_tuner = DelayTuner(config, self.action_delay, settings.get('delay_profile'))
+        self.verifies = any(action.kind in DelayTuner.VERIFICATION_ACTIONS
+                            for action in self.main_sequence)
+
+        # Batches share the actions before the first one that sends an input
+        self.batch_size = max(1, int(config.config['batch_size']))
+        split = settings.get('batch_prefix')
+        if split is None:
+            split = next((i for i, action in enumerate(self.main_sequence)
+                          if action.kind in self.INPUT_ACTIONS), 0)
+        self.batch_prefix = self.main_sequence[:split]
+        self.batch_body = self.main_sequence[split:]
+        self.tested_cache = None
+        self.screenshot_store = None
+        self.fingerprinter = None
+        self.scheduler = None
+        self.setup_cache = None
+        self.metrics = FuzzMetrics()
+        self.metrics_server = None
+
+        self.loop = None
+        self.stop_requested = None
+        self.resumed = None
+        self.stop_flag = Event()
+        self.pause_flag = Event()
+        self.instances = []
+        self.samplers = []
+        self.runners = {}
+        self.inputs = None
+        self.total_inputs = 0
+        self.completed_inputs = 0
+
+    # Thread-safe controls (called from the GUI thread)
+
+    def request_stop(self):
+        self.stop_flag.set()
+        if self.loop is not None:
+            self.loop.call_soon_threadsafe(self._apply_controls)
+
+    def pause(self):
+        self.pause_flag.set()
+        if self.loop is not None:
+            self.loop.call_soon_threadsafe(self._apply_controls)
+
+    def resume(self):
+        self.pause_flag.clear()
+        if self.loop is not None:
+            self.loop.call_soon_threadsafe(self._apply_controls)
+
+    def _apply_controls(self):
+        if self.stop_flag.is_set():
+            self.stop_requested.set()
+            self.resumed.set()  # wake paused instances so they can exit
+        elif self.pause_flag.is_set():
+            self.resumed.clear()
+        else:
+            self.resumed.set()
+
+    @property
+    def stopping(self):
+        return self.stop_requested.is_set()
+
+    @staticmethod
+    def settings_from_sequence(sequence_path, app_path, os_type, log_path='fuzz_crashes.txt',
+                               fuzz_list_path=None, screenshot_on_crash=True,
+                               mutate_sequence=False, tune_delays=False):
+        """Build engine settings from a saved sequence file (headless mode)"""
+        with open(sequence_path, 'r') as f:
+            sequence_data = json.load(f)
+        timing = sequence_data.get('timing', {})
+        return {
+            'app_path': app_path,
+            'os_type': os_type,
+            'fuzz_list_path': fuzz_list_path,
+            'log_path': log_path,
+            'initial_sequence': sequence_data.get('initial_setup', []),
+            'main_sequence': sequence_data.get('main_sequence', []),
+            'launch_delay': int(timing.get('launch_delay', 5)),
+            'action_delay': float(timing.get('action_delay', 0.5)),
+            'screenshot_on_crash': screenshot_on_crash,
+            'mutate_sequence': mutate_sequence,
+            'slots': sequence_data.get('slots', {}),
+            'slot_mode': sequence_data.get('slot_mode', 'product'),
+            'coordinate_space': sequence_data.get('coordinates', 'screen'),
+            'window_class': sequence_data.get('window_class'),
+            'tune_delays': tune_delays,
+            'delay_profile': sequence_data.get('delay_profile'),
+            'batch_prefix': sequence_data.get('batch_prefix'),
+            'sequence_path': sequence_path
+        }
+
+    @staticmethod
+    def load_inputs(path):
+        """Load fuzz inputs from a binary corpus, or a text file with one per line"""
+        if BinaryCorpus.is_corpus(path):
+            corpus = BinaryCorpus(path)
+            logging.info(f"Mapped binary corpus with {len(corpus)} inputs")
+            return corpus
+        try:
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                inputs = [line.strip() for line in f.readlines()]
+                logging.info(f"Successfully loaded {len(inputs)} inputs using UTF-8 encoding")
+        except UnicodeDecodeError:
+            with open(path, 'r', encoding='latin-1') as f:
+                inputs = [line.strip() for line in f.readlines()]
+        return inputs
+
+    def runner_for(self, display):
+        """One action runner per display, shared by the instances on it"""
+        if display not in self.runners:
+            if display and display != os.environ.get('DISPLAY'):
+                self.runners[display] = XdotoolActionRunner(display)
+            else:
+                self.runners[display] = ActionRunner(display)
+        return self.runners[display]
+
+    def create_instances(self):
+        """Create target instances, one per configured display"""
+        count = max(1, int(self.config.config['instances']))
+        displays = list(self.config.config['displays'])
+        if count > 1 and len(displays) < count:
+            logging.warning("Concurrent instances need one display each; "
+                            f"running {max(1, len(displays))} instance(s)")
+            count = max(1, len(displays))
+
+        if self.settings['screenshot_on_crash'] and self.screenshot_store is None:
+            self.screenshot_store = ScreenshotStore(self.config)
+
+        instances = []
+        for instance_id in range(count):
+            display = displays[instance_id] if instance_id < len(displays) else None
+            instance = TargetInstance(self.config, self.settings['app_path'],
+                                      self.settings['os_type'], instance_id, display,
+                                      self.runner_for(display))
+            instance.screenshot_store = self.screenshot_store
+            instances.append(instance)
+        return instances
+
+    async def run(self, inputs=None):
+        """Run the fuzzing campaign until inputs are exhausted or a stop is requested"""
+        owned = inputs is None
+        if inputs is None and self.settings.get('slots'):
+            inputs = InputTemplate(self.settings['slots'], self.settings.get('slot_mode', 'product'))
+        elif inputs is None:
+            self.status_callback("Loading fuzz list...")
+            inputs = self.load_inputs(self.settings['fuzz_list_path'])
+
+        try:
+            await self.open()
+            await self.process(inputs)
+        finally:
+            await self.close()
+            # Templates and binary corpora opened here hold mapped files
+            if owned and hasattr(inputs, 'close'):
+                inputs.close()
+
+    async def open(self):
+        """Create, launch and set up all target instances"""
+        self.loop = asyncio.get_running_loop()
+        self.stop_requested = asyncio.Event()
+        self.resumed = asyncio.Event()
+        self._apply_controls()
+        self.plugins.setup(self)
+
+        if self.config.config['metrics_port'] and self.metrics_server is None:
+            self.metrics_server = MetricsServer(self.metrics, self.config.config['metrics_host'],
+                                                self.config.config['metrics_port'])
+            try:
+                self.metrics_server.start()
+            except OSError as e:
+                logging.error(f"Error starting metrics endpoint: {str(e)}")
+                self.metrics_server = None
+        if self.stats.store is not None:
+            self.metrics.results_queue = lambda: self.stats.store.pending_count
+
+        if self.config.config['fingerprint_enabled'] and self.fingerprinter is None:
+            sequence_hash = TestedInputCache.hash_sequence(self.initial_sequence, self.main_sequence)
+            self.fingerprinter = ScreenFingerprinter(
+                self.config, f"{self.settings['app_path']}:{sequence_hash[:16]}")
+
+        mode = self.config.config['tested_cache_mode']
+        if mode != 'off' and self.tested_cache is None:
+            target_hash = await self.loop.run_in_executor(
+                None, TestedInputCache.hash_target, self.settings['app_path'])
+            self.tested_cache = TestedInputCache(
+                self.config.config['tested_cache_path'], target_hash,
+                TestedInputCache.hash_sequence(self.initial_sequence, self.main_sequence,
+                                               self.mutation_settings()))
+
+        if self.config.config['setup_cache_enabled'] and self.initial_sequence and self.setup_cache is None:
+            if self.config.config['sandbox_enabled']:
+                target_hash = await self.loop.run_in_executor(
+                    None, TestedInputCache.hash_target, self.settings['app_path'])
+                self.setup_cache = SetupStateCache(self.config, target_hash, self.initial_sequence)
+            else:
+                logging.warning("The setup state cache needs sandbox_enabled; running the setup GUI")
+
+        if self.config.config['input_order'] == 'smart' and self.scheduler is None:
+            self.scheduler = InputScheduler(self.config, self.settings, self.tested_cache,
+                                            self.stats.store)
+
+        self.instances = self.create_instances()
+        started = await asyncio.gather(*[self.start_instance(instance)
+                                         for instance in self.instances])
+        if not all(started):
+            raise Exception("Failed to launch application")
+        self.samplers = [asyncio.create_task(self.sample_resources(instance))
+                         for instance in self.instances]
+
+    def mutation_settings(self):
+        """Settings that shape mutated sequences, or None when mutation is off"""
+        if self.mutator is None:
+            return None
+        return {key: self.config.config[key] for key in
+                ('sequence_max_mutations', 'coordinate_jitter', 'timing_jitter')}
+
+    async def process(self, inputs):
+        """Feed a batch of inputs to the running instances until it is exhausted"""
+        total = len(inputs)
+        mode = 'off'
+        if self.tested_cache is not None:
+            mode = self.config.config['tested_cache_mode']
+            if mode == 'skip' and self.mutator is not None:
+                # Each run is one random variant, so a tested input is not exhausted
+                logging.info("Sequence mutation is on; deprioritizing tested inputs instead of skipping")
+                mode = 'deprioritize'
+
+        scheduled = self.scheduler is not None and InputScheduler.can_schedule(inputs)
+        if self.scheduler is not None and not scheduled:
+            logging.info("Smart input ordering needs a list or binary corpus; keeping source order")
+            self.status_callback("Streamed inputs are not reordered")
+
+        if scheduled:
+            # The scheduler consults the tested-input cache itself
+            self.status_callback("Ordering inputs...")
+            source, order = self.scheduler.schedule(inputs, mode)
+            inputs = (source[index] for index in order)
+            total = len(order)
+            if self.scheduler.skipped:
+                self.status_callback(f"Skipping {self.scheduler.skipped} already tested inputs")
+            self.status_callback(f"Scheduled {total} inputs, "
+                                 f"{self.scheduler.likely_crashers} likely crashers isolated at the end")
+        elif self.tested_cache is not None:
+            if isinstance(inputs, list):
+                inputs = list(self.tested_cache.filter(inputs, mode))
+                total = len(inputs)
+                if self.tested_cache.skipped:
+                    self.status_callback(f"Skipping {self.tested_cache.skipped} already tested inputs")
+            else:
+                # Lazy streams are filtered as they are consumed; the total is an upper bound
+                inputs = self.tested_cache.filter(inputs, mode)
+
+        self.total_inputs = total
+        self.completed_inputs = 0
+        self.inputs = enumerate(inputs, 1)
+        self.metrics.pending_inputs = total
+        self.progress_callback(0, self.total_inputs)
+
+        workers = [asyncio.create_task(self.run_instance(instance)) for instance in self.instances]
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            if self.tested_cache is not None:
+                self.tested_cache.flush()
+
+    async def close(self):
+        """Stop samplers and shut all instances down"""
+        for sampler in self.samplers:
+            sampler.cancel()
+        await asyncio.gather(*self.samplers, return_exceptions=True)
+        self.samplers = []
+        for instance in self.instances:
+            instance.exit_watcher.stop()
+            await self.loop.run_in_executor(None, instance.close)
+        if self.tested_cache is not None:
+            self.tested_cache.close()
+            self.tested_cache = None
+        if self.metrics_server is not None:
+            self.metrics_server.stop()
+            self.metrics_server = None
+        if self.screenshot_store is not None:
+            await self.loop.run_in_executor(None, self.screenshot_store.close)
+            self.screenshot_store = None
+        if self.fingerprinter is not None:
+            try:
+                self.fingerprinter.save()
+            except OSError as e:
+                logging.error(f"Error saving screen states: {str(e)}")
+            self.fingerprinter = None
+        self.plugins.teardown(self)
+        if self.delay_tuner is not None and self.settings.get('sequence_path'):
+            try:
+                DelayTuner.save_profile(self.settings['sequence_path'], self.delay_tuner.profile())
+            except (OSError, ValueError) as e:
+                logging.error(f"Error saving delay profile: {str(e)}")
+
+    def next_input(self):
+        """Hand out the next input to whichever instance is free"""
+        if self.inputs is None:
+            return None
+        return next(self.inputs, None)
+
+    def next_inputs(self, count):
+        """Hand out up to count inputs for one batch"""
+        if self.inputs is None:
+            return []
+        return list(itertools.islice(self.inputs, count))
+
+    async def run_instance(self, instance):
+        """Fuzz loop of a single target instance"""
+        while not self.stopping:
+            await self.resumed.wait()
+            if self.stopping:
+                break
+
+            items = self.next_inputs(self.batch_size)
+            if not items:
+                break
+
+            # The target died outside of any input (e.g. during setup)
+            if instance.exited.is_set():
+                logging.warning("Application exited before input was sent, restarting")
+                if not await self.restart_instance(instance):
+                    raise Exception("Failed to relaunch application")
+
+            if len(items) == 1:
+                await self.run_input(instance, items[0][1])
+            else:
+                await self.run_batch(instance, [fuzz_input for _, fuzz_input in items])
+
+            self.completed_inputs += len(items)
+            self.metrics.input_done(len(items))
+            self.metrics.pending_inputs = max(0, self.total_inputs - self.completed_inputs)
+            self.progress_callback(self.completed_inputs, self.total_inputs)
+
+    async def run_input(self, instance, fuzz_input):
+        """Execute the sequence for one input and handle a resulting crash"""
+        self.log_fuzz_input(fuzz_input)
+
+        sequence = self.main_sequence
+        if self.mutator is not None:
+            sequence = self.mutator.mutate(sequence)
+
+        started = self.loop.time()
+        try:
+            exit_index = await self.execute_sequence(instance, sequence, fuzz_input)
+        except Exception as e:
+            logging.error(f"Error executing sequence for input {fuzz_input}: {str(e)}")
+            return None
+        self.metrics.observe('sequence', self.loop.time() - started)
+
+        # Let the input settle, waking up as soon as the target exits
+        if exit_index is None and await self.settle(instance, 'SETTLE'):
+            exit_index = len(sequence) - 1
+
+        crash_type = await self.check_crash(instance)
+        if self.delay_tuner is not None and self.verifies and crash_type is None:
+            self.delay_tuner.passed()
+        duration = self.loop.time() - started
+        self.metrics.observe('input', duration)
+        self.stats.add_input(fuzz_input, crash_type or "OK", duration, instance.instance_id)
+        if self.tested_cache is not None:
+            self.tested_cache.record(fuzz_input, crash_type or "OK", duration)
+        if crash_type:
+            await self.handle_crash(instance, fuzz_input, crash_type, exit_index, sequence)
+        return crash_type
+
+    async def check_crash(self, instance):
+        """Detect a crash, or an anomalous screen state of a live target"""
+        detect_started = self.loop.time()
+        crash_type = await self.loop.run_in_executor(None, instance.detect_crash)
+        self.metrics.observe('detect', self.loop.time() - detect_started)
+
+        # A live target can still be showing an error dialog or a blank window
+        instance.last_fingerprint = None
+        if crash_type is None and self.fingerprinter is not None:
+            fingerprint_started = self.loop.time()
+            instance.last_fingerprint = await self.loop.run_in_executor(
+                None, self.fingerprint, instance)
+            self.metrics.observe('fingerprint', self.loop.time() - fingerprint_started)
+            if instance.last_fingerprint and instance.last_fingerprint['anomaly']:
+                crash_type = "Screen Anomaly"
+        return crash_type
+
+    async def run_batch(self, instance, batch, log=True):
+        """Send several inputs in one sequence iteration and check for a crash once
+
+        The shared prefix runs once, the rest of the sequence once per input.
+        On a crash the inputs sent up to the one the target died on are
+        bisected by re-running halves until a single input reproduces it;
+        inputs after the culprit, or never received, run as a new batch.
+        """
+        if log:
+            for fuzz_input in batch:
+                self.log_fuzz_input(fuzz_input)
+
+        started = self.loop.time()
+        try:
+            crash_type, position, _ = await self.execute_batch(instance, batch)
+        except Exception as e:
+            logging.error(f"Error executing sequence for batch of {len(batch)} inputs: {str(e)}")
+            return
+        duration = (self.loop.time() - started) / len(batch)
+        self.metrics.observe('input', duration)
+        if crash_type is None:
+            self.record_inputs(batch, "OK", duration, instance)
+            return
+
+        sent = batch if position is None else batch[:position + 1]
+        unsent = [] if position is None else batch[position + 1:]
+        logging.warning(f"Crash ({crash_type}) in a batch of {len(batch)} inputs, bisecting")
+        if not await self.restart_instance(instance):
+            raise Exception("Failed to relaunch application")
+        rest = await self.bisect(instance, sent, crash_type, duration) + unsent
+
+        if rest and not self.stopping:
+            await self.run_batch(instance, rest, log=False)
+
+    async def bisect(self, instance, candidates, crash_type, duration):
+        """Find the first input of a crashed batch that crashes alone
+
+        Returns the inputs that still have to run: those after the culprit,
+        and all untested ones when bisection is cut short.
+        """
+        after = []
+        while candidates and not self.stopping:
+            test = candidates if len(candidates) == 1 else candidates[:len(candidates) // 2]
+            try:
+                crash, position, exit_index = await self.execute_batch(instance, test)
+            except Exception as e:
+                logging.error(f"Error executing sequence while bisecting: {str(e)}")
+                return candidates + after
+            if crash is None:
+                self.record_inputs(test, "OK", duration, instance)
+                candidates = candidates[len(test):]
+                continue
+            if len(test) == 1:
+                self.record_inputs(test, crash, duration, instance)
+                await self.handle_crash(instance, test[0], crash, exit_index)
+                return candidates[len(test):] + after
+
+            if not await self.restart_instance(instance):
+                raise Exception("Failed to relaunch application")
+            narrowed = test if position is None else test[:position + 1]
+            after = test[len(narrowed):] + candidates[len(test):] + after
+            candidates = narrowed
+
+        if not self.stopping:
+            message = f"Batch crash ({crash_type}) did not reproduce with a single input"
+            logging.warning(message)
+            self.stats.add_event('batch', message)
+        return candidates + after
+
+    async def execute_batch(self, instance, batch):
+        """Run the shared prefix once and the sequence body per input
+
+        Returns (crash type, index of the input being sent when the target
+        exited, index of that action in the main sequence). Afterwards
+        instance.action_offsets times the whole main sequence as a replay of
+        the last input sent would run it: the prefix, then that input's body.
+        """
+        position = exit_index = None
+        prefix_started = self.loop.time()
+        exit_at = await self.execute_sequence(instance, self.batch_prefix, None)
+        prefix_offsets = list(instance.action_offsets)
+        prefix_duration = self.loop.time() - prefix_started
+        if exit_at is not None:
+            exit_index = exit_at
+        else:
+            for i, fuzz_input in enumerate(batch):
+                exit_at = await self.execute_sequence(instance, self.batch_body, fuzz_input)
+                instance.action_offsets = prefix_offsets + [
+                    round(prefix_duration + offset, 4) for offset in instance.action_offsets]
+                if exit_at is not None:
+                    position, exit_index = i, len(self.batch_prefix) + exit_at
+                    break
+        if exit_index is None and await self.settle(instance, 'SETTLE'):
+            position, exit_index = len(batch) - 1, len(self.main_sequence) - 1
+        crash_type = await self.check_crash(instance)
+        # Crashing batches and bisection steps say nothing about the delays
+        if self.delay_tuner is not None and self.verifies and crash_type is None and exit_index is None:
+            self.delay_tuner.passed()
+        return crash_type, position, exit_index
+
+    def record_inputs(self, inputs, status, duration, instance):
+        for fuzz_input in inputs:
+            self.stats.add_input(fuzz_input, status, duration, instance.instance_id)
+            if self.tested_cache is not None:
+                self.tested_cache.record(fuzz_input, status, duration)
+
+    async def execute_sequence(self, instance, sequence, fuzz_input, offsets=None):
+        """Execute a compiled sequence
+
+        The start of every action, relative to the start of the sequence, is
+        recorded in instance.action_offsets. When offsets are given (replay)
+        each action is started at its recorded offset instead of being paced
+        by the action delay; actions past the recorded ones are paced normally.
+
+        Returns the index of the action after which the target exited,
+        or None if it stayed alive for the whole sequence.
+        """
+        start = self.loop.time()
+        instance.action_offsets = []
+        for i, action in enumerate(sequence):
+            if self.stopping:
+                return None
+
+            timed = offsets is not None and i < len(offsets)
+            if timed:
+                delay = start + offsets[i] - self.loop.time()
+                if delay > 0 and await instance.wait_exit(delay):
+                    return max(i - 1, 0)
+            instance.action_offsets.append(round(self.loop.time() - start, 4))
+
+            try:
+                if timed:
+                    # Recorded offsets already include waits and settle time
+                    if action.kind != "WAIT":
+                        await self.execute_action(instance, action, fuzz_input)
+                    if i + 1 < len(offsets):
+                        if instance.exited.is_set():
+                            return i
+                        continue
+                    # Nothing recorded after this action, give it the usual settle time
+                    if await instance.wait_exit(self.action_delay):
+                        return i
+                    continue
+
+                if action.kind == "WAIT":
+                    if await instance.wait_exit(action.args[0]):
+                        return i
+                    continue
+
+                await self.execute_action(instance, action, fuzz_input)
+
+                # Wake up immediately if the target dies while we wait
+                if await self.settle(instance, action.kind):
+                    return i
+
+            except Exception as e:
+                if instance.exited.is_set():
+                    return i
+                if self.delay_tuner is not None and action.kind in DelayTuner.VERIFICATION_ACTIONS:
+                    self.delay_tuner.backoff()
+                logging.error(f"Error executing action {action.to_string()}: {str(e)}")
+                self.status_callback(f"Error: {str(e)}")
+                raise
+
+        return None
+
+    async def handle_crash(self, instance, fuzz_input, crash_type, exit_index, sequence=None):
+        """Record a crash, capture evidence and bring the target back"""
+        crash_msg = f"Crash detected ({crash_type}) with input: {fuzz_input}"
+        if exit_index is not None:
+            crash_msg += f" at action {exit_index}"
+        logging.error(crash_msg)
+        self.log_fuzz_input(fuzz_input, f"CRASH: {crash_type}")
+
+        # Capture crash state off the event loop
+        replay = self.replay_info(instance)
+        if sequence is not None and sequence is not self.main_sequence:
+            replay['base_sequence'] = [action.to_string() for action in self.main_sequence]
+        capture_started = self.loop.time()
+        fingerprint = instance.last_fingerprint if crash_type == "Screen Anomaly" else None
+        crash_dir, crash_info = await self.loop.run_in_executor(
+            None, instance.capture_crash_state, fuzz_input, crash_type,
+            sequence or self.main_sequence, exit_index, self.settings['screenshot_on_crash'],
+            replay, fingerprint)
+        self.metrics.observe('capture', self.loop.time() - capture_started)
+        self.metrics.crash(crash_info['bucket'], crash_type)
+        details = {
+            'input': fuzz_input,
+            'crash_dir': crash_dir,
+            'bucket': crash_info['bucket'],
+            'action_index': exit_index
+        }
+        if 'screenshot' in crash_info:
+            details['screenshot'] = crash_info['screenshot']['file']
+            details['thumbnail'] = crash_info['screenshot']['thumbnail']
+        self.crash_callback(self.stats.add_crash(crash_type, details))
+        self.status_callback(crash_msg)
+
+        if self.stats.crashes >= self.config.config['max_crashes']:
+            self.status_callback("Maximum crash limit reached")
+            self.request_stop()
+            return
+
+        # Restart application
+        if not await self.restart_instance(instance):
+            raise Exception("Failed to relaunch application")
+
+    async def settle(self, instance, kind):
+        """Wait for the target to settle after an action; True if it exited meanwhile"""
+        if self.delay_tuner is None:
+            return await instance.wait_exit(self.action_delay)
+        if self.delay_tuner.probing(kind):
+            elapsed = await self.loop.run_in_executor(None, self.delay_tuner.measure, instance)
+            self.delay_tuner.observe(kind, elapsed)
+            return instance.exited.is_set()
+        return await instance.wait_exit(self.delay_tuner.delay(kind))
+
+    async def execute_action(self, instance, action, fuzz_input):
+        """Execute one action through AT-SPI or the instance's display runner"""
+        if action.kind in AccessibilityTree.ACTIONS:
+            await self.loop.run_in_executor(None, instance.execute_accessible, action, fuzz_input)
+            return
+        if action.kind in PluginManager.ACTIONS:
+            result = await self.loop.run_in_executor(
+                None, self.plugins.execute, self, instance, action, fuzz_input)
+            if asyncio.iscoroutine(result):
+                await result
+            return
+        if self.window_relative and action.kind in Action.COORDINATE_ARGS:
+            action = await self.resolve_action(instance, action)
+        await instance.runner.execute_async(action, fuzz_input, self.action_delay)
+
+    async def resolve_action(self, instance, action):
+        """Translate window-relative coordinates to the instance's screen"""
+        left, top, _, _ = await self.loop.run_in_executor(
+            None, instance.window_geometry, self.settings.get('window_class'))
+        return action.translate(left, top)
+
+    def fingerprint(self, instance):
+        """Grab and fingerprint the target's screen region (blocking)"""
+        try:
+            region = self.fingerprinter.region
+            if region is None and self.window_relative:
+                # Only the target window matters, wherever it was placed
+                region = instance.window_geometry(self.settings.get('window_class'))
+            return self.fingerprinter.observe(instance.runner.grab(region))
+        except Exception as e:
+            logging.error(f"Error fingerprinting screen: {str(e)}")
+            return None
+
+    def replay_info(self, instance):
+        """Launch settings and recorded timings needed to replay the last input"""
+        return {
+            'app_path': self.settings['app_path'],
+            'os_type': self.settings['os_type'],
+            'initial_sequence': [action.to_string() for action in self.initial_sequence],
+            'launch_delay': self.launch_delay,
+            'action_delay': self.action_delay,
+            'action_offsets': list(instance.action_offsets),
+            'coordinate_space': self.settings.get('coordinate_space', 'screen'),
+            'window_class': self.settings.get('window_class')
+        }
+
+    async def start_instance(self, instance):
+        """Launch a target, wait for it to load and run the initial setup"""
+        restored = self.setup_cache is not None and self.setup_cache.exists()
+        instance.setup_template = self.setup_cache.path if restored else None
+
+        self.status_callback("Launching application...")
+        launch_started = self.loop.time()
+        try:
+            await self.loop.run_in_executor(None, instance.launch)
+        except Exception as e:
+            error_msg = f"Failed to launch application: {str(e)}"
+            logging.error(error_msg)
+            self.status_callback(error_msg)
+            return False
+        self.metrics.observe('launch', self.loop.time() - launch_started)
+        instance.watch_exit(self.loop)
+
+        # Wait for application to load
+        self.status_callback(f"Waiting {self.launch_delay} seconds for application to load...")
+        if await self.sleep(self.launch_delay):
+            return True
+
+        # The snapshot already holds the state the setup sequence produces
+        if restored:
+            logging.info("Started from cached setup state")
+            return True
+
+        # Execute initial setup sequence if any
+        if self.initial_sequence:
+            self.status_callback("Executing initial setup sequence...")
+            setup_started = self.loop.time()
+            exit_index = await self.execute_sequence(instance, self.initial_sequence, None)
+            self.metrics.observe('setup', self.loop.time() - setup_started)
+            if exit_index is not None:
+                logging.warning(f"Application exited during initial setup action {exit_index}")
+            else:
+                logging.info("Initial setup sequence completed")
+                if self.setup_cache is not None and not self.stopping:
+                    return await self.save_setup_state(instance)
+        return True
+
+    async def save_setup_state(self, instance):
+        """Snapshot the set-up sandbox home and relaunch the target from it"""
+        self.status_callback("Saving setup state...")
+        # A clean shutdown lets the target write out the state it holds in memory
+        instance.exit_watcher.stop()
+        await self.loop.run_in_executor(None, instance.terminate)
+        try:
+            await self.loop.run_in_executor(None, self.setup_cache.save, instance.sandbox.home)
+        except (OSError, shutil.Error) as e:
+            logging.error(f"Error saving setup state: {str(e)}")
+            self.setup_cache = None
+        return await self.start_instance(instance)
+
+    async def restart_instance(self, instance):
+        """Terminate the target and bring it back to the post-setup state"""
+        instance.exit_watcher.stop()
+        await self.loop.run_in_executor(None, instance.terminate)
+        instance.restarts += 1
+        self.metrics.restarts += 1
+        return await self.start_instance(instance)
+
+    async def sleep(self, seconds):
+        """Sleep that ends early on stop; returns True if stopping"""
+        try:
+            await asyncio.wait_for(self.stop_requested.wait(), seconds)
+        except asyncio.TimeoutError:
+            pass
+        return self.stopping
+
+    async def sample_resources(self, instance):
+        """Periodically record resource usage of an instance"""
+        interval = self.config.config['resource_sample_interval']
+        if interval <= 0:
+            return
+        while not self.stopping:
+            cpu_percent, memory_percent = await self.loop.run_in_executor(
+                None, instance.monitor_resources, 'sampler')
+            if cpu_percent is not None:
+                self.stats.add_resource_usage(cpu_percent, memory_percent)
+                self.resource_callback(cpu_percent, memory_percent)
+                self.metrics.target_cpu[instance.instance_id] = cpu_percent
+            if self.metrics_server is not None:
+                rss = await self.loop.run_in_executor(None, instance.memory_rss)
+                if rss is not None:
+                    self.metrics.target_rss[instance.instance_id] = rss
+            await self.sleep(interval)
+
+    def log_fuzz_input(self, fuzz_input, status="TESTING"):
+        """Log each fuzz input with timestamp"""
+        try:
+            timestamp = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            log_entry = f"{timestamp} - Input: {fuzz_input} - Status: {status}"
+
+            # Log to file
+            with open(self.settings['log_path'], 'a') as f:
+                f.write(log_entry + '\n')
+
+            # Update statistics
+            self.stats.total_inputs += 1
+
+            # Log using logging module
+            logging.info(f"Fuzz Input: {fuzz_input} - Status: {status}")
+
+        except Exception as e:
+            logging.error(f"Error logging fuzz input: {str(e)}")
+
+class CrashReplayer(AsyncFuzzEngine):
+    """Relaunch a target and re-drive a recorded crash to measure reproducibility
+
+    Actions are started at the offsets recorded when the crash was found.
+    Repetitions are spread over the configured instances, so they run in
+    parallel when several displays are available and sequentially otherwise.
+    """
+    def __init__(self, config, crash_dir, app_path=None, os_type=None, status_callback=None):
+        with open(os.path.join(crash_dir, 'crash_info.json'), 'r') as f:
+            self.crash_info = json.load(f)
+        self.crash_dir = crash_dir
+
+        replay = self.crash_info.get('replay', {})
+        app_path = app_path or replay.get('app_path')
+        if not app_path:
+            raise ValueError(f"No target application recorded in {crash_dir}")
+        settings = {
+            'app_path': app_path,
+            'os_type': os_type or replay.get('os_type', 'linux'),
+            'fuzz_list_path': None,
+            'log_path': os.devnull,
+            'initial_sequence': replay.get('initial_sequence', []),
+            'main_sequence': self.crash_info['sequence'],
+            'launch_delay': replay.get('launch_delay', 5),
+            'action_delay': replay.get('action_delay', 0.5),
+            'screenshot_on_crash': False,
+            'coordinate_space': replay.get('coordinate_space', 'screen'),
+            'window_class': replay.get('window_class')
+        }
+        super().__init__(config, FuzzingStats(), settings, status_callback=status_callback)
+
+        # Crashes recorded before timings were captured are paced by the action delay
+        self.offsets = replay.get('action_offsets') or None
+        self.results = []
+        self.remaining = 0
+
+    async def replay(self, repetitions=5):
+        """Replay the crash the given number of times and summarize the outcome"""
+        self.results = []
+        self.remaining = repetitions
+        try:
+            await self.open()
+            await asyncio.gather(*[self.replay_instance(instance)
+                                   for instance in self.instances])
+        finally:
+            await self.close()
+        return self.summary()
+
+    async def replay_instance(self, instance):
+        """Repetition loop of a single target instance"""
+        while self.remaining > 0 and not self.stopping:
+            self.remaining -= 1
+            if instance.exited.is_set():
+                logging.warning("Application exited before replay started, restarting")
+                if not await self.restart_instance(instance):
+                    raise Exception("Failed to relaunch application")
+
+            self.results.append(await self.replay_once(instance))
+            self.status_callback(f"Replay {len(self.results)}: "
+                                 f"{self.results[-1]['crash_type'] or 'no crash'}")
+            if not await self.restart_instance(instance):
+                raise Exception("Failed to relaunch application")
+
+    async def replay_once(self, instance):
+        """Re-execute the recorded actions once and check for the recorded crash"""
+        exit_index = await self.execute_sequence(instance, self.main_sequence,
+                                                 self.crash_info['input'], self.offsets)
+        if exit_index is None and await instance.wait_exit(self.action_delay):
+            exit_index = len(self.main_sequence) - 1
+
+        crash_type = await self.loop.run_in_executor(None, instance.detect_crash)
+        if crash_type is None and self.fingerprinter is not None:
+            fingerprint = await self.loop.run_in_executor(None, self.fingerprint, instance)
+            if fingerprint and fingerprint['anomaly']:
+                crash_type = "Screen Anomaly"
+        return {
+            'instance': instance.instance_id,
+            'crash_type': crash_type,
+            'action_index': exit_index,
+            'reproduced': crash_type == self.crash_info['crash_type']
+        }
+
+    def summary(self):
+        runs = len(self.results)
+        reproduced = sum(1 for result in self.results if result['reproduced'])
+        rate = reproduced / runs * 100 if runs else 0.0
+        return {
+            'crash_dir': self.crash_dir,
+            'bucket': self.crash_info.get('bucket'),
+            'crash_type': self.crash_info['crash_type'],
+            'timed': self.offsets is not None,
+            'runs': runs,
+            'reproduced': reproduced,
+            'reproduction_rate': rate,
+            'flake_percent': 100.0 - rate if runs else 0.0,
+            'results': self.results
+        }
+
+    @staticmethod
+    def bucket_report(summaries):
+        """Aggregate replay summaries into reproducibility per crash bucket"""
+        buckets = {}
+        for summary in summaries:
+            bucket = buckets.setdefault(summary['bucket'], {
+                'crash_type': summary['crash_type'],
+                'crashes': 0,
+                'runs': 0,
+                'reproduced': 0
+            })
+            bucket['crashes'] += 1
+            bucket['runs'] += summary['runs']
+            bucket['reproduced'] += summary['reproduced']
+
+        for bucket in buckets.values():
+            rate = bucket['reproduced'] / bucket['runs'] * 100 if bucket['runs'] else 0.0
+            bucket['reproduction_rate'] = rate
+            bucket['flake_percent'] = 100.0 - rate if bucket['runs'] else 0.0
+        return buckets
+
+# Newline-delimited JSON messages exchanged between coordinator and workers
+MESSAGE_LIMIT = 16 * 1024 * 1024
+
+def encode_message(message):
+    return (json.dumps(message, default=str) + '\n').encode('utf-8')
+
+async def read_message(reader):
+    """Read one message; returns None when the peer disconnected"""
+    line = await reader.readline()
+    if not line:
+        return None
+    return json.loads(line)
+
+def generate_inputs(pattern, seed_start, count):
+    """Deterministically generate inputs from a regex, one per seed"""
+    return [rstr.Rstr(random.Random(seed)).xeger(pattern)
+            for seed in range(seed_start, seed_start + count)]
+
+class FuzzCoordinator:
+    """Lease work units to fuzzing workers and merge their results"""
+    def __init__(self, config, units, host='127.0.0.1', port=7463, lease_timeout=600):
+        self.config = config
+        self.stats = FuzzingStats()
+        self.host = host
+        self.port = port
+        self.lease_timeout = lease_timeout
+        self.units = {unit['id']: unit for unit in units}
+        self.pending = collections.deque(unit['id'] for unit in units)
+        self.leases = {}
+        self.completed = set()
+        self.workers = set()
+        self.finished = None
+
+    @staticmethod
+    def corpus_units(inputs, unit_size):
+        """Shard a corpus into contiguous ranges"""
+        return [{'id': i, 'kind': 'corpus', 'start': start, 'inputs': inputs[start:start + unit_size]}
+                for i, start in enumerate(range(0, len(inputs), unit_size))]
+
+    @staticmethod
+    def generator_units(pattern, seed_count, unit_size, seed_base=0):
+        """Shard a generator seed space into contiguous seed ranges"""
+        units = []
+        for i, start in enumerate(range(0, seed_count, unit_size)):
+            units.append({
+                'id': i,
+                'kind': 'generator',
+                'pattern': pattern,
+                'seed_start': seed_base + start,
+                'count': min(unit_size, seed_count - start)
+            })
+        return units
+
+    async def serve(self):
+        """Serve workers until every unit is completed; returns the report path"""
+        self.finished = asyncio.Event()
+        self.stats.start_session()
+        if not self.units:
+            self.finished.set()
+
+        server = await asyncio.start_server(self.handle_worker, self.host, self.port,
+                                            limit=MESSAGE_LIMIT)
+        logging.info(f"Coordinator listening on {self.host}:{self.port} "
+                     f"with {len(self.units)} work units")
+        reaper = asyncio.create_task(self.reap_leases())
+        try:
+            async with server:
+                await self.finished.wait()
+        finally:
+            reaper.cancel()
+
+        self.stats.end_session()
+        report_generator = ReportGenerator(self.stats, self.config)
+        report_path = report_generator.generate_html_report()
+        report_generator.export_data('json')
+        logging.info(f"All work units completed, report generated: {report_path}")
+        return report_path
+
+    def lease_unit(self, worker):
+        """Pick the next pending unit for a worker"""
+        while self.pending:
+            unit_id = self.pending.popleft()
+            if unit_id in self.completed or unit_id in self.leases:
+                continue
+            self.leases[unit_id] = (worker, time.time() + self.lease_timeout)
+            return {'type': 'lease', 'unit': self.units[unit_id]}
+
+        if self.leases:
+            # Everything is handed out; expired leases may still come back
+            return {'type': 'wait', 'retry': 5}
+        return {'type': 'done'}
+
+    def release_worker(self, worker):
+        """Return the leases of a disconnected worker to the queue"""
+        for unit_id, (holder, _) in list(self.leases.items()):
+            if holder == worker:
+                del self.leases[unit_id]
+                self.pending.appendleft(unit_id)
+                logging.warning(f"Re-queued unit {unit_id} from disconnected worker {worker}")
+
+    async def reap_leases(self):
+        """Periodically re-queue units whose lease expired without a heartbeat"""
+        while True:
+            await asyncio.sleep(min(self.lease_timeout, 30))
+            self.expire_leases()
+
+    def expire_leases(self, now=None):
+        now = time.time() if now is None else now
+        for unit_id, (worker, deadline) in list(self.leases.items()):
+            if deadline < now:
+                del self.leases[unit_id]
+                self.pending.append(unit_id)
+                logging.warning(f"Lease on unit {unit_id} held by {worker} expired")
+
+    def complete_unit(self, worker, unit_id):
+        # A worker whose lease expired may still finish first; the unit is done
+        # either way, so a re-issued lease on it is dropped too
+        lease = self.leases.pop(unit_id, None)
+        if lease and lease[0] != worker:
+            logging.info(f"Unit {unit_id} completed by {worker}, dropping the lease of {lease[0]}")
+        self.completed.add(unit_id)
+        logging.info(f"Unit {unit_id} completed by {worker} "
+                     f"({len(self.completed)}/{len(self.units)})")
+        if len(self.completed) >= len(self.units) and self.finished is not None:
+            self.finished.set()
+
+    def record_crash(self, worker, message):
+        details = dict(message['details'], worker=worker)
+        self.stats.add_crash(message['crash_type'], details)
+        logging.error(f"Crash ({message['crash_type']}) reported by {worker}: {details.get('input')}")
+
+    async def handle_worker(self, reader, writer):
+        """Protocol loop for one connected worker"""
+        peer = writer.get_extra_info('peername')
+        worker = f"{peer[0]}:{peer[1]}" if peer else 'unknown'
+        try:
+            while True:
+                message = await read_message(reader)
+                if message is None:
+                    break
 
-        if format == 'json':
-            filename = f"fuzzing_data_{timestamp}.json"
-            with open(os.path.join(self.config.config['report_dir'], filename), 'w') as f:
-                json.dump(data, f, indent=4, default=str)
-        elif format == 'csv':
-            # Export crash data
-            crash_df = pd.DataFrame(data['crashes'])
-            crash_df.to_csv(os.path.join(self.config.config['report_dir'],
-                                        f"crashes_{timestamp}.csv"), index=False)
+                message_type = message.get('type')
+                if message_type == 'hello':
+                    worker = message.get('worker') or worker
+                    self.workers.add(worker)
+                    logging.info(f"Worker {worker} connected")
+                elif message_type == 'request':
+                    writer.write(encode_message(self.lease_unit(worker)))
+                    await writer.drain()
+                elif message_type == 'crash':
+                    self.record_crash(worker, message)
+                elif message_type == 'stats':
+                    self.stats.apply_delta(message['delta'])
+                    unit_id = message.get('unit')
+                    if unit_id in self.leases and self.leases[unit_id][0] == worker:
+                        self.leases[unit_id] = (worker, time.time() + self.lease_timeout)
+                elif message_type == 'complete':
+                    self.complete_unit(worker, message['unit'])
+        except (ConnectionError, json.JSONDecodeError) as e:
+            logging.error(f"Connection to worker {worker} failed: {str(e)}")
+        finally:
+            self.release_worker(worker)
+            self.workers.discard(worker)
+            writer.close()
+            logging.info(f"Worker {worker} disconnected")
+
+class FuzzWorker:
+    """Run the headless engine on work units leased from a coordinator"""
+    def __init__(self, config, settings, host='127.0.0.1', port=7463, name=None,
+                 stats_interval=5.0):
+        self.config = config
+        self.settings = settings
+        self.host = host
+        self.port = port
+        self.name = name or f"{platform.node()}-{os.getpid()}"
+        self.stats_interval = stats_interval
+        self.stats = FuzzingStats()
+        self.stats_cursor = None
+        self.current_unit = None
+        self.writer = None
+        self.engine = None
+
+    @staticmethod
+    def unit_inputs(unit):
+        if unit['kind'] == 'generator':
+            return generate_inputs(unit['pattern'], unit['seed_start'], unit['count'])
+        return unit['inputs']
+
+    def send(self, message):
+        self.writer.write(encode_message(message))
+
+    def on_crash(self, crash):
+        """Stream a crash record to the coordinator as soon as it is captured"""
+        details = dict(crash['details'], unit=self.current_unit)
+        try:
+            with open(os.path.join(details['crash_dir'], 'crash_info.json'), 'r') as f:
+                details['crash_info'] = json.load(f)
+        except (OSError, ValueError):
+            pass
+        self.send({'type': 'crash', 'crash_type': crash['type'], 'details': details})
+
+    def send_stats(self):
+        delta, self.stats_cursor = self.stats.export_delta(self.stats_cursor)
+        self.send({'type': 'stats', 'unit': self.current_unit, 'delta': delta})
+
+    async def report_stats(self):
+        """Periodic stats deltas, which also act as lease heartbeats"""
+        while True:
+            await asyncio.sleep(self.stats_interval)
+            self.send_stats()
+            await self.writer.drain()
+
+    async def run(self):
+        reader, self.writer = await asyncio.open_connection(self.host, self.port,
+                                                            limit=MESSAGE_LIMIT)
+        self.stats.start_session()
+        self.engine = AsyncFuzzEngine(self.config, self.stats, self.settings,
+                                      crash_callback=self.on_crash)
+        self.send({'type': 'hello', 'worker': self.name})
+        reporter = asyncio.create_task(self.report_stats())
+        try:
+            await self.engine.open()
+            while not self.engine.stopping:
+                self.send({'type': 'request'})
+                await self.writer.drain()
+                message = await read_message(reader)
+                if message is None or message['type'] == 'done':
+                    break
+                if message['type'] == 'wait':
+                    await self.engine.sleep(message['retry'])
+                    continue
 
-            # Export resource usage data
-            cpu_df = pd.DataFrame(self.stats.cpu_usage, columns=['time', 'usage'])
-            cpu_df.to_csv(os.path.join(self.config.config['report_dir'],
-                                        f"cpu_usage_{timestamp}.csv"), index=False)
+                unit = message['unit']
+                self.current_unit = unit['id']
+                logging.info(f"Leased unit {unit['id']} ({unit['kind']})")
+                await self.engine.process(self.unit_inputs(unit))
+                if self.engine.stopping:
+                    # Leave the partial unit to be re-leased
+                    break
+
+                self.send_stats()
+                self.send({'type': 'complete', 'unit': unit['id']})
+                await self.writer.drain()
+        finally:
+            reporter.cancel()
+            await self.engine.close()
+            self.stats.end_session()
+            try:
+                self.send_stats()
+                await self.writer.drain()
+            except ConnectionError:
+                pass
+            self.writer.close()
+
+class UIBridge:
+    """Marshal engine updates onto the Tk main loop
+
+    Worker threads only put events on a queue and never touch Tk. The main
+    loop drains it at a fixed frame rate and, for coalesced kinds, applies
+    only the latest event, so a burst of inputs costs one redraw per frame.
+    """
+    def __init__(self, root, handlers, coalesce=(), refresh_hz=10):
+        self.root = root
+        self.handlers = handlers
+        self.coalesce = set(coalesce)
+        self.interval = max(1, int(1000 / refresh_hz))
+        self.events = queue.SimpleQueue()
+        self.after_id = None
+
+    def post(self, kind, *args):
+        """Queue an update; safe to call from any thread"""
+        self.events.put((kind, args))
+
+    def callback(self, kind):
+        return lambda *args: self.post(kind, *args)
+
+    def start(self):
+        if self.after_id is None:
+            self.after_id = self.root.after(self.interval, self.drain)
+
+    def stop(self):
+        if self.after_id is not None:
+            self.root.after_cancel(self.after_id)
+            self.after_id = None
+
+    def drain(self):
+        """Apply queued updates; runs on the Tk main loop"""
+        latest = {}
+        ordered = []
+        while True:
+            try:
+                kind, args = self.events.get_nowait()
+            except queue.Empty:
+                break
+            if kind in self.coalesce:
+                latest[kind] = args
+            else:
+                ordered.append((kind, args))
 
-            mem_df = pd.DataFrame(self.stats.memory_usage, columns=['time', 'usage'])
-            mem_df.to_csv(os.path.join(self.config.config['report_dir'],
-                                        f"memory_usage_{timestamp}.csv"), index=False)
+        for kind, args in ordered + list(latest.items()):
+            try:
+                self.handlers[kind](*args)
+            except Exception as e:
+                logging.error(f"Error applying UI update {kind}: {str(e)}")
+
+        self.after_id = self.root.after(self.interval, self.drain)
 
 class ScrollableFrame(ttk.Frame):
     def __init__(self, container, *args, **kwargs):
@@ -416,14 +4959,207 @@ class ScrollableFrame(ttk.Frame):
     def _on_page_down(self, event):
         self.canvas.yview_scroll(1, "pages")
 
+class CrashBrowser(ttk.Frame):
+    """Paged crash list that loads one page at a time
+
+    Rows come from the results store when one is attached (or from the
+    in-memory crash list otherwise), filtered by bucket and type. Screenshot
+    thumbnails are only loaded for the selected crash.
+    """
+    ALL = "All"
+    COLUMNS = (('time', "Time", 150), ('type', "Type", 160), ('bucket', "Bucket", 110),
+               ('action', "Action", 60), ('input', "Input", 300))
+    THUMBNAIL_SIZE = (320, 240)
+    THUMBNAIL_CACHE = 50
+
+    def __init__(self, container, stats, page_size=100, *args, **kwargs):
+        super().__init__(container, *args, **kwargs)
+        self.stats = stats
+        self.page_size = page_size
+        self.page = 0
+        self.total = 0
+        self.rows = {}
+        self.thumbnails = collections.OrderedDict()
+
+        # Filters
+        filter_frame = ttk.Frame(self)
+        filter_frame.pack(fill='x', padx=5, pady=5)
+        buckets, types = self.facets()
+        self.bucket_filter = tk.StringVar(value=self.ALL)
+        self.type_filter = tk.StringVar(value=self.ALL)
+        ttk.Label(filter_frame, text="Bucket:").pack(side='left')
+        ttk.Combobox(filter_frame, textvariable=self.bucket_filter, state='readonly', width=16,
+                     values=[self.ALL] + buckets).pack(side='left', padx=5)
+        ttk.Label(filter_frame, text="Type:").pack(side='left')
+        ttk.Combobox(filter_frame, textvariable=self.type_filter, state='readonly', width=24,
+                     values=[self.ALL] + types).pack(side='left', padx=5)
+        ttk.Button(filter_frame, text="Apply", command=self.apply_filters).pack(side='left', padx=5)
+
+        # Crash list
+        list_frame = ttk.Frame(self)
+        list_frame.pack(fill='both', expand=True, padx=5)
+        self.tree = ttk.Treeview(list_frame, columns=[c[0] for c in self.COLUMNS],
+                                 show='headings', height=12)
+        for column, heading, width in self.COLUMNS:
+            self.tree.heading(column, text=heading)
+            self.tree.column(column, width=width, stretch=(column == 'input'))
+        scrollbar = ttk.Scrollbar(list_frame, orient='vertical', command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.tree.pack(side='left', fill='both', expand=True)
+        scrollbar.pack(side='right', fill='y')
+        self.tree.bind('<<TreeviewSelect>>', self.on_select)
+
+        # Pager
+        pager = ttk.Frame(self)
+        pager.pack(fill='x', padx=5, pady=5)
+        ttk.Button(pager, text="< Prev", command=lambda: self.show_page(self.page - 1)).pack(side='left')
+        self.page_label = ttk.Label(pager, text="")
+        self.page_label.pack(side='left', padx=10)
+        ttk.Button(pager, text="Next >", command=lambda: self.show_page(self.page + 1)).pack(side='left')
+
+        # Preview of the selected crash
+        preview = ttk.Frame(self)
+        preview.pack(fill='both', padx=5, pady=5)
+        self.thumbnail_label = ttk.Label(preview)
+        self.thumbnail_label.pack(side='left', padx=5)
+        self.details_text = scrolledtext.ScrolledText(preview, height=10, width=60)
+        self.details_text.pack(side='left', fill='both', expand=True)
+
+        self.apply_filters()
+
+    def facets(self):
+        """Known buckets and crash types for the filter lists"""
+        if self.stats.store is not None:
+            pairs = [(row['bucket'], row['crash_type'])
+                     for row in self.stats.store.crashes_by_bucket(self.stats.session_id)]
+        else:
+            pairs = [(crash['details'].get('bucket'), crash['type'])
+                     for crash in self.stats.crash_details]
+        buckets = sorted({bucket for bucket, _ in pairs if bucket})
+        types = sorted({crash_type for _, crash_type in pairs})
+        return buckets, types
+
+    def filters(self):
+        bucket = self.bucket_filter.get()
+        crash_type = self.type_filter.get()
+        return (None if bucket == self.ALL else bucket,
+                None if crash_type == self.ALL else crash_type)
+
+    def apply_filters(self):
+        bucket, crash_type = self.filters()
+        if self.stats.store is not None:
+            self.total = self.stats.store.count_crashes(self.stats.session_id, bucket, crash_type)
+        else:
+            self.total = len(self.filtered_details(bucket, crash_type))
+        self.show_page(0)
+
+    def filtered_details(self, bucket, crash_type):
+        return [crash for crash in self.stats.crash_details
+                if (bucket is None or crash['details'].get('bucket') == bucket) and
+                (crash_type is None or crash['type'] == crash_type)]
+
+    def fetch(self, offset):
+        bucket, crash_type = self.filters()
+        if self.stats.store is not None:
+            return self.stats.store.crashes(self.stats.session_id, bucket, self.page_size,
+                                            offset, crash_type)
+        return self.filtered_details(bucket, crash_type)[offset:offset + self.page_size]
+
+    def show_page(self, page):
+        pages = max(1, -(-self.total // self.page_size))
+        self.page = min(max(page, 0), pages - 1)
+
+        self.tree.delete(*self.tree.get_children())
+        self.rows = {}
+        for crash in self.fetch(self.page * self.page_size):
+            details = crash['details']
+            iid = self.tree.insert('', tk.END, values=(
+                crash['time'].strftime('%Y-%m-%d %H:%M:%S'), crash['type'],
+                details.get('bucket') or '', details.get('action_index', ''),
+                str(details.get('input', ''))[:200]))
+            self.rows[iid] = crash
+
+        self.page_label.config(text=f"Page {self.page + 1} of {pages} ({self.total} crashes)")
+
+    def on_select(self, event):
+        selection = self.tree.selection()
+        if not selection:
+            return
+        crash = self.rows[selection[0]]
+
+        self.details_text.config(state='normal')
+        self.details_text.delete('1.0', tk.END)
+        self.details_text.insert(tk.END, f"Time: {crash['time']}\nType: {crash['type']}\n"
+                                         f"{json.dumps(crash['details'], indent=2, default=str)}")
+        self.details_text.config(state='disabled')
+
+        thumbnail = self.thumbnail(crash['details'])
+        self.thumbnail_label.config(image=thumbnail or '', text='' if thumbnail else "No screenshot")
+
+    def thumbnail(self, details):
+        """Load and cache a downscaled crash screenshot"""
+        # Stored thumbnails, or the full screenshot of older crash directories
+        path = details.get('thumbnail')
+        if not path and details.get('crash_dir'):
+            path = os.path.join(details['crash_dir'], "screenshot.png")
+        if not path:
+            return None
+        if path in self.thumbnails:
+            self.thumbnails.move_to_end(path)
+            return self.thumbnails[path]
+
+        try:
+            from PIL import ImageTk
+            with Image.open(path) as image:
+                image.thumbnail(self.THUMBNAIL_SIZE)
+                photo = ImageTk.PhotoImage(image)
+        except Exception:
+            return None
+
+        self.thumbnails[path] = photo
+        if len(self.thumbnails) > self.THUMBNAIL_CACHE:
+            self.thumbnails.popitem(last=False)
+        return photo
+
 class FuzzerGUI:
-    def __init__(self, root):
+    def __init__(self, root, metrics_port=None):
         self.root = root
         self.root.title("Advanced Application Fuzzer")
 
         # Initialize configuration and statistics
         self.config = FuzzerConfig()
+        if metrics_port is not None:
+            self.config.config['metrics_port'] = metrics_port
         self.stats = FuzzingStats()
+        self.results_store = None
+        if self.config.config['results_db']:
+            try:
+                self.results_store = ResultsStore(self.config.config['results_db'],
+                                                  self.config.config['results_batch_size'])
+                self.stats.attach_store(self.results_store)
+            except sqlite3.Error as e:
+                logging.error(f"Error opening results store: {str(e)}")
+        self.action_runner = ActionRunner()
+        self.engine = None
+
+        # Engine threads report through the bridge instead of touching Tk
+        self.ui_bridge = UIBridge(root, {
+            'status': self._update_status_label,
+            'progress': self.update_progress,
+            'crash': self.update_crash_count,
+            'resources': self.update_resource_labels,
+            'error': lambda message: messagebox.showerror("Error", message)
+        }, coalesce=('status', 'progress', 'crash', 'resources'),
+            refresh_hz=self.config.config['ui_refresh_hz'])
+        self.ui_bridge.start()
+        self.open_report = True
+        self.sequence_slots = {}
+        self.slot_mode = 'product'
+        self.window_class = None
+        self.window_cache = None
+        self.delay_profile = None
+        self.plugin_manager = PluginManager(self.config)
+        self.accessibility = None
 
         # Create main scrollable frame
         self.main_frame = ScrollableFrame(root)
@@ -431,7 +5167,6 @@ class FuzzerGUI:
 
         # Initialize variables
         self.stop_event = Event()
-        self.pause_event = Event()
         self.fuzzing_thread = None
         self.os_type = tk.StringVar(value="macos")  # Default to macOS
         # Create reference images directory
@@ -592,9 +5327,9 @@ class FuzzerGUI:
     def update_status(self, message):
         """Update status label in a thread-safe way"""
         try:
-            # If called from a non-main thread, use after() method
+            # If called from a non-main thread, hand it to the UI bridge
             if threading.current_thread() is not threading.main_thread():
-                self.root.after(0, self._update_status_label, message)
+                self.ui_bridge.post('status', message)
             else:
                 self._update_status_label(message)
         except Exception as e:
@@ -652,6 +5387,7 @@ class FuzzerGUI:
             filetypes=[
                 ("Text files", "*.txt"),
                 ("CSV files", "*.csv"),
+                ("Binary corpus", "*.afc"),
                 ("All files", "*")
             ]
         )
@@ -714,6 +5450,8 @@ class FuzzerGUI:
 
             # Store current mouse position
             x, y = pyautogui.position()
+            left, top = self.window_origin_at(x, y)
+            x, y = x - left, y - top
 
             if action_type == "DRAG":
                 self.root.attributes('-alpha', 1.0)  # Restore visibility
@@ -722,6 +5460,7 @@ class FuzzerGUI:
                 self.root.attributes('-alpha', 0.1)
                 time.sleep(0.5)
                 x2, y2 = pyautogui.position()
+                x2, y2 = x2 - left, y2 - top
                 self.initial_control_list.insert(tk.END, f"DRAG,{x},{y},{x2},{y2}")
             else:
                 self.initial_control_list.insert(tk.END, f"{action_type},{x},{y}")
@@ -755,36 +5494,24 @@ class FuzzerGUI:
             messagebox.showerror("Error", f"Error executing initial sequence: {str(e)}")
 
     def execute_initial_setup(self):
-        """Execute the initial setup sequence"""
+        """Execute the initial setup sequence once (used for testing)"""
         action_delay = float(self.action_delay.get())
+        sequence = compile_sequence(self.initial_control_list.get(0, tk.END))
+        self.plugin_manager.prepare(sequence)
 
-        for i in range(self.initial_control_list.size()):
+        for action in sequence:
             if self.stop_event.is_set():
                 return
 
-            action = self.initial_control_list.get(i)
-            self.update_status(f"Executing initial setup action: {action}")
+            self.update_status(f"Executing initial setup action: {action.to_string()}")
 
             try:
-                if "," in action:  # Mouse action with coordinates
-                    parts = action.split(",")
-                    action_type = parts[0]
-
-                    if action_type == "LEFT_CLICK":
-                        pyautogui.click(int(parts[1]), int(parts[2]), _pause=False)
-                    elif action_type == "RIGHT_CLICK":
-                        pyautogui.rightClick(int(parts[1]), int(parts[2]), _pause=False)
-                    elif action_type == "DOUBLE_CLICK":
-                        pyautogui.doubleClick(int(parts[1]), int(parts[2]), _pause=False)
-                    elif action_type == "DRAG":
-                        pyautogui.moveTo(int(parts[1]), int(parts[2]), duration=0, _pause=False)
-                        pyautogui.dragTo(int(parts[3]), int(parts[4]), duration=action_delay, _pause=False)
-
+                self.execute_test_action(action, None, action_delay)
                 if action_delay > 0:
                     time.sleep(action_delay)
 
             except Exception as e:
-                logging.error(f"Error executing initial setup action {action}: {str(e)}")
+                logging.error(f"Error executing initial setup action {action.to_string()}: {str(e)}")
                 self.update_status(f"Error in initial setup: {str(e)}")
                 raise
 
@@ -846,6 +5573,15 @@ class FuzzerGUI:
                     'action_delay': self.action_delay.get()
                 }
             }
+            if self.sequence_slots:
+                sequence_data['slots'] = self.sequence_slots
+                sequence_data['slot_mode'] = self.slot_mode
+            if self.window_relative.get():
+                sequence_data['coordinates'] = 'window'
+                if self.window_class:
+                    sequence_data['window_class'] = self.window_class
+            if self.delay_profile:
+                sequence_data['delay_profile'] = self.delay_profile
 
             try:
                 with open(filename, 'w') as f:
@@ -871,6 +5607,15 @@ class FuzzerGUI:
         color = pyautogui.pixel(x, y)
         self.root.deiconify()
 
+        # Recorded like mouse actions, so the window origin is added back once
+        try:
+            left, top = self.window_origin_at(x, y)
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to add pixel verification: {str(e)}")
+            self.update_status("Ready")
+            return
+        x, y = x - left, y - top
+
         self.control_list.insert(tk.END, f"VERIFY_PIXEL,{x},{y},{color[0]},{color[1]},{color[2]}")
         self.update_status("Ready")
 
@@ -1056,6 +5801,21 @@ class FuzzerGUI:
         ttk.Checkbutton(advanced_frame, text="Auto-save Results",
                        variable=self.auto_save).grid(row=0, column=2, padx=5)
 
+        # Sequence mutation option
+        self.mutate_sequence = tk.BooleanVar(value=False)
+        ttk.Checkbutton(advanced_frame, text="Mutate Action Sequence",
+                       variable=self.mutate_sequence).grid(row=1, column=0, padx=5)
+
+        # Record positions relative to the target window
+        self.window_relative = tk.BooleanVar(value=False)
+        ttk.Checkbutton(advanced_frame, text="Window-Relative Coordinates",
+                       variable=self.window_relative).grid(row=1, column=1, padx=5)
+
+        # Learn per-action delays below the action delay slider
+        self.tune_delays = tk.BooleanVar(value=False)
+        ttk.Checkbutton(advanced_frame, text="Auto-tune Action Delays",
+                       variable=self.tune_delays).grid(row=1, column=2, padx=5)
+
     def create_initial_setup_frame(self):
         """Create initial setup sequence frame"""
         initial_setup_frame = ttk.LabelFrame(self.main_frame.scrollable_frame,
@@ -1162,7 +5922,8 @@ class FuzzerGUI:
             ("Escape", "ESC"),
             ("Delete", "DELETE"),
             ("Backspace", "BACKSPACE"),
-            ("Custom Keys...", "CUSTOM")
+            ("Custom Keys...", "CUSTOM"),
+            ("Type Slot...", "SLOT")
         ]
 
         for i, (text, action) in enumerate(keyboard_actions):
@@ -1178,12 +5939,14 @@ class FuzzerGUI:
             ("Wait", self.add_wait_action),
             ("Verify Pixel", self.add_pixel_verification),
             ("Find Image", self.add_image_recognition),
-            ("Custom Script", self.add_custom_script)
+            ("Custom Script", self.add_custom_script),
+            ("Set Widget Text", lambda: self.add_accessible_action("SET_TEXT")),
+            ("Activate Widget", lambda: self.add_accessible_action("ACTIVATE"))
         ]
 
         for i, (text, command) in enumerate(special_actions):
             ttk.Button(special_frame, text=text, command=command).grid(
-                row=0, column=i, padx=2, pady=2)
+                row=i//4, column=i%4, padx=2, pady=2)
 
         # List manipulation buttons
         list_control_frame = ttk.Frame(control_frame)
@@ -1265,6 +6028,8 @@ class FuzzerGUI:
 
             # Store current mouse position
             x, y = pyautogui.position()
+            left, top = self.window_origin_at(x, y)
+            x, y = x - left, y - top
 
             if action_type == "DRAG":
                 self.root.attributes('-alpha', 1.0)
@@ -1273,6 +6038,7 @@ class FuzzerGUI:
                 self.root.attributes('-alpha', 0.1)
                 time.sleep(0.5)
                 x2, y2 = pyautogui.position()
+                x2, y2 = x2 - left, y2 - top
                 self.control_list.insert(tk.END, f"DRAG,{x},{y},{x2},{y2}")
             elif action_type == "MOVE":
                 self.control_list.insert(tk.END, f"MOVE,{x},{y}")
@@ -1285,12 +6051,45 @@ class FuzzerGUI:
             self.root.attributes('-alpha', 1.0)
             messagebox.showerror("Error", f"Failed to add mouse action: {str(e)}")
 
+    def window_geometry_cache(self):
+        if self.window_cache is None:
+            self.window_cache = WindowGeometryCache()
+        return self.window_cache
+
+    def window_origin_at(self, x, y):
+        """Origin of the coordinate space a picked position is recorded in"""
+        if not self.window_relative.get():
+            return 0, 0
+        found = self.window_geometry_cache().window_at(x, y, exclude_pids={os.getpid()})
+        if found is None:
+            raise Exception("No application window under the cursor")
+        (left, top, _, _), wm_class = found
+        if wm_class and not self.window_class:
+            self.window_class = wm_class
+        return left, top
+
+    def screen_action(self, action):
+        """Resolve a window-relative action against the recorded window class"""
+        if not self.window_relative.get() or action.kind not in Action.COORDINATE_ARGS:
+            return action
+        if not self.window_class:
+            raise Exception("No target window recorded for window-relative coordinates")
+        geometry = self.window_geometry_cache().locate([], self.window_class)
+        if geometry is None:
+            raise Exception(f"No {self.window_class} window found")
+        return action.translate(geometry[0], geometry[1])
+
     def add_keyboard_action(self, action_type):
         """Add a keyboard action to the sequence"""
         if action_type == "CUSTOM":
             key_sequence = self.get_custom_key_sequence()
             if key_sequence:
                 self.control_list.insert(tk.END, f"CUSTOM_KEYS,{key_sequence}")
+        elif action_type == "SLOT":
+            slot_name = simpledialog.askstring("Type Slot",
+                                               "Slot name (defined in the sequence file):")
+            if slot_name:
+                self.control_list.insert(tk.END, f"TYPE_SLOT,{slot_name.strip()}")
         else:
             self.control_list.insert(tk.END, action_type)
 
@@ -1345,6 +6144,15 @@ class FuzzerGUI:
         color = pyautogui.pixel(x, y)
         self.root.deiconify()
 
+        # Recorded like mouse actions, so the window origin is added back once
+        try:
+            left, top = self.window_origin_at(x, y)
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to add pixel verification: {str(e)}")
+            self.update_status("Ready")
+            return
+        x, y = x - left, y - top
+
         self.control_list.insert(tk.END, f"VERIFY_PIXEL,{x},{y},{color[0]},{color[1]},{color[2]}")
         self.update_status("Ready")
 
@@ -1368,50 +6176,28 @@ class FuzzerGUI:
 
     def find_and_click_image(self, image_path, confidence):
         """Find an image on screen and click it"""
-        try:
-            # Ensure image path is absolute
-            if not os.path.isabs(image_path):
-                image_path = os.path.join(os.path.dirname(__file__), image_path)
-
-            # Look for the image on screen
-            location = pyautogui.locateCenterOnScreen(
-                image_path,
-                confidence=confidence,
-                grayscale=True  # Faster performance
-            )
-
-            if location is None:
-                raise Exception(f"Could not find image: {image_path}")
-
-            # Click the center of the found image
-            pyautogui.click(location)
-            logging.info(f"Successfully found and clicked image: {image_path}")
-
-        except Exception as e:
-            logging.error(f"Error in image recognition: {str(e)}")
-            raise
+        self.action_runner.find_and_click_image(image_path, confidence)
 
     def verify_pixel_color(self, x, y, expected_color):
         """Verify if a pixel matches an expected color"""
-        try:
-            actual_color = pyautogui.pixel(x, y)
-
-            # Allow small color variations (optional)
-            color_threshold = 10
-
-            if not all(abs(a - b) <= color_threshold
-                      for a, b in zip(actual_color, expected_color)):
-                raise Exception(
-                    f"Color mismatch at ({x}, {y}). "
-                    f"Expected: {expected_color}, "
-                    f"Got: {actual_color}"
-                )
-
-            logging.info(f"Pixel color verification passed at ({x}, {y})")
-
-        except Exception as e:
-            logging.error(f"Error in pixel verification: {str(e)}")
-            raise
+        self.action_runner.verify_pixel_color(x, y, expected_color)
+
+    def add_accessible_action(self, action_type):
+        """Add an AT-SPI action addressing a widget by role, name or path"""
+        locator = simpledialog.askstring(
+            "Accessible Widget",
+            "Widget locator (role, role:name or :name steps separated by '/'),\n"
+            "e.g. dialog:Open/text[1]:")
+        if not locator:
+            return
+        locator = locator.strip()
+        if action_type == "SET_TEXT":
+            slot_name = simpledialog.askstring(
+                "Accessible Widget", "Slot name to set (leave empty for the fuzz input):")
+            if slot_name:
+                self.control_list.insert(tk.END, f"SET_SLOT,{locator},{slot_name.strip()}")
+                return
+        self.control_list.insert(tk.END, f"{action_type},{locator}")
 
     def capture_reference_image(self):
         """Capture a reference image for recognition"""
@@ -1445,74 +6231,86 @@ class FuzzerGUI:
         text = scrolledtext.ScrolledText(dialog, width=70, height=20)
         text.pack(padx=5, pady=5)
 
-        text.insert(tk.END, "# Available variables:\n"
-                            "# fuzz_input - current fuzz input\n"
-                            "# self - fuzzer instance\n\n"
-                            "def custom_action(fuzz_input, self):\n"
+        text.insert(tk.END, "# Hooks (setup and teardown are optional):\n"
+                            "# setup(engine) - once before fuzzing starts\n"
+                            "# execute(engine, instance, action, fuzz_input) - every time the action runs\n"
+                            "# teardown(engine) - once after fuzzing ends\n"
+                            "# engine and instance are None when testing from this window\n\n"
+                            "def execute(engine, instance, action, fuzz_input):\n"
                             "    # Your code here\n"
                             "    pass")
 
-    def save_script():
-        script = text.get("1.0", tk.END)
-        script_hash = hashlib.md5(script.encode()).hexdigest()
-        script_path = os.path.join("scripts", f"script_{script_hash}.py")
+        def save_script():
+            script = text.get("1.0", tk.END)
+            script_hash = hashlib.md5(script.encode()).hexdigest()
+            scripts_dir = self.config.config['scripts_dir']
+            script_path = os.path.join(scripts_dir, f"script_{script_hash}.py")
 
-        os.makedirs("scripts", exist_ok=True)
-        with open(script_path, 'w') as f:
-            f.write(script)
+            try:
+                # Compile now so syntax errors show up here instead of at fuzzing time
+                compile(script, script_path, 'exec')
+                os.makedirs(scripts_dir, exist_ok=True)
+                with open(script_path, 'w') as f:
+                    f.write(script)
+            except (SyntaxError, OSError) as e:
+                messagebox.showerror("Error", f"Failed to save script: {str(e)}")
+                return
 
-        self.control_list.insert(tk.END, f"CUSTOM_SCRIPT,{script_path}")
-        dialog.destroy()
+            self.control_list.insert(tk.END, f"CUSTOM_SCRIPT,{script_path}")
+            dialog.destroy()
 
         ttk.Button(dialog, text="Save and Add", command=save_script).pack(pady=5)
 
+    def execute_test_action(self, action, fuzz_input, action_delay):
+        """Run one action outside of a fuzzing session"""
+        if action.kind in PluginManager.ACTIONS:
+            result = self.plugin_manager.execute(None, None, action, fuzz_input)
+            if asyncio.iscoroutine(result):
+                asyncio.run(result)
+            return
+        if action.kind in AccessibilityTree.ACTIONS:
+            if action.kind == 'SET_SLOT' and not isinstance(fuzz_input, dict):
+                fuzz_input = {action.args[1]: fuzz_input}
+            self.accessibility_tree().execute(action, fuzz_input)
+            return
+        self.action_runner.execute(self.screen_action(action), fuzz_input, action_delay)
+
+    def accessibility_tree(self):
+        """AT-SPI access to the running copies of the configured target"""
+        app_path = os.path.realpath(self.app_path.get())
+        pids = set()
+        for proc in psutil.process_iter(['pid', 'exe', 'cmdline']):
+            try:
+                command = proc.info['cmdline'] or []
+                if (proc.info['exe'] and os.path.realpath(proc.info['exe']) == app_path) or \
+                        (command and os.path.realpath(command[0]) == app_path):
+                    pids.add(proc.info['pid'])
+            except (psutil.NoSuchProcess, psutil.AccessDenied, OSError):
+                continue
+        if not pids:
+            raise Exception("Start the target application before testing widget actions")
+
+        if self.accessibility is None or self.accessibility.pids != pids:
+            if self.accessibility is not None:
+                self.accessibility.close()
+            self.accessibility = AccessibilityTree(pids)
+        return self.accessibility
+
     def execute_control_sequence(self, fuzz_input):
-        """Execute the main control sequence"""
+        """Execute the main control sequence once (used for testing)"""
         action_delay = float(self.action_delay.get())
+        sequence = compile_sequence(self.control_list.get(0, tk.END))
+        self.plugin_manager.prepare(sequence)
 
-        for i in range(self.control_list.size()):
+        for action in sequence:
             if self.stop_event.is_set():
                 return
 
-            action = self.control_list.get(i)
-
             try:
-                if "," in action:  # Mouse action or special action with parameters
-                    parts = action.split(",")
-                    action_type = parts[0]
-
-                    if action_type == "LEFT_CLICK":
-                        pyautogui.click(int(parts[1]), int(parts[2]))
-                    elif action_type == "RIGHT_CLICK":
-                        pyautogui.rightClick(int(parts[1]), int(parts[2]))
-                    elif action_type == "DOUBLE_CLICK":
-                        pyautogui.doubleClick(int(parts[1]), int(parts[2]))
-                    elif action_type == "DRAG":
-                        pyautogui.moveTo(int(parts[1]), int(parts[2]))
-                        pyautogui.dragTo(int(parts[3]), int(parts[4]), duration=action_delay)
-                    elif action_type == "VERIFY_PIXEL":
-                        self.verify_pixel_color(int(parts[1]), int(parts[2]),
-                                             (int(parts[3]), int(parts[4]), int(parts[5])))
-                    elif action_type == "FIND_IMAGE":
-                        self.find_and_click_image(parts[1], float(parts[2]))
-                else:  # Keyboard action
-                    if action == "ENTER":
-                        pyautogui.press('enter')
-                    elif action == "CTRL_A":
-                        pyautogui.hotkey('ctrl', 'a')
-                    elif action == "CTRL_V":
-                        pyautogui.write(fuzz_input)
-                    elif action == "CTRL_C":
-                        pyautogui.hotkey('ctrl', 'c')
-                    elif action == "TAB":
-                        pyautogui.press('tab')
-                    elif action == "ESC":
-                        pyautogui.press('esc')
-
+                self.execute_test_action(action, fuzz_input, action_delay)
                 time.sleep(action_delay)
-
             except Exception as e:
-                logging.error(f"Error executing action {action}: {str(e)}")
+                logging.error(f"Error executing action {action.to_string()}: {str(e)}")
                 self.update_status(f"Error: {str(e)}")
                 raise
 
@@ -1540,73 +6338,28 @@ class FuzzerGUI:
         except Exception as e:
             messagebox.showerror("Error", f"Error executing initial sequence: {str(e)}")
 
-    def launch_application(self, app_path):
-        """Launch application based on OS type"""
-        os_type = self.os_type.get()
-
-        try:
-            if os_type == "macos":
-                if app_path.endswith('.app'):
-                    # Launch app and wait for it to start
-                    process = subprocess.Popen(['open', '-W', app_path], shell=False)
-                    time.sleep(1)  # Give the app time to initialize
-                else:
-                    process = subprocess.Popen([app_path], shell=False)
-            elif os_type == "windows":
-                process = subprocess.Popen([app_path], shell=True)
-            else:  # Linux
-                process = subprocess.Popen([app_path], shell=False)
-
-            # Verify process started successfully
-            if process and process.poll() is None:
-                logging.info(f"Successfully launched application: {app_path}")
-                return process
-            else:
-                raise Exception("Process failed to start")
-
-        except Exception as e:
-            error_msg = f"Failed to launch application: {str(e)}"
-            logging.error(error_msg)
-            self.update_status(error_msg)
-            messagebox.showerror("Error", error_msg)
-            return None
-
-    def log_fuzz_input(self, fuzz_input, status="TESTING"):
-        """Log each fuzz input with timestamp"""
-        try:
-            timestamp = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            log_entry = f"{timestamp} - Input: {fuzz_input} - Status: {status}"
-
-            # Log to file
-            with open(self.log_path.get(), 'a') as f:
-                f.write(log_entry + '\n')
-
-            # Update statistics
-            self.stats.total_inputs += 1
-
-            # Log using logging module
-            logging.info(f"Fuzz Input: {fuzz_input} - Status: {status}")
-
-        except Exception as e:
-            logging.error(f"Error logging fuzz input: {str(e)}")
-
-    def verify_process_running(self, process):
-        """Verify if the process is still running"""
-        try:
-            if process is None:
-                return False
-            return psutil.pid_exists(process.pid)
-        except:
-            return False
-
     def start_fuzzing(self):
         """Start the fuzzing process"""
         if not self.validate_inputs():
             return
 
+        # Snapshot the widgets here; the engine never touches Tk variables
+        try:
+            self.engine = AsyncFuzzEngine(
+                self.config, self.stats, self.get_session_settings(),
+                status_callback=self.ui_bridge.callback('status'),
+                progress_callback=self.ui_bridge.callback('progress'),
+                crash_callback=self.ui_bridge.callback('crash'),
+                resource_callback=self.ui_bridge.callback('resources')
+            )
+        except Exception as e:
+            # Plugins are imported here, so a broken script is reported before launch
+            messagebox.showerror("Error", f"Failed to start fuzzing: {str(e)}")
+            return
+
         self.stats.start_session()
         self.stop_event.clear()
-        self.pause_event.clear()
+        self.open_report = self.auto_save.get()
 
         self.fuzzing_thread = Thread(target=self.fuzz_process)
         self.fuzzing_thread.daemon = True
@@ -1618,9 +6371,48 @@ class FuzzerGUI:
 
         self.update_status("Fuzzing started")
 
+    def get_session_settings(self):
+        """Collect the settings the fuzzing engine needs from the GUI"""
+        return {
+            'app_path': self.app_path.get(),
+            'os_type': self.os_type.get(),
+            'fuzz_list_path': self.fuzz_list_path.get(),
+            'log_path': self.log_path.get(),
+            'initial_sequence': list(self.initial_control_list.get(0, tk.END)),
+            'main_sequence': list(self.control_list.get(0, tk.END)),
+            'launch_delay': int(self.app_launch_delay.get()),
+            'action_delay': float(self.action_delay.get()),
+            'screenshot_on_crash': self.screenshot_on_crash.get(),
+            'mutate_sequence': self.mutate_sequence.get(),
+            'slots': self.sequence_slots,
+            'slot_mode': self.slot_mode,
+            'coordinate_space': 'window' if self.window_relative.get() else 'screen',
+            'window_class': self.window_class,
+            'tune_delays': self.tune_delays.get(),
+            'delay_profile': self.delay_profile
+        }
+
+    def update_progress(self, done, total):
+        """Update progress bar and processed input count"""
+        self.progress_var.set((done / total) * 100 if total else 0)
+        self.stats_labels["inputs"].config(text=str(done))
+
+    def update_crash_count(self, crash):
+        """Update the crash counter after a crash was recorded"""
+        self.stats_labels["crashes"].config(text=str(self.stats.crashes))
+
+    def update_resource_labels(self, cpu_percent, memory_percent):
+        """Update CPU and memory labels from a resource sample"""
+        self.stats_labels["cpu"].config(text=f"{cpu_percent:.1f}%")
+        self.stats_labels["memory"].config(text=f"{memory_percent:.1f}%")
+
     def validate_inputs(self):
         """Validate all required inputs before starting"""
-        if not all([self.app_path.get(), self.fuzz_list_path.get(), self.log_path.get()]):
+        # Templated sequences draw their inputs from the slots instead of the fuzz list
+        required = [self.app_path.get(), self.log_path.get()]
+        if not self.sequence_slots:
+            required.append(self.fuzz_list_path.get())
+        if not all(required):
             messagebox.showerror("Error", "Please fill in all required fields")
             return False
 
@@ -1635,24 +6427,27 @@ class FuzzerGUI:
             return False
 
         # Verify fuzz list exists and is readable
-        try:
-            with open(self.fuzz_list_path.get(), 'r', encoding='utf-8', errors='replace') as f:
-                first_line = f.readline()
-        except Exception as e:
-            messagebox.showerror("Error", f"Cannot read fuzz list: {str(e)}")
-            return False
+        if not self.sequence_slots:
+            try:
+                with open(self.fuzz_list_path.get(), 'r', encoding='utf-8', errors='replace') as f:
+                    first_line = f.readline()
+            except Exception as e:
+                messagebox.showerror("Error", f"Cannot read fuzz list: {str(e)}")
+                return False
 
         return True
 
     def toggle_pause(self):
         """Pause or resume fuzzing"""
         if self.paused:
-            self.pause_event.clear()
+            if self.engine:
+                self.engine.resume()
             self.paused = False
             self.pause_button.config(text="Pause")
             self.update_status("Fuzzing resumed")
         else:
-            self.pause_event.set()
+            if self.engine:
+                self.engine.pause()
             self.paused = True
             self.pause_button.config(text="Resume")
             self.update_status("Fuzzing paused")
@@ -1660,6 +6455,8 @@ class FuzzerGUI:
     def stop_fuzzing(self):
         """Stop the fuzzing process"""
         self.stop_event.set()
+        if self.engine:
+            self.engine.request_stop()
         self.update_status("Stopping...")
 
         if self.fuzzing_thread and self.fuzzing_thread.is_alive():
@@ -1672,193 +6469,19 @@ class FuzzerGUI:
         self.stats.end_session()
         self.update_status("Ready")
 
-    def monitor_resources(self, process):
-        """Monitor system resources of the target process"""
-        try:
-            proc = psutil.Process(process.pid)
-            cpu_percent = proc.cpu_percent(interval=1.0)
-            memory_percent = proc.memory_percent()
-
-            # Update GUI labels
-            self.stats_labels["cpu"].config(text=f"{cpu_percent:.1f}%")
-            self.stats_labels["memory"].config(text=f"{memory_percent:.1f}%")
-
-            return cpu_percent, memory_percent
-        except (psutil.NoSuchProcess, psutil.AccessDenied):
-            return None, None
-
-    def detect_crash(self, process):
-        """Enhanced crash detection"""
-        try:
-            if not psutil.pid_exists(process.pid):
-                return "Process Terminated"
-
-            proc = psutil.Process(process.pid)
-
-            # Check process status
-            if proc.status() == psutil.STATUS_ZOMBIE:
-                return "Zombie Process"
-
-            # Check resource usage
-            try:
-                cpu_percent = proc.cpu_percent(interval=0.1)
-                memory_percent = proc.memory_percent()
-
-                # Update stats
-                self.stats.add_resource_usage(cpu_percent, memory_percent)
-
-                # Check thresholds
-                if cpu_percent > self.config.config['cpu_threshold']:
-                    return "CPU Spike"
-                if memory_percent > self.config.config['memory_threshold']:
-                    return "Memory Leak"
-
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                return "Process Access Error"
-
-            return None
-
-        except psutil.NoSuchProcess:
-            return "Process Terminated"
-        except Exception as e:
-            logging.error(f"Error in crash detection: {str(e)}")
-            return None
-
-    def capture_crash_state(self, fuzz_input, crash_type):
-        """Capture system state when a crash occurs"""
-        timestamp = time.strftime("%Y%m%d-%H%M%S")
-        crash_dir = os.path.join(self.config.config['crashes_dir'], timestamp)
-        os.makedirs(crash_dir, exist_ok=True)
-
-        # Save screenshot
-        if self.screenshot_on_crash.get():
-            screenshot = pyautogui.screenshot()
-            screenshot.save(os.path.join(crash_dir, "screenshot.png"))
-
-        # Save crash information
-        crash_info = {
-            'timestamp': timestamp,
-            'input': fuzz_input,
-            'crash_type': crash_type,
-            'sequence': [self.control_list.get(i) for i in range(self.control_list.size())],
-            'system_info': {
-                'os': platform.platform(),
-                'python': platform.python_version(),
-                'cpu_count': psutil.cpu_count(),
-                'memory_total': psutil.virtual_memory().total
-            }
-        }
-
-        with open(os.path.join(crash_dir, "crash_info.json"), 'w') as f:
-            json.dump(crash_info, f, indent=4)
-
-        return crash_dir
-
     def fuzz_process(self):
         """Main fuzzing process"""
-        process = None
         try:
             self.setup_logging()
-            app_path = self.app_path.get()
-
-            # Launch application
-            self.update_status("Launching application...")
-            process = self.launch_application(app_path)
-
-            if not process:
-                raise ValueError("Failed to launch application")
-
-            # Wait for application to load
-            launch_delay = int(self.app_launch_delay.get())
-            self.update_status(f"Waiting {launch_delay} seconds for application to load...")
-            time.sleep(launch_delay)
-
-            # Execute initial setup sequence if any
-            if self.initial_control_list.size() > 0:
-                self.update_status("Executing initial setup sequence...")
-                self.execute_initial_setup()
-                logging.info("Initial setup sequence completed")
-
-            # Load fuzz inputs
-            self.update_status("Loading fuzz list...")
-            try:
-                with open(self.fuzz_list_path.get(), 'r', encoding='utf-8', errors='replace') as f:
-                    inputs = [line.strip() for line in f.readlines()]
-                    logging.info(f"Successfully loaded {len(inputs)} inputs using UTF-8 encoding")
-            except UnicodeDecodeError:
-                with open(self.fuzz_list_path.get(), 'r', encoding='latin-1') as f:
-                    inputs = [line.strip() for line in f.readlines()]
-
-            total_inputs = len(inputs)
-            self.progress_var.set(0)
-
-            # Main fuzzing loop
-            for idx, fuzz_input in enumerate(inputs, 1):
-                if self.stop_event.is_set():
-                    break
-
-                while self.pause_event.is_set():
-                    time.sleep(0.1)
-                    if self.stop_event.is_set():
-                        break
-
-                # Update progress
-                progress = (idx / total_inputs) * 100
-                self.progress_var.set(progress)
-                self.stats_labels["inputs"].config(text=str(idx))
-
-                self.log_fuzz_input(fuzz_input)
-
-                try:
-                    self.execute_control_sequence(fuzz_input)
-                except Exception as e:
-                    logging.error(f"Error executing sequence for input {fuzz_input}: {str(e)}")
-                    continue
-
-                # Check for crashes
-                crash_type = self.detect_crash(process)
-                if crash_type:
-                    crash_msg = f"Crash detected ({crash_type}) with input: {fuzz_input}"
-                    logging.error(crash_msg)
-                    self.log_fuzz_input(fuzz_input, f"CRASH: {crash_type}")
-
-                    # Capture crash state
-                    crash_dir = self.capture_crash_state(fuzz_input, crash_type)
-                    self.stats.add_crash(crash_type, {
-                        'input': fuzz_input,
-                        'crash_dir': crash_dir
-                    })
-
-                    self.stats_labels["crashes"].config(text=str(self.stats.crashes))
-                    self.update_status(crash_msg)
-
-                    if self.stats.crashes >= self.config.config['max_crashes']:
-                        self.update_status("Maximum crash limit reached")
-                        break
-
-                    # Restart application
-                    process.terminate()
-                    time.sleep(2)
-                    process = self.launch_application(app_path)
-                    time.sleep(launch_delay)
-
-                    if self.initial_control_list.size() > 0:
-                        self.execute_initial_setup()
-
-                # Use action delay between inputs
-                time.sleep(float(self.action_delay.get()))
-
+            asyncio.run(self.engine.run())
         except Exception as e:
             error_msg = f"Error during fuzzing: {str(e)}"
             logging.error(error_msg)
-            self.root.after(0, messagebox.showerror, "Error", error_msg)
+            self.ui_bridge.post('error', error_msg)
         finally:
-            if process:
-                try:
-                    process.terminate()
-                    process.wait(timeout=2)
-                except:
-                    pass
+            # Keep the learned delays so "Save Sequence" stores them
+            if self.engine.delay_tuner is not None:
+                self.delay_profile = self.engine.delay_tuner.profile()
             self.generate_report()
 
     def generate_report(self):
@@ -1872,13 +6495,13 @@ class FuzzerGUI:
             report_generator.export_data('csv')
 
             # Open report in default browser
-            if self.auto_save.get():
+            if self.open_report:
                 webbrowser.open(f'file://{os.path.abspath(report_path)}')
 
             logging.info(f"Report generated: {report_path}")
         except Exception as e:
             logging.error(f"Error generating report: {str(e)}")
-            messagebox.showerror("Error", f"Failed to generate report: {str(e)}")
+            self.ui_bridge.post('error', f"Failed to generate report: {str(e)}")
 
     def save_sequence(self):
         """Save current sequence to file"""
@@ -1898,6 +6521,15 @@ class FuzzerGUI:
                     'action_delay': self.action_delay.get()
                 }
             }
+            if self.sequence_slots:
+                sequence_data['slots'] = self.sequence_slots
+                sequence_data['slot_mode'] = self.slot_mode
+            if self.window_relative.get():
+                sequence_data['coordinates'] = 'window'
+                if self.window_class:
+                    sequence_data['window_class'] = self.window_class
+            if self.delay_profile:
+                sequence_data['delay_profile'] = self.delay_profile
 
             try:
                 with open(filename, 'w') as f:
@@ -1933,6 +6565,15 @@ class FuzzerGUI:
                 self.app_launch_delay.set(timing.get('launch_delay', 5))
                 self.action_delay.set(timing.get('action_delay', 0.5))
 
+                # Load input template slots
+                self.sequence_slots = sequence_data.get('slots', {})
+                self.slot_mode = sequence_data.get('slot_mode', 'product')
+
+                # Load the coordinate space of recorded positions
+                self.window_relative.set(sequence_data.get('coordinates', 'screen') == 'window')
+                self.window_class = sequence_data.get('window_class')
+                self.delay_profile = sequence_data.get('delay_profile')
+
                 messagebox.showinfo("Success", "Sequence loaded successfully")
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to load sequence: {str(e)}")
@@ -1980,7 +6621,7 @@ class FuzzerGUI:
         """Show detailed statistics window"""
         stats_window = tk.Toplevel(self.root)
         stats_window.title("Fuzzing Statistics")
-        stats_window.geometry("600x400")
+        stats_window.geometry("900x650")
 
         # Create notebook for tabbed interface
         notebook = ttk.Notebook(stats_window)
@@ -1990,30 +6631,41 @@ class FuzzerGUI:
         summary_frame = ttk.Frame(notebook)
         notebook.add(summary_frame, text='Summary')
 
+        total_inputs = self.stats.total_inputs
+        crash_rate = self.stats.crashes / total_inputs * 100 if total_inputs else 0.0
+        duration = (datetime.datetime.now() - self.stats.start_time
+                    if self.stats.start_time else datetime.timedelta(0))
         summary_text = (
-            f"Total Inputs: {self.stats.total_inputs}\n"
+            f"Total Inputs: {total_inputs}\n"
             f"Total Crashes: {self.stats.crashes}\n"
-            f"Crash Rate: {self.stats.crashes/self.stats.total_inputs*100:.2f}%\n"
-            f"Duration: {datetime.datetime.now() - self.stats.start_time}\n"
+            f"Crash Rate: {crash_rate:.2f}%\n"
+            f"Duration: {duration}\n"
         )
 
         ttk.Label(summary_frame, text=summary_text, justify='left').pack(padx=10, pady=10)
 
-        # Crashes tab
-        crashes_frame = ttk.Frame(notebook)
+        # Crashes tab, paged so large sessions open instantly
+        crashes_frame = CrashBrowser(notebook, self.stats)
         notebook.add(crashes_frame, text='Crashes')
 
-        crashes_text = scrolledtext.ScrolledText(crashes_frame)
-        crashes_text.pack(fill='both', expand=True, padx=5, pady=5)
-
-        for crash in self.stats.crash_details:
-            crashes_text.insert(tk.END,
-                                f"Time: {crash['time']}\n"
-                                f"Type: {crash['type']}\n"
-                                f"Details: {crash['details']}\n"
-                                f"{'-'*50}\n")
-
-        crashes_text.config(state='disabled')
+        # Buckets and slowest inputs come from the results store
+        if self.stats.store is not None and self.stats.session_id is not None:
+            store = self.stats.store
+            buckets_frame = ttk.Frame(notebook)
+            notebook.add(buckets_frame, text='Buckets')
+
+            buckets_text = scrolledtext.ScrolledText(buckets_frame)
+            buckets_text.pack(fill='both', expand=True, padx=5, pady=5)
+            buckets_text.insert(tk.END, f"Throughput: {store.throughput(self.stats.session_id):.1f} "
+                                        f"inputs/minute\n\n")
+            for bucket in store.crashes_by_bucket(self.stats.session_id):
+                buckets_text.insert(tk.END, f"{bucket['bucket']}  {bucket['crash_type']}: "
+                                            f"{bucket['count']}\n")
+            buckets_text.insert(tk.END, "\nSlowest inputs:\n")
+            for row in store.slowest_inputs(self.stats.session_id):
+                buckets_text.insert(tk.END, f"{row['duration']:.3f}s  {row['status']}  "
+                                            f"{row['input']}\n")
+            buckets_text.config(state='disabled')
 
     def show_documentation(self):
         """Show documentation window"""
@@ -2044,6 +6696,7 @@ class FuzzerGUI:
 
         4. Advanced Features
         - Crash Detection: Process termination, resource usage, responsiveness
+        - Native Evidence: Exit signal/code, stderr tail, core dumps and backtraces
         - Resource Monitoring: CPU and memory usage tracking
         - Comprehensive Reporting: HTML reports with charts and statistics
 
@@ -2077,7 +6730,174 @@ class FuzzerGUI:
 
         messagebox.showinfo("About", about_text)
 
+def default_os_type():
+    return {'Darwin': 'macos', 'Windows': 'windows'}.get(platform.system(), 'linux')
+
+def run_coordinator(args, config):
+    """Shard the corpus or seed space and serve it to workers"""
+    if args.generator:
+        units = FuzzCoordinator.generator_units(args.generator, args.seeds, args.unit_size,
+                                                args.seed_base)
+    else:
+        inputs = AsyncFuzzEngine.load_inputs(args.fuzz_list)
+        units = FuzzCoordinator.corpus_units(inputs, args.unit_size)
+
+    coordinator = FuzzCoordinator(config, units, args.host, args.port, args.lease_timeout)
+    if config.config['results_db']:
+        coordinator.stats.attach_store(ResultsStore(config.config['results_db'],
+                                                    config.config['results_batch_size']))
+    try:
+        asyncio.run(coordinator.serve())
+    finally:
+        if coordinator.stats.store is not None:
+            coordinator.stats.store.close()
+
+def run_worker(args, config):
+    """Run a headless engine on units leased from a coordinator"""
+    settings = AsyncFuzzEngine.settings_from_sequence(args.sequence, args.app, args.os,
+                                                      args.log,
+                                                      mutate_sequence=args.mutate_sequence,
+                                                      tune_delays=args.tune_delays)
+    worker = FuzzWorker(config, settings, args.host, args.port, args.name)
+    asyncio.run(worker.run())
+
+def run_replay(args, config):
+    """Replay recorded crashes and report reproducibility per bucket"""
+    if args.parallel:
+        config.config['instances'] = args.parallel
+
+    summaries = []
+    for crash_dir in args.crash_dirs:
+        try:
+            replayer = CrashReplayer(config, crash_dir, args.app, args.os,
+                                     status_callback=logging.info)
+            summary = asyncio.run(replayer.replay(args.repetitions))
+        except Exception as e:
+            logging.error(f"Error replaying {crash_dir}: {str(e)}")
+            continue
+
+        with open(os.path.join(crash_dir, 'replay.json'), 'w') as f:
+            json.dump(summary, f, indent=4)
+        summaries.append(summary)
+        print(f"{crash_dir}: {summary['reproduced']}/{summary['runs']} reproduced "
+              f"({summary['flake_percent']:.1f}% flaky)")
+
+    buckets = CrashReplayer.bucket_report(summaries)
+    for bucket, result in buckets.items():
+        print(f"Bucket {bucket} ({result['crash_type']}): {result['reproduced']}/{result['runs']} "
+              f"reproduced across {result['crashes']} crash(es), "
+              f"{result['flake_percent']:.1f}% flaky")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'buckets': buckets, 'crashes': summaries}, f, indent=4)
+
+def run_corpus(args, config):
+    """Build or describe a binary corpus"""
+    if args.corpus_command == 'build':
+        started = time.time()
+        result = BinaryCorpus.build(args.output, args.sources, dedup=not args.no_dedup,
+                                    bucket=args.bucket, strip=args.strip)
+        print(f"Wrote {result['records']} inputs to {args.output} "
+              f"({result['duplicates']} duplicates dropped) in {time.time() - started:.1f}s")
+        return
+
+    corpus = BinaryCorpus(args.corpus)
+    try:
+        binary = sum(1 for i in range(len(corpus)) if not corpus.record(i)[1])
+        print(f"{args.corpus}: {len(corpus)} inputs, {binary} not valid UTF-8")
+        for bits, start, count in corpus.buckets:
+            low, high = (1 << (bits - 1) if bits else 0), (1 << bits) - 1
+            print(f"  length {low}-{high}: {count} inputs (entries {start}-{start + count - 1})")
+    finally:
+        corpus.close()
+
 def main():
+    parser = argparse.ArgumentParser(description="Advanced Application Fuzzer")
+    parser.add_argument('--config', default='fuzzer_config.json',
+                        help="Fuzzer configuration file")
+    parser.add_argument('--metrics-port', type=int,
+                        help="Serve live metrics on this port (/metrics, /metrics.json)")
+    subparsers = parser.add_subparsers(dest='command')
+
+    coordinator_parser = subparsers.add_parser('coordinator',
+                                               help="Distribute work units to workers")
+    source = coordinator_parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--fuzz-list', help="Corpus file to shard")
+    source.add_argument('--generator', help="Regex to generate inputs from (one per seed)")
+    coordinator_parser.add_argument('--seeds', type=int, default=10000,
+                                    help="Number of generator seeds")
+    coordinator_parser.add_argument('--seed-base', type=int, default=0)
+    coordinator_parser.add_argument('--unit-size', type=int, default=100,
+                                    help="Inputs per work unit")
+    coordinator_parser.add_argument('--host', default='127.0.0.1')
+    coordinator_parser.add_argument('--port', type=int, default=7463)
+    coordinator_parser.add_argument('--lease-timeout', type=float, default=600,
+                                    help="Seconds without a heartbeat before a unit is re-leased")
+
+    worker_parser = subparsers.add_parser('worker', help="Fuzz work units from a coordinator")
+    worker_parser.add_argument('--host', default='127.0.0.1')
+    worker_parser.add_argument('--port', type=int, default=7463)
+    worker_parser.add_argument('--sequence', required=True, help="Saved sequence JSON")
+    worker_parser.add_argument('--app', required=True, help="Target application path")
+    worker_parser.add_argument('--os', default=default_os_type(),
+                               choices=['linux', 'windows', 'macos'])
+    worker_parser.add_argument('--log', default='fuzz_crashes.txt', help="Fuzz input log file")
+    worker_parser.add_argument('--name', help="Worker name reported to the coordinator")
+    worker_parser.add_argument('--mutate-sequence', action='store_true',
+                               help="Mutate the action sequence for every input")
+    worker_parser.add_argument('--tune-delays', action='store_true',
+                               help="Learn per-action delays and store them in the sequence file")
+
+    replay_parser = subparsers.add_parser('replay', help="Replay recorded crashes")
+    replay_parser.add_argument('crash_dirs', nargs='+', help="Crash directories to replay")
+    replay_parser.add_argument('--repetitions', type=int, default=5,
+                               help="Replays per crash")
+    replay_parser.add_argument('--parallel', type=int, default=0,
+                               help="Concurrent instances (needs one display each)")
+    replay_parser.add_argument('--app', help="Override the recorded application path")
+    replay_parser.add_argument('--os', choices=['linux', 'windows', 'macos'],
+                               help="Override the recorded OS type")
+    replay_parser.add_argument('--output', help="Write the per-bucket report as JSON")
+
+    corpus_parser = subparsers.add_parser('corpus', help="Build or inspect binary corpora")
+    corpus_commands = corpus_parser.add_subparsers(dest='corpus_command', required=True)
+    build_parser = corpus_commands.add_parser(
+        'build', help="Build an indexed, deduplicated binary corpus")
+    build_parser.add_argument('sources', nargs='+',
+                              help="Text files (one input per line), .jsonl files (one JSON "
+                                   "string per line) or directories (one input per file)")
+    build_parser.add_argument('-o', '--output', required=True, help="Corpus file to write")
+    build_parser.add_argument('--no-dedup', action='store_true', help="Keep duplicate inputs")
+    build_parser.add_argument('--bucket', action='store_true',
+                              help="Order inputs by length bucket, shortest first")
+    build_parser.add_argument('--strip', action='store_true',
+                              help="Strip surrounding whitespace of text lines like the legacy loader")
+    info_parser = corpus_commands.add_parser('info', help="Describe a binary corpus")
+    info_parser.add_argument('corpus')
+
+    args = parser.parse_args()
+
+    if args.command:
+        logging.basicConfig(level=logging.INFO,
+                            format='%(asctime)s - %(levelname)s - %(message)s',
+                            datefmt='%Y-%m-%d %H:%M:%S')
+        config = FuzzerConfig()
+        if os.path.exists(args.config):
+            config.load_config(args.config)
+        if args.metrics_port is not None:
+            config.config['metrics_port'] = args.metrics_port
+
+        if args.command == 'coordinator':
+            run_coordinator(args, config)
+        elif args.command == 'worker':
+            run_worker(args, config)
+        elif args.command == 'replay':
+            run_replay(args, config)
+        elif args.command == 'corpus':
+            run_corpus(args, config)
+        return
+
     root = tk.Tk()
     root.title("Advanced Application Fuzzer")
     root.geometry("1024x768")
@@ -2092,8 +6912,10 @@ def main():
     except:
         pass
 
-    app = FuzzerGUI(root)
+    app = FuzzerGUI(root, metrics_port=args.metrics_port)
     root.mainloop()
+    if app.results_store is not None:
+        app.results_store.close()
 
 if __name__ == "__main__":
     main()
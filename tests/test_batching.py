@@ -0,0 +1,171 @@
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from desktopAppFuzzer import AsyncFuzzEngine, FuzzerConfig, FuzzingStats
+
+
+class StubInstance:
+    instance_id = 0
+
+    def __init__(self):
+        self.action_offsets = []
+
+
+class StubEngine(AsyncFuzzEngine):
+    """Engine whose target 'crashes' on chosen inputs; nothing is launched"""
+    def __init__(self, tmp_path, crashers, reproduces=True):
+        settings = {
+            'app_path': '/bin/true', 'os_type': 'linux', 'fuzz_list_path': None,
+            'log_path': str(tmp_path / 'fuzz.log'), 'initial_sequence': [],
+            'main_sequence': ['CTRL_A', 'CTRL_V', 'ENTER'],
+            'launch_delay': 0, 'action_delay': 0, 'screenshot_on_crash': False
+        }
+        super().__init__(FuzzerConfig(), FuzzingStats(), settings)
+        self.crashers = set(crashers)
+        self.reproduces = reproduces
+        self.alive = True
+        self.sent = []
+        self.outcomes = {}
+        self.crashes = []
+        self.restarts = 0
+
+    async def execute_sequence(self, instance, sequence, fuzz_input, offsets=None):
+        instance.action_offsets = [0.0] * len(sequence)
+        if fuzz_input is None:
+            return None  # the shared prefix
+        self.sent.append(fuzz_input)
+        if fuzz_input in self.crashers:
+            if not self.reproduces:
+                self.crashers.discard(fuzz_input)
+            self.alive = False
+            return 0  # died on the CTRL_V that sent the input
+        return None
+
+    async def settle(self, instance, kind):
+        return False
+
+    async def check_crash(self, instance):
+        return None if self.alive else "Signal SIGSEGV"
+
+    async def restart_instance(self, instance):
+        self.restarts += 1
+        self.alive = True
+        return True
+
+    async def handle_crash(self, instance, fuzz_input, crash_type, exit_index, sequence=None):
+        self.crashes.append((fuzz_input, crash_type, exit_index))
+        self.alive = True
+
+    def record_inputs(self, inputs, status, duration, instance):
+        for fuzz_input in inputs:
+            self.outcomes.setdefault(fuzz_input, []).append(status)
+
+
+def run_batch(engine, batch):
+    async def main():
+        engine.loop = asyncio.get_running_loop()
+        engine.stop_requested = asyncio.Event()
+        await engine.run_batch(StubInstance(), batch)
+    asyncio.run(main())
+
+
+def bisect(engine, candidates):
+    async def main():
+        engine.loop = asyncio.get_running_loop()
+        engine.stop_requested = asyncio.Event()
+        return await engine.bisect(StubInstance(), candidates, "Signal SIGSEGV", 0.0)
+    return asyncio.run(main())
+
+
+def test_sequence_split_into_prefix_and_body(tmp_path):
+    engine = StubEngine(tmp_path, [])
+    assert [action.kind for action in engine.batch_prefix] == ['CTRL_A']
+    assert [action.kind for action in engine.batch_body] == ['CTRL_V', 'ENTER']
+
+
+def test_execute_batch_reports_crash_position(tmp_path):
+    engine = StubEngine(tmp_path, ['c'])
+
+    async def main():
+        engine.loop = asyncio.get_running_loop()
+        engine.stop_requested = asyncio.Event()
+        return await engine.execute_batch(StubInstance(), ['a', 'b', 'c', 'd'])
+    crash_type, position, exit_index = asyncio.run(main())
+
+    assert (crash_type, position, exit_index) == ("Signal SIGSEGV", 2, 1)
+    assert engine.sent == ['a', 'b', 'c']
+
+
+def test_clean_batch_records_every_input(tmp_path):
+    engine = StubEngine(tmp_path, [])
+    run_batch(engine, ['a', 'b', 'c'])
+    assert engine.outcomes == {'a': ['OK'], 'b': ['OK'], 'c': ['OK']}
+    assert engine.restarts == 0
+
+
+def check_every_input_finished(engine, batch, culprit):
+    assert [crash[0] for crash in engine.crashes] == [culprit]
+    assert set(engine.outcomes) == set(batch)
+    for fuzz_input in batch:
+        expected = "Signal SIGSEGV" if fuzz_input == culprit else "OK"
+        assert engine.outcomes[fuzz_input] == [expected]
+
+
+def test_crash_at_first_input(tmp_path):
+    batch = ['a', 'b', 'c', 'd', 'e']
+    engine = StubEngine(tmp_path, ['a'])
+    run_batch(engine, batch)
+    check_every_input_finished(engine, batch, 'a')
+
+
+def test_crash_at_middle_input(tmp_path):
+    batch = ['a', 'b', 'c', 'd', 'e', 'f', 'g']
+    engine = StubEngine(tmp_path, ['d'])
+    run_batch(engine, batch)
+    check_every_input_finished(engine, batch, 'd')
+
+
+def test_crash_at_last_input(tmp_path):
+    batch = ['a', 'b', 'c', 'd']
+    engine = StubEngine(tmp_path, ['d'])
+    run_batch(engine, batch)
+    check_every_input_finished(engine, batch, 'd')
+
+
+def test_bisect_returns_inputs_after_single_culprit(tmp_path):
+    engine = StubEngine(tmp_path, ['a'])
+    rest = bisect(engine, ['a', 'b', 'c'])
+    assert engine.sent == ['a']
+    assert rest == ['b', 'c']
+    assert engine.crashes == [('a', "Signal SIGSEGV", 1)]
+
+
+def test_bisect_returns_untested_inputs_on_error(tmp_path):
+    engine = StubEngine(tmp_path, [])
+    calls = []
+
+    async def failing_batch(instance, batch):
+        calls.append(list(batch))
+        if len(calls) > 1:
+            raise Exception("runner failed")
+        return None, None, None
+    engine.execute_batch = failing_batch
+
+    rest = bisect(engine, ['a', 'b', 'c', 'd'])
+    assert calls == [['a', 'b'], ['c']]
+    assert engine.outcomes == {'a': ['OK'], 'b': ['OK']}
+    assert rest == ['c', 'd']
+
+
+def test_crash_that_does_not_reproduce(tmp_path):
+    batch = ['a', 'b', 'c', 'd']
+    engine = StubEngine(tmp_path, ['b'], reproduces=False)
+    run_batch(engine, batch)
+
+    assert engine.crashes == []
+    assert set(engine.outcomes) == set(batch)
+    assert all(outcome == ['OK'] for outcome in engine.outcomes.values())
+    assert any(event['type'] == 'batch' for event in engine.stats.events)
@@ -0,0 +1,122 @@
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from desktopAppFuzzer import FuzzCoordinator, FuzzerConfig
+
+
+def make_coordinator(unit_count=3, lease_timeout=60):
+    units = FuzzCoordinator.corpus_units([f"input{i}" for i in range(unit_count)], 1)
+    coordinator = FuzzCoordinator(FuzzerConfig(), units, lease_timeout=lease_timeout)
+    coordinator.finished = asyncio.Event()
+    return coordinator
+
+
+def leased_id(message):
+    assert message['type'] == 'lease'
+    return message['unit']['id']
+
+
+def test_corpus_units_shard_contiguously():
+    units = FuzzCoordinator.corpus_units(list('abcde'), 2)
+    assert [(unit['id'], unit['start'], unit['inputs']) for unit in units] == \
+        [(0, 0, ['a', 'b']), (1, 2, ['c', 'd']), (2, 4, ['e'])]
+
+
+def test_generator_units_cover_seed_space():
+    units = FuzzCoordinator.generator_units('[a-z]+', 25, 10, seed_base=100)
+    assert [(unit['seed_start'], unit['count']) for unit in units] == [(100, 10), (110, 10), (120, 5)]
+
+
+def test_lease_hands_out_each_unit_once():
+    coordinator = make_coordinator()
+    leased = [leased_id(coordinator.lease_unit(worker)) for worker in ('w1', 'w2', 'w1')]
+    assert leased == [0, 1, 2]
+    assert coordinator.leases[0][0] == 'w1'
+    assert coordinator.leases[1][0] == 'w2'
+
+
+def test_wait_while_leases_are_outstanding_then_done():
+    coordinator = make_coordinator(unit_count=2)
+    first = leased_id(coordinator.lease_unit('w1'))
+    second = leased_id(coordinator.lease_unit('w2'))
+
+    assert coordinator.lease_unit('w3')['type'] == 'wait'
+    coordinator.complete_unit('w1', first)
+    assert coordinator.lease_unit('w3')['type'] == 'wait'
+    assert not coordinator.finished.is_set()
+
+    coordinator.complete_unit('w2', second)
+    assert coordinator.lease_unit('w3') == {'type': 'done'}
+    assert coordinator.finished.is_set()
+
+
+def test_no_units_is_done():
+    coordinator = make_coordinator(unit_count=0)
+    assert coordinator.lease_unit('w1') == {'type': 'done'}
+
+
+def test_expired_lease_is_requeued():
+    coordinator = make_coordinator(unit_count=1, lease_timeout=60)
+    unit_id = leased_id(coordinator.lease_unit('w1'))
+
+    coordinator.expire_leases(time.time() + 30)
+    assert unit_id in coordinator.leases
+
+    coordinator.expire_leases(time.time() + 61)
+    assert unit_id not in coordinator.leases
+    assert leased_id(coordinator.lease_unit('w2')) == unit_id
+    assert coordinator.leases[unit_id][0] == 'w2'
+
+
+def test_disconnected_worker_units_are_requeued_first():
+    coordinator = make_coordinator(unit_count=3)
+    first = leased_id(coordinator.lease_unit('w1'))
+    second = leased_id(coordinator.lease_unit('w2'))
+
+    coordinator.release_worker('w1')
+    assert first not in coordinator.leases
+    assert second in coordinator.leases
+    # Re-queued work goes before units nobody has started
+    assert leased_id(coordinator.lease_unit('w3')) == first
+    assert leased_id(coordinator.lease_unit('w3')) == 2
+
+
+def test_release_of_unknown_worker_changes_nothing():
+    coordinator = make_coordinator(unit_count=2)
+    leased_id(coordinator.lease_unit('w1'))
+    coordinator.release_worker('w9')
+    assert list(coordinator.leases) == [0]
+    assert list(coordinator.pending) == [1]
+
+
+def test_completion_after_lease_expired_and_was_reissued():
+    coordinator = make_coordinator(unit_count=1, lease_timeout=60)
+    unit_id = leased_id(coordinator.lease_unit('slow'))
+    coordinator.expire_leases(time.time() + 61)
+    assert leased_id(coordinator.lease_unit('fast')) == unit_id
+
+    # The original holder finishes first; the unit must not run a third time
+    coordinator.complete_unit('slow', unit_id)
+    assert unit_id in coordinator.completed
+    assert unit_id not in coordinator.leases
+    assert coordinator.lease_unit('other') == {'type': 'done'}
+    assert coordinator.finished.is_set()
+
+    # The second holder completing as well is harmless
+    coordinator.complete_unit('fast', unit_id)
+    assert coordinator.completed == {unit_id}
+
+
+def test_completion_after_lease_expired_before_reissue():
+    coordinator = make_coordinator(unit_count=2, lease_timeout=60)
+    unit_id = leased_id(coordinator.lease_unit('slow'))
+    coordinator.expire_leases(time.time() + 61)
+
+    coordinator.complete_unit('slow', unit_id)
+    # The re-queued copy is skipped when leasing
+    assert leased_id(coordinator.lease_unit('w2')) == 1
+    assert coordinator.lease_unit('w3')['type'] == 'wait'
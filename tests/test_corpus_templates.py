@@ -0,0 +1,116 @@
+import itertools
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from desktopAppFuzzer import BinaryCorpus, InputTemplate, SlotSource
+
+
+def write_lines(path, lines):
+    with open(path, 'wb') as f:
+        f.write(b'\n'.join(lines) + b'\n')
+    return str(path)
+
+
+def covered_pairs(rows, names):
+    return {(p, row[p], q, row[q]) for row in rows
+            for p, q in itertools.combinations(names, 2)}
+
+
+def test_binary_corpus_round_trip(tmp_path):
+    source = write_lines(tmp_path / 'list.txt', [b'plain', 'été'.encode('utf-8'), b'\xff\xfe', b'plain'])
+    payloads = tmp_path / 'payloads'
+    payloads.mkdir()
+    (payloads / 'multi').write_bytes(b'line one\nline two')
+    output = str(tmp_path / 'corpus.afc')
+
+    summary = BinaryCorpus.build(output, [source, str(payloads)])
+    assert summary['records'] == 4
+    assert summary['duplicates'] == 1
+    assert BinaryCorpus.is_corpus(output)
+    assert not BinaryCorpus.is_corpus(source)
+
+    corpus = BinaryCorpus(output)
+    try:
+        assert len(corpus) == 4
+        assert list(corpus) == ['plain', 'été', '\xff\xfe', 'line one\nline two']
+        assert corpus.raw(2) == b'\xff\xfe'
+        assert corpus[-1] == 'line one\nline two'
+        assert corpus[1:3] == ['été', '\xff\xfe']
+        with pytest.raises(IndexError):
+            corpus[4]
+    finally:
+        corpus.close()
+
+
+def test_binary_corpus_bucket_order(tmp_path):
+    lines = [b'x' * length for length in (9, 1, 300, 2, 17, 3)]
+    output = str(tmp_path / 'corpus.afc')
+    summary = BinaryCorpus.build(output, [write_lines(tmp_path / 'list.txt', lines)], bucket=True)
+
+    corpus = BinaryCorpus(output)
+    try:
+        lengths = [len(value) for value in corpus]
+        # Grouped by bit length, source order kept within a bucket
+        assert lengths == [1, 2, 3, 9, 17, 300]
+        assert corpus.buckets == summary['buckets']
+        assert [bits for bits, _, _ in corpus.buckets] == [1, 2, 4, 5, 9]
+        assert sum(count for _, _, count in corpus.buckets) == len(corpus)
+    finally:
+        corpus.close()
+
+
+def test_slot_source_corpus_length(tmp_path):
+    text = write_lines(tmp_path / 'list.txt', [b'a', b'b', b'c'])
+    output = str(tmp_path / 'corpus.afc')
+    BinaryCorpus.build(output, [text])
+
+    for path in (text, output):
+        source = SlotSource('name', {'corpus': path})
+        try:
+            assert len(source) == 3
+            assert list(source) == list(source) == ['a', 'b', 'c']
+        finally:
+            source.close()
+
+
+def test_product_mode():
+    template = InputTemplate({'a': {'values': ['1', '2']}, 'b': {'values': ['x', 'y', 'z']}})
+    rows = list(template)
+    assert len(template) == len(rows) == 6
+    assert rows[0] == {'a': '1', 'b': 'x'}
+    assert {(row['a'], row['b']) for row in rows} == set(itertools.product('12', 'xyz'))
+
+
+def test_zip_mode():
+    template = InputTemplate({'a': {'values': ['1', '2', '3']}, 'b': {'values': ['x', 'y']}}, mode='zip')
+    assert len(template) == 2
+    assert list(template) == [{'a': '1', 'b': 'x'}, {'a': '2', 'b': 'y'}]
+
+
+def test_pairwise_mode_covers_every_pair():
+    slots = {name: {'values': [f"{name}{i}" for i in range(size)]}
+             for name, size in (('a', 4), ('b', 3), ('c', 5), ('d', 2))}
+    template = InputTemplate(slots, mode='pairwise')
+    rows = list(template)
+    assert len(template) == len(rows)
+    assert len(rows) < 4 * 3 * 5 * 2
+
+    expected = {(p, x, q, y) for p, q in itertools.combinations(slots, 2)
+                for x in slots[p]['values'] for y in slots[q]['values']}
+    assert covered_pairs(rows, list(slots)) == expected
+
+
+def test_pairwise_mode_empty_slot():
+    template = InputTemplate({'a': {'values': ['1']}, 'b': {'values': []}, 'c': {'values': ['2']}},
+                             mode='pairwise')
+    assert len(template) == 0
+    assert list(template) == []
+
+
+def test_unknown_mode():
+    with pytest.raises(ValueError):
+        InputTemplate({'a': {'values': ['1']}}, mode='random')